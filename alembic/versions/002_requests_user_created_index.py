@@ -0,0 +1,34 @@
+"""Add composite (user_id, created_at) index for month range queries.
+
+Revision ID: 002_user_created_index
+Revises: 001_initial
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "002_user_created_index"
+down_revision: Union[str, None] = "001_initial"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_requests_user_id_created_at",
+        "requests",
+        ["user_id", "created_at"],
+        unique=False,
+    )
+    # The composite index has user_id as its leading column, so it serves
+    # every lookup the single-column index did.
+    op.drop_index(op.f("ix_requests_user_id"), table_name="requests")
+
+
+def downgrade() -> None:
+    op.create_index(op.f("ix_requests_user_id"), "requests", ["user_id"], unique=False)
+    op.drop_index("ix_requests_user_id_created_at", table_name="requests")
@@ -0,0 +1,65 @@
+"""Add monthly_rollups table with per-user monthly totals.
+
+Revision ID: 005_monthly_rollups
+Revises: 004_fsm_state
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from getmoney.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = "005_monthly_rollups"
+down_revision: Union[str, None] = "004_fsm_state"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "monthly_rollups",
+        sa.Column("user_id", sa.BigInteger(), nullable=False),
+        sa.Column("year", sa.SmallInteger(), nullable=False),
+        sa.Column("month", sa.SmallInteger(), nullable=False),
+        sa.Column("requested", sa.BigInteger(), nullable=False),
+        sa.Column("approved", sa.BigInteger(), nullable=False),
+        sa.Column("confirmed", sa.BigInteger(), nullable=False),
+        sa.Column("rejected", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("user_id", "year", "month"),
+    )
+
+    # Backfill from existing requests (months in the bot's timezone)
+    op.execute(
+        sa.text(
+            """
+            INSERT INTO monthly_rollups
+                (user_id, year, month, requested, approved, confirmed, rejected)
+            SELECT
+                user_id,
+                extract(year FROM timezone(:tz, created_at))::smallint,
+                extract(month FROM timezone(:tz, created_at))::smallint,
+                coalesce(sum(amount), 0),
+                coalesce(sum(amount) FILTER (
+                    WHERE status IN ('approved', 'sent', 'confirmed')), 0),
+                coalesce(sum(amount) FILTER (WHERE status = 'confirmed'), 0),
+                coalesce(sum(amount) FILTER (WHERE status = 'rejected'), 0)
+            FROM requests
+            GROUP BY 1, 2, 3
+            """
+        ).bindparams(tz=settings.tz)
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("monthly_rollups")
@@ -0,0 +1,43 @@
+"""Add request_events table for the request status log.
+
+Revision ID: 006_request_events
+Revises: 005_monthly_rollups
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "006_request_events"
+down_revision: Union[str, None] = "005_monthly_rollups"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "request_events",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("request_id", sa.Integer(), nullable=False),
+        sa.Column("actor", sa.String(length=10), nullable=False),
+        sa.Column("old_status", sa.String(length=20), nullable=True),
+        sa.Column("new_status", sa.String(length=20), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["request_id"], ["requests.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_request_events_request_id_created_at",
+        "request_events",
+        ["request_id", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_request_events_request_id_created_at", table_name="request_events")
+    op.drop_table("request_events")
@@ -0,0 +1,32 @@
+"""Add partial index on eta of approved requests.
+
+Revision ID: 007_eta_index
+Revises: 006_request_events
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "007_eta_index"
+down_revision: Union[str, None] = "006_request_events"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_requests_eta_approved",
+        "requests",
+        ["eta"],
+        unique=False,
+        postgresql_where=sa.text("status = 'approved'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_requests_eta_approved", table_name="requests")
@@ -0,0 +1,34 @@
+"""Add partial index on active requests for the active list.
+
+Revision ID: 008_active_index
+Revises: 007_eta_index
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "008_active_index"
+down_revision: Union[str, None] = "007_eta_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_requests_active_created_at",
+        "requests",
+        [sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+        postgresql_where=sa.text(
+            "status IN ('pending', 'approved', 'sent', 'disputed')"
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_requests_active_created_at", table_name="requests")
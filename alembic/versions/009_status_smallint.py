@@ -0,0 +1,96 @@
+"""Store request statuses as smallint codes.
+
+Revision ID: 009_status_smallint
+Revises: 008_active_index
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "009_status_smallint"
+down_revision: Union[str, None] = "008_active_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of getmoney.models.status.STATUS_CODES at this revision
+CODES = {
+    "pending": 0,
+    "approved": 1,
+    "sent": 2,
+    "confirmed": 3,
+    "rejected": 4,
+    "cancelled": 5,
+    "disputed": 6,
+}
+
+# (table, column) pairs holding a status
+COLUMNS = (
+    ("requests", "status"),
+    ("request_events", "old_status"),
+    ("request_events", "new_status"),
+)
+
+
+def _to_code(column: str) -> str:
+    whens = " ".join(f"WHEN '{name}' THEN {code}" for name, code in CODES.items())
+    return f"CASE {column} {whens} END"
+
+
+def _to_name(column: str) -> str:
+    whens = " ".join(f"WHEN {code} THEN '{name}'" for name, code in CODES.items())
+    return f"CASE {column} {whens} END"
+
+
+def _drop_partial_indexes() -> None:
+    op.drop_index("ix_requests_active_created_at", table_name="requests")
+    op.drop_index("ix_requests_eta_approved", table_name="requests")
+
+
+def _create_partial_indexes(approved: str, active: str) -> None:
+    op.create_index(
+        "ix_requests_eta_approved",
+        "requests",
+        ["eta"],
+        unique=False,
+        postgresql_where=sa.text(f"status = {approved}"),
+    )
+    op.create_index(
+        "ix_requests_active_created_at",
+        "requests",
+        [sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+        postgresql_where=sa.text(f"status IN ({active})"),
+    )
+
+
+def upgrade() -> None:
+    # Partial index predicates compare with text and must be rebuilt
+    _drop_partial_indexes()
+    for table, column in COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.SmallInteger(),
+            existing_type=sa.String(length=20),
+            postgresql_using=_to_code(column),
+        )
+    active = ", ".join(str(CODES[s]) for s in ("pending", "approved", "sent", "disputed"))
+    _create_partial_indexes(str(CODES["approved"]), active)
+
+
+def downgrade() -> None:
+    _drop_partial_indexes()
+    for table, column in COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.String(length=20),
+            existing_type=sa.SmallInteger(),
+            postgresql_using=_to_name(column),
+        )
+    _create_partial_indexes("'approved'", "'pending', 'approved', 'sent', 'disputed'")
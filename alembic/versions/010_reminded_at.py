@@ -0,0 +1,50 @@
+"""Record when the ETA reminder of a request was queued.
+
+Revision ID: 010_reminded_at
+Revises: 009_status_smallint
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "010_reminded_at"
+down_revision: Union[str, None] = "009_status_smallint"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# RequestStatus.APPROVED code at this revision
+APPROVED = 1
+
+
+def _create_eta_index(where: str) -> None:
+    op.create_index(
+        "ix_requests_eta_approved",
+        "requests",
+        ["eta"],
+        unique=False,
+        postgresql_where=sa.text(where),
+    )
+
+
+def upgrade() -> None:
+    op.add_column(
+        "requests",
+        sa.Column("reminded_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    # ETAs already passed were reminded about (or skipped) before this revision
+    op.execute(
+        f"UPDATE requests SET reminded_at = eta WHERE status = {APPROVED} AND eta <= now()"
+    )
+    op.drop_index("ix_requests_eta_approved", table_name="requests")
+    _create_eta_index(f"status = {APPROVED} AND reminded_at IS NULL")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_requests_eta_approved", table_name="requests")
+    _create_eta_index(f"status = {APPROVED}")
+    op.drop_column("requests", "reminded_at")
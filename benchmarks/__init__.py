@@ -0,0 +1 @@
+"""Performance benchmarks for GetMoney Bot."""
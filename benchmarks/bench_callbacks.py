@@ -0,0 +1,107 @@
+"""Benchmark callback routing cost per callback query.
+
+Usage:
+    python -m benchmarks.bench_callbacks
+
+Compares a router with one ``F.data.startswith(...)`` handler per action
+(the previous layout) against ``CallbackHandlers`` with the same number of
+actions. Both run the full aiogram dispatch path via ``feed_update``; no
+network or database is used. The first, middle and last registered actions
+are measured, since filter chains get slower further down the list.
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime
+
+import benchmarks.common  # noqa: F401  (settings defaults)
+from aiogram import Bot, Dispatcher, F, Router
+from aiogram.types import CallbackQuery, Chat, Message, Update, User
+
+from getmoney.callbacks import PAYLOADS, CallbackAction, CallbackHandlers, pack
+
+ACTIONS = list(CallbackAction)
+USER = User(id=1, is_bot=False, first_name="Bench")
+MESSAGE = Message(message_id=1, date=datetime.now(), chat=Chat(id=1, type="private"))
+
+
+def make_update(data: str) -> Update:
+    """Build an update carrying a callback query."""
+    return Update(
+        update_id=1,
+        callback_query=CallbackQuery(
+            id="1", from_user=USER, chat_instance="1", message=MESSAGE, data=data
+        ),
+    )
+
+
+async def handler(callback: CallbackQuery) -> None:
+    pass
+
+
+def legacy_dispatcher() -> tuple[Dispatcher, dict[CallbackAction, str]]:
+    """Router with a prefix filter per action and hand-parsed data."""
+    router = Router()
+    data = {}
+    for action in ACTIONS:
+        prefix = f"legacy_{action.name.lower()}:"
+        router.callback_query.register(handler, F.data.startswith(prefix))
+        data[action] = prefix + ":".join("12345" for _ in PAYLOADS[action]._fields)
+    dp = Dispatcher()
+    dp.include_router(router)
+    return dp, data
+
+
+def table_dispatcher() -> tuple[Dispatcher, dict[CallbackAction, str]]:
+    """Router using the callback codec and dict dispatch."""
+    router = Router()
+    callbacks = CallbackHandlers(router)
+    data = {}
+    for action in ACTIONS:
+        callbacks(action)(handler)
+        data[action] = pack(action, *(12345 for _ in PAYLOADS[action]._fields))
+    dp = Dispatcher()
+    dp.include_router(router)
+    return dp, data
+
+
+async def time_per_update(dp: Dispatcher, bot: Bot, update: Update, number: int) -> float:
+    """Average time per ``feed_update`` in microseconds."""
+    for _ in range(100):
+        await dp.feed_update(bot, update)
+
+    start = time.perf_counter()
+    for _ in range(number):
+        await dp.feed_update(bot, update)
+    return (time.perf_counter() - start) / number * 1_000_000
+
+
+async def run(number: int) -> None:
+    bot = Bot("0:bench")
+    positions = {
+        "first": ACTIONS[0],
+        "middle": ACTIONS[len(ACTIONS) // 2],
+        "last": ACTIONS[-1],
+    }
+
+    print(f"{len(ACTIONS)} actions")
+    print(f"{'variant':<8} {'position':<8} {'µs/callback':>12}")
+    for variant, build in (("legacy", legacy_dispatcher), ("table", table_dispatcher)):
+        dp, data = build()
+        for position, action in positions.items():
+            us = await time_per_update(dp, bot, make_update(data[action]), number)
+            print(f"{variant:<8} {position:<8} {us:>12.2f}")
+
+    await bot.session.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=5_000)
+    args = parser.parse_args()
+    asyncio.run(run(args.number))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""End-to-end load test: the whole bot against a fake Bot API server.
+
+Usage:
+    BENCH_DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.bench_e2e
+
+Starts ``FakeTelegram`` on localhost, points the real ``Bot`` at it through
+``TELEGRAM_API_URL`` and runs the dispatcher from ``create_dispatcher``
+(``setup_routers()``, middlewares, FSM storage, outbox) with long polling,
+exactly as in production. The database is reset first.
+
+Two phases are measured:
+
+* conversations: scripted request lifecycles (user asks for money, admin
+  approves with an ETA and marks it sent, user confirms) plus list views,
+  one step at a time. Latency is from injecting an update to the bot's
+  reply (``sendMessage`` for messages, ``answerCallbackQuery`` for
+  buttons); notifications are timed from the triggering update to their
+  delivery through the outbox.
+* burst: ``--burst`` list views injected at once, to see how many updates
+  per second the bot sustains when they are handled concurrently. Replies
+  are paired with updates in order per chat, so burst latencies are
+  approximate.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+from collections import defaultdict
+from typing import NamedTuple
+
+from aiohttp import web
+
+from benchmarks.common import bench_url, make_engine, reset_schema, summarize
+from benchmarks.fake_telegram import BotCall, FakeTelegram
+
+PORT = int(os.environ.get("FAKE_TELEGRAM_PORT", "8081"))
+
+# Settings are read on import, so point the bot at the fake server first
+os.environ.setdefault("DATABASE_URL", bench_url())
+os.environ["TELEGRAM_API_URL"] = f"http://127.0.0.1:{PORT}"
+
+from getmoney.config import settings  # noqa: E402
+from getmoney.db.session import engine as app_engine  # noqa: E402
+from getmoney.main import create_bot, create_dispatcher  # noqa: E402
+
+ADMIN = settings.admin_user_id
+USER = settings.user_user_id
+
+
+class Step(NamedTuple):
+    """Injected update and the bot's reply to it."""
+
+    sent_at: float
+    reply: BotCall
+
+
+class Harness:
+    """Drive chats through the fake server and record latencies (ms)."""
+
+    def __init__(self, fake: FakeTelegram) -> None:
+        self.fake = fake
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.updates = 0
+
+    def _record(self, kind: str, sent_at: float, reply: BotCall) -> Step:
+        self.latencies[kind].append((reply.at - sent_at) * 1000)
+        return Step(sent_at, reply)
+
+    async def say(self, chat_id: int, text: str, expect: str = "") -> Step:
+        """Send a message and wait for the bot's answer."""
+        sent_at = self.fake.send_text(chat_id, text)
+        self.updates += 1
+        reply = await self.fake.wait_for(chat_id, "sendMessage", expect)
+        return self._record("message", sent_at, reply)
+
+    async def press(self, chat_id: int, message_id: int, button: str) -> Step:
+        """Press a button and wait until the callback is answered."""
+        sent_at = self.fake.press(chat_id, message_id, button)
+        self.updates += 1
+        reply = await self.fake.wait_for(chat_id, "answerCallbackQuery")
+        return self._record("callback", sent_at, reply)
+
+    async def notified(self, chat_id: int, text: str, since: Step) -> Step:
+        """Wait for a notification caused by an earlier step."""
+        reply = await self.fake.wait_for(chat_id, "sendMessage", text)
+        return self._record("notification", since.sent_at, reply)
+
+
+async def conversation(h: Harness) -> None:
+    """One request from creation to confirmed receipt, plus list views."""
+    menu = await h.say(USER, "💰 Запросить средства", "💰 Выбери сумму")
+    amount_message = menu.reply.params["message_id"]
+    await h.press(USER, amount_message, "5 000₽")
+    created = await h.press(USER, amount_message, "✅ Отправить без комментария")
+
+    new = await h.notified(ADMIN, "🆕 Новый запрос", created)
+    admin_message = new.reply.params["message_id"]
+    await h.press(ADMIN, admin_message, "✅ Одобрить")
+    approved = await h.press(ADMIN, admin_message, "⏱ Через 1 час")
+    await h.notified(USER, "✅ Запрос #", approved)
+
+    sent = await h.press(ADMIN, admin_message, "💸 Отправлено")
+    money = await h.notified(USER, "💸 Средства отправлены", sent)
+    confirmed = await h.press(USER, money.reply.params["message_id"], "✅ Подтвердить получение")
+    await h.notified(ADMIN, "✅ Получение подтверждено", confirmed)
+
+    await h.say(USER, "📋 Мои запросы (этот месяц)", "📋")
+    await h.say(ADMIN, "/active")
+
+
+async def burst(fake: FakeTelegram, count: int) -> tuple[float, list[float]]:
+    """Inject ``count`` list views at once; return (seconds, latencies ms)."""
+    chats = {USER: "📋 Мои запросы (этот месяц)", ADMIN: "/active"}
+    sent: dict[int, list[float]] = {chat_id: [] for chat_id in chats}
+
+    start = time.perf_counter()
+    for i in range(count):
+        chat_id = USER if i % 2 else ADMIN
+        sent[chat_id].append(fake.send_text(chat_id, chats[chat_id]))
+
+    async def replies(chat_id: int) -> list[float]:
+        latencies = []
+        for sent_at in sent[chat_id]:
+            reply = await fake.wait_for(chat_id, "sendMessage", timeout=60)
+            latencies.append((reply.at - sent_at) * 1000)
+        return latencies
+
+    results = await asyncio.gather(*(replies(chat_id) for chat_id in chats))
+    return time.perf_counter() - start, [ms for latencies in results for ms in latencies]
+
+
+async def run(rounds: int, burst_size: int, port: int) -> None:
+    engine = make_engine()
+    await reset_schema(engine)
+    await engine.dispose()
+
+    fake = FakeTelegram()
+    runner = web.AppRunner(fake.app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+
+    bot = create_bot()
+    dp = create_dispatcher(bot)
+    polling = asyncio.create_task(dp.start_polling(bot, handle_signals=False, polling_timeout=1))
+    try:
+        # Startup hooks are done once the admin is told the bot is online
+        await fake.wait_for(ADMIN, "sendMessage", "🟢", timeout=30)
+
+        h = Harness(fake)
+        start = time.perf_counter()
+        for _ in range(rounds):
+            await conversation(h)
+        elapsed = time.perf_counter() - start
+
+        print(f"conversations: {rounds} rounds, {h.updates} updates in {elapsed:.2f}s")
+        print(f"  {h.updates / elapsed:,.1f} updates/s, {rounds / elapsed:,.2f} rounds/s")
+        for kind, samples in h.latencies.items():
+            print(f"  {kind:<13} n={len(samples):<5} {summarize(samples)}")
+
+        if burst_size:
+            elapsed, samples = await burst(fake, burst_size)
+            print(f"burst: {burst_size} updates in {elapsed:.2f}s")
+            print(f"  {burst_size / elapsed:,.1f} updates/s")
+            print(f"  {'reply':<13} n={len(samples):<5} {summarize(samples)}")
+
+        print(f"bot API calls: {dict(sorted(fake.call_counts.items()))}")
+    finally:
+        if not polling.done():
+            await dp.stop_polling()
+        await polling
+        await runner.cleanup()
+        await app_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--burst", type=int, default=500)
+    args = parser.parse_args()
+
+    # Per-update INFO logs would dominate the timings
+    logging.getLogger("aiogram").setLevel(logging.WARNING)
+    logging.getLogger("getmoney").setLevel(logging.WARNING)
+
+    asyncio.run(run(args.rounds, args.burst, PORT))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Benchmark CSV export of the full request history.
+
+Usage:
+    BENCH_DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.bench_export
+
+Seeds ``--rows`` synthetic requests (1M by default) and exports them with
+``ExportService.write_csv`` into a spooled temporary file, once per chunk
+size. Peak Python heap is measured with tracemalloc in a separate pass, as
+tracing slows the export itself down. ``--naive`` adds the load-everything
+baseline (all ORM objects, CSV built in memory) for comparison.
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+from tempfile import SpooledTemporaryFile
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from benchmarks.common import make_engine, make_session_factory, reset_schema, seed_requests
+from getmoney.models import Request
+from getmoney.services.export import SPOOL_MAX_SIZE, ExportService
+
+USER_ID = 2
+CHUNK_SIZES = [500, 2_000, 10_000]
+
+
+async def export(session_factory: async_sessionmaker[AsyncSession], chunk_size: int) -> int:
+    """Stream export into a spooled file; return file size in bytes."""
+    async with session_factory() as session:
+        with SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as file:
+            await ExportService(session).write_csv(file, chunk_size=chunk_size)
+            return file.tell()
+
+
+async def export_naive(session_factory: async_sessionmaker[AsyncSession]) -> int:
+    """Load all requests and build the CSV in memory; return size in bytes."""
+    async with session_factory() as session:
+        requests = (await session.execute(select(Request).order_by(Request.id))).scalars().all()
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for r in requests:
+            writer.writerow(
+                (r.id, r.user_id, r.amount, r.status, r.created_at, r.updated_at, r.eta)
+            )
+        return len(buffer.getvalue().encode())
+
+
+async def profile(fn: Callable[[], Awaitable[int]]) -> tuple[float, float, int]:
+    """Run ``fn``; return (seconds, peak traced MiB, result)."""
+    start = time.perf_counter()
+    size = await fn()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    await fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024), size
+
+
+async def run(rows: int, chunk_sizes: list[int], naive: bool) -> None:
+    engine = make_engine()
+    session_factory = make_session_factory(engine)
+    await reset_schema(engine)
+
+    now = datetime.now()
+    await seed_requests(engine, USER_ID, rows, now - timedelta(days=365 * 5), now)
+
+    print(f"rows={rows:,}")
+    print(f"{'variant':<14} {'seconds':>8} {'rows/s':>10} {'peak MiB':>9} {'file MiB':>9}")
+    variants = [(f"chunk={n}", lambda n=n: export(session_factory, n)) for n in chunk_sizes]
+    if naive:
+        variants.append(("naive", lambda: export_naive(session_factory)))
+
+    for name, fn in variants:
+        elapsed, peak, size = await profile(fn)
+        print(
+            f"{name:<14} {elapsed:>8.2f} {rows / elapsed:>10,.0f} "
+            f"{peak:>9.1f} {size / (1024 * 1024):>9.1f}"
+        )
+
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=CHUNK_SIZES)
+    parser.add_argument("--naive", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.chunk_sizes, args.naive))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Micro-benchmark keyboard rendering: time and allocations per render.
+
+Usage:
+    python -m benchmarks.bench_keyboards
+
+Each keyboard is rendered through ``AdminKeyboards``/``UserKeyboards`` and,
+for comparison, rebuilt from scratch with fully validated pydantic objects
+the way it was done before templates. No database is needed.
+"""
+
+import argparse
+import time
+import tracemalloc
+from collections.abc import Callable
+
+import benchmarks.common  # noqa: F401  (settings defaults)
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from getmoney.keyboards import AdminKeyboards, UserKeyboards
+from getmoney.keyboards.admin import _ETA_SELECTION, _REJECT_CONFIRM
+from getmoney.keyboards.layout import ButtonRows
+from getmoney.models import Request, RequestStatus
+
+REQUEST = Request(id=123456, amount=5000, status=RequestStatus.PENDING)
+
+
+def rebuild(rows: ButtonRows, *values: object) -> InlineKeyboardMarkup:
+    """Build keyboard without templates (baseline)."""
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(text=text, callback_data=callback.format(*values))
+                for text, callback in row
+            ]
+            for row in rows
+        ]
+    )
+
+
+CASES: list[tuple[str, Callable[[], object], Callable[[], object]]] = [
+    (
+        "amount_selection",
+        UserKeyboards.amount_selection,
+        lambda: UserKeyboards.amount_selection.__wrapped__(),
+    ),
+    (
+        "eta_selection",
+        lambda: AdminKeyboards.eta_selection(REQUEST.id),
+        lambda: rebuild(_ETA_SELECTION.rows, REQUEST.id),
+    ),
+    (
+        "reject_confirm",
+        lambda: AdminKeyboards.reject_confirm(REQUEST.id),
+        lambda: rebuild(_REJECT_CONFIRM.rows, REQUEST.id),
+    ),
+    (
+        "request_actions",
+        lambda: AdminKeyboards.request_actions(REQUEST),
+        lambda: rebuild(
+            (
+                (("✅ Одобрить", "admin:approve:{}"), ("💸 Отправлено", "admin:sent:{}")),
+                (("❌ Отклонить", "admin:reject:{}"),),
+            ),
+            REQUEST.id,
+        ),
+    ),
+]
+
+
+def time_per_call(fn: Callable[[], object], number: int) -> float:
+    """Average time per call in microseconds."""
+    start = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return (time.perf_counter() - start) / number * 1_000_000
+
+
+def allocations_per_call(fn: Callable[[], object], number: int) -> tuple[float, float]:
+    """Average (bytes, blocks) still allocated per call with results kept alive."""
+    fn()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    results = [fn() for _ in range(number)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, "filename")
+    size = sum(s.size_diff for s in stats) / number
+    blocks = sum(s.count_diff for s in stats) / number
+    del results
+    return size, blocks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(f"{'keyboard':<18} {'variant':<8} {'µs/render':>10} {'bytes':>8} {'blocks':>7}")
+    for name, current, baseline in CASES:
+        for variant, fn in (("rebuild", baseline), ("cached", current)):
+            us = time_per_call(fn, args.number)
+            size, blocks = allocations_per_call(fn, min(args.number, 2_000))
+            print(f"{name:<18} {variant:<8} {us:>10.2f} {size:>8.0f} {blocks:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark month view latency as request history grows.
+
+Usage:
+    BENCH_DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.bench_monthly_requests
+
+The current month always holds the same number of requests while older
+history grows by orders of magnitude. With the half-open ``created_at``
+range and the ``(user_id, created_at)`` index the latency should stay flat.
+"""
+
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+
+from benchmarks.common import (
+    make_engine,
+    make_session_factory,
+    measure,
+    reset_schema,
+    seed_requests,
+    summarize,
+)
+from getmoney.services import RequestService
+
+USER_ID = 2
+MONTH_ROWS = 30
+HISTORY_YEARS = 10
+SIZES = [10_000, 100_000, 1_000_000, 3_000_000]
+
+
+async def run(sizes: list[int], repeat: int) -> None:
+    engine = make_engine()
+    session_factory = make_session_factory(engine)
+    await reset_schema(engine)
+
+    async with session_factory() as session:
+        service = RequestService(session)
+        now = datetime.now(service.tz)
+        month_start, _ = service.month_range(now.year, now.month)
+
+    history_start = month_start - timedelta(days=365 * HISTORY_YEARS)
+    await seed_requests(engine, USER_ID, MONTH_ROWS, month_start, now)
+
+    seeded = 0
+    for size in sizes:
+        await seed_requests(engine, USER_ID, size - seeded, history_start, month_start)
+        seeded = size
+
+        async with session_factory() as session:
+            service = RequestService(session)
+            samples = await measure(
+                lambda: service.get_monthly_requests(USER_ID, now.year, now.month),
+                repeat=repeat,
+            )
+        print(f"rows={size:>10,}  {summarize(samples)}")
+
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.sizes, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""Benchmark every RequestService method at p50/p95/p99.
+
+Usage:
+    BENCH_DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.bench_services \\
+        --households 100 --requests 2000 --output results.json
+
+Seeds the database with ``benchmarks.seed`` (see its options), then times
+each method the way handlers call it: in its own session, committed for
+writes. Transitions run on requests prepared in the right source status
+beforehand, so only the transition itself is timed. Results are printed
+and, with ``--output``, written as JSON for comparison between runs.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+from collections.abc import Awaitable, Callable, Iterator
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from benchmarks.common import make_engine, make_session_factory, measure, percentile, summarize
+from benchmarks.seed import SeedConfig, add_arguments, config_from, seed
+from getmoney.models import RequestStatus
+from getmoney.services import RequestService
+from getmoney.services.request import Cursor
+
+Operation = Callable[[RequestService], Awaitable[object]]
+
+# Actions taking a fresh pending request to each source status
+PREPARE: dict[RequestStatus, tuple[str, ...]] = {
+    RequestStatus.PENDING: (),
+    RequestStatus.APPROVED: ("approve_request",),
+    RequestStatus.SENT: ("mark_sent",),
+    RequestStatus.DISPUTED: ("mark_sent", "dispute_receipt"),
+}
+
+
+class Runner:
+    """Run operations the way a handler does: one session per call."""
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession], user_id: int) -> None:
+        self.session_factory = session_factory
+        self.user_id = user_id
+        self.eta = datetime.now(UTC) + timedelta(days=1)
+
+    async def call(self, op: Operation, commit: bool = False) -> object:
+        async with self.session_factory() as session:
+            result = await op(RequestService(session))
+            if commit:
+                await session.commit()
+            return result
+
+    async def prepare(self, status: RequestStatus, count: int) -> Iterator[int]:
+        """Create ``count`` requests in ``status``; return their IDs."""
+        ids = []
+        async with self.session_factory() as session:
+            service = RequestService(session)
+            for _ in range(count):
+                request = await service.create_request(self.user_id, 1000)
+                for method in PREPARE[status]:
+                    args = (self.eta,) if method == "approve_request" else ()
+                    await getattr(service, method)(request.id, *args)
+                ids.append(request.id)
+            await session.commit()
+        return iter(ids)
+
+
+Case = Callable[[], Awaitable[object]]
+
+
+async def cases(runner: Runner, count: int) -> list[tuple[str, Callable[[], Awaitable[Case]]]]:
+    """Named benchmark cases, built on demand.
+
+    Write cases prepare ``count`` requests in the source status when built.
+    """
+    user_id = runner.user_id
+    now = datetime.now(UTC)
+    month = (user_id, now.year, now.month)
+    first = await runner.call(lambda s: s.get_active_page())
+    cursor = first.older or Cursor(now, 0)
+    any_id = first.requests[0].id if first.requests else 1
+
+    def read(op: Operation) -> Callable[[], Awaitable[Case]]:
+        async def build() -> Case:
+            return lambda: runner.call(op)
+
+        return build
+
+    def write(status: RequestStatus, method: str, *args: Any) -> Callable[[], Awaitable[Case]]:
+        async def build() -> Case:
+            ids = await runner.prepare(status, count)
+            return lambda: runner.call(lambda s: getattr(s, method)(next(ids), *args), commit=True)
+
+        return build
+
+    async def create() -> Case:
+        return lambda: runner.call(lambda s: s.create_request(user_id, 5000, "bench"), commit=True)
+
+    return [
+        ("get_request", read(lambda s: s.get_request(any_id))),
+        ("get_active_requests", read(lambda s: s.get_active_requests())),
+        ("get_active_requests[user]", read(lambda s: s.get_active_requests(user_id))),
+        ("get_active_page", read(lambda s: s.get_active_page())),
+        ("get_active_page[after]", read(lambda s: s.get_active_page(after=cursor))),
+        ("get_active_page[user]", read(lambda s: s.get_active_page(user_id))),
+        (
+            "get_active_page[user,month]",
+            read(lambda s: s.get_active_page(user_id, created=s.month_range(*month[1:]))),
+        ),
+        ("get_monthly_requests", read(lambda s: s.get_monthly_requests(*month))),
+        ("get_monthly_stats", read(lambda s: s.get_monthly_stats(*month))),
+        ("get_monthly_view", read(lambda s: s.get_monthly_view(*month))),
+        ("time_in_state[30d]", read(lambda s: s.events.time_in_state(now - timedelta(days=30)))),
+        ("create_request", create),
+        ("approve_request", write(RequestStatus.PENDING, "approve_request", runner.eta)),
+        ("reject_request", write(RequestStatus.PENDING, "reject_request", "bench")),
+        ("mark_sent", write(RequestStatus.APPROVED, "mark_sent")),
+        ("confirm_receipt", write(RequestStatus.SENT, "confirm_receipt")),
+        ("dispute_receipt", write(RequestStatus.SENT, "dispute_receipt")),
+        ("cancel_request", write(RequestStatus.PENDING, "cancel_request")),
+        ("update_message_ids", write(RequestStatus.PENDING, "update_message_ids", 1, 2)),
+    ]
+
+
+def git_revision() -> str | None:
+    """Current commit, if run from a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(config: SeedConfig, repeat: int, warmup: int, only: str | None) -> dict[str, Any]:
+    engine = make_engine()
+    await seed(engine, config)
+    runner = Runner(make_session_factory(engine), config.user_ids[0])
+
+    results = []
+    print(f"{config.total:,} requests, {config.households} households, repeat={repeat}")
+    for name, build in await cases(runner, repeat + warmup):
+        if only and only not in name:
+            continue
+        samples = await measure(await build(), repeat=repeat, warmup=warmup)
+        print(f"{name:<28} {summarize(samples)}")
+        results.append(
+            {
+                "name": name,
+                "n": len(samples),
+                "p50_ms": percentile(samples, 50),
+                "p95_ms": percentile(samples, 95),
+                "p99_ms": percentile(samples, 99),
+                "mean_ms": statistics.fmean(samples),
+            }
+        )
+
+    await engine.dispose()
+    return {
+        "benchmark": "services",
+        "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "config": {
+            "households": config.households,
+            "requests_per_household": config.requests,
+            "years": config.years,
+            "mix": {status.value: weight for status, weight in config.mix.items()},
+            "seed": config.seed,
+            "repeat": repeat,
+            "warmup": warmup,
+        },
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    add_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--only", help="run only cases whose name contains this")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(config_from(args), args.repeat, args.warmup, args.only))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Benchmark bot cold start: imports and database initialization.
+
+Usage:
+    BENCH_DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.bench_startup
+
+Imports of ``getmoney.main`` are timed in fresh interpreters, since a module
+is only imported once per process; the slowest ``getmoney`` modules are
+listed from ``-X importtime`` to spot candidates for lazy imports.
+
+``init_db`` is timed against a schema stamped with ``SCHEMA_REVISION`` (the
+revision check) and compared with the previous behavior of always running
+``create_all``. The engine is disposed before every sample, so both include
+opening a connection, as on a restart. The database is reset first;
+``--skip-db`` only measures imports.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+
+from sqlalchemy import text
+
+from benchmarks.common import bench_url, measure, reset_schema, summarize
+
+# Settings are read on import, so point the app engine at the benchmark database
+os.environ.setdefault("DATABASE_URL", bench_url())
+
+from getmoney.db.session import SCHEMA_REVISION, engine, init_db  # noqa: E402
+from getmoney.models import Base  # noqa: E402
+
+IMPORT_CODE = """
+import time
+start = time.perf_counter()
+import getmoney.main
+print(time.perf_counter() - start)
+"""
+
+
+def time_imports(runs: int) -> list[float]:
+    """Import time of ``getmoney.main`` in fresh interpreters, in milliseconds."""
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", IMPORT_CODE], capture_output=True, text=True, check=True
+        ).stdout
+        samples.append(float(output) * 1000)
+    return samples
+
+
+def slowest_modules(top: int) -> list[tuple[str, float]]:
+    """``getmoney`` modules with the largest cumulative import time (ms)."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import getmoney.main"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        if name.strip().startswith("getmoney") and cumulative.strip().isdigit():
+            modules.append((name.strip(), int(cumulative) / 1000))
+    return sorted(modules, key=lambda m: m[1], reverse=True)[:top]
+
+
+async def stamp_schema() -> None:
+    """Recreate tables and record them as migrated to ``SCHEMA_REVISION``."""
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
+    await reset_schema(engine)
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("CREATE TABLE alembic_version (version_num VARCHAR(32) PRIMARY KEY)")
+        )
+        await conn.execute(
+            text("INSERT INTO alembic_version VALUES (:revision)"),
+            {"revision": SCHEMA_REVISION},
+        )
+
+
+async def create_all() -> None:
+    """Startup before the revision check."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def time_init_db(repeat: int) -> None:
+    """Compare cold init_db with and without the revision check."""
+    await stamp_schema()
+
+    for name, fn in (("create_all", create_all), ("revision check", init_db)):
+
+        async def cold() -> None:
+            await engine.dispose()
+            await fn()
+
+        samples = await measure(cold, repeat=repeat, warmup=2)
+        print(f"{name:<16} {summarize(samples)}")
+
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--imports", type=int, default=10, help="fresh interpreters to time")
+    parser.add_argument("--repeat", type=int, default=30, help="init_db samples per variant")
+    parser.add_argument("--top", type=int, default=10, help="slowest modules to list")
+    parser.add_argument("--skip-db", action="store_true")
+    args = parser.parse_args()
+
+    samples = time_imports(args.imports)
+    print(f"import getmoney.main: median={statistics.median(samples):.1f}ms")
+    for name, ms in slowest_modules(args.top):
+        print(f"  {ms:8.1f}ms  {name}")
+
+    if not args.skip_db:
+        asyncio.run(time_init_db(args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Benchmark cold vs warm per-query latency and the startup warmup.
+
+Usage:
+    BENCH_DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.bench_warmup
+
+Uses the application's own engine, so ``DB_POOL_*`` and
+``DB_STATEMENT_CACHE_SIZE`` from the environment apply (e.g. compare with
+``DB_STATEMENT_CACHE_SIZE=0``). Each round disposes the pool, then for every
+query times, on one session: checking out a new connection, the first run
+(statement prepared on that connection) and a second run (prepared
+statement reused). The first two are what the first update after a restart
+or an idle period pays without the warmup. ``warm_up`` itself is timed
+last, as done in ``on_startup``.
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+
+from benchmarks.common import bench_url, reset_schema, seed_requests, summarize
+
+# Settings are read on import, so point the app engine at the benchmark database
+os.environ.setdefault("DATABASE_URL", bench_url())
+
+from getmoney.config import settings  # noqa: E402
+from getmoney.db.session import async_session_factory, engine, warm_up  # noqa: E402
+from getmoney.services import RequestService  # noqa: E402
+from getmoney.services.request import Cursor  # noqa: E402
+
+USER_ID = settings.user_user_id
+
+
+Operation = Callable[[RequestService], Awaitable[object]]
+
+
+def queries(now: datetime) -> dict[str, Operation]:
+    """Hot handler queries by name."""
+    return {
+        "get_request": lambda s: s.get_request(1),
+        "get_active_page": lambda s: s.get_active_page(),
+        "get_active_page[after]": lambda s: s.get_active_page(after=Cursor(now, 0)),
+        "get_active_page[user]": lambda s: s.get_active_page(
+            USER_ID, created=s.month_range(now.year, now.month)
+        ),
+        "get_monthly_view": lambda s: s.get_monthly_view(USER_ID, now.year, now.month),
+        "approve_request[miss]": lambda s: s.approve_request(0, now),
+    }
+
+
+async def run(rounds: int, rows: int) -> None:
+    now = datetime.now(UTC)
+    await reset_schema(engine)
+    await seed_requests(engine, USER_ID, rows, now - timedelta(days=365), now)
+
+    samples: dict[str, dict[str, list[float]]] = defaultdict(lambda: defaultdict(list))
+    for _ in range(rounds):
+        for name, op in queries(now).items():
+            await engine.dispose()
+            async with async_session_factory() as session:
+                service = RequestService(session)
+                start = time.perf_counter()
+                await session.connection()
+                connected = time.perf_counter()
+                await op(service)
+                first = time.perf_counter()
+                await op(service)
+                second = time.perf_counter()
+
+            samples[name]["connect"].append((connected - start) * 1000)
+            samples[name]["first"].append((first - connected) * 1000)
+            samples[name]["warm"].append((second - first) * 1000)
+
+    print(f"statement cache={settings.db_statement_cache_size}, rounds={rounds}")
+    for name, phases in samples.items():
+        print(name)
+        for phase, values in phases.items():
+            print(f"  {phase:<8} {summarize(values)}")
+
+    warmups = []
+    for _ in range(max(rounds // 5, 1)):
+        await engine.dispose()
+        start = time.perf_counter()
+        await warm_up(lambda s: RequestService(s).prepare_statements(), settings.db_pool_size)
+        warmups.append((time.perf_counter() - start) * 1000)
+    print(f"warm_up({settings.db_pool_size} connections) {summarize(warmups)}")
+
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--rows", type=int, default=20_000, help="requests to seed")
+    args = parser.parse_args()
+    asyncio.run(run(args.rounds, args.rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""Local stand-in for the Telegram Bot API.
+
+``FakeTelegram`` serves ``/bot<token>/<method>`` like api.telegram.org, so
+a real ``Bot`` can talk to it through ``TELEGRAM_API_URL``. It implements
+what the bot uses (getMe, getUpdates, sendMessage, sendDocument,
+editMessageText, editMessageReplyMarkup, answerCallbackQuery, webhook
+calls) and keeps the last text and keyboard of every message it has sent,
+so a driver can press buttons the way a user would.
+
+Updates are injected with ``send_text``/``press`` and handed to the bot via
+long-polling ``getUpdates``. Every bot call is queued per chat as a
+``BotCall`` for the driver to wait on.
+"""
+
+import asyncio
+import itertools
+import json
+import time
+from typing import Any, NamedTuple
+
+from aiohttp import web
+
+BOT_USER = {"id": 1, "is_bot": True, "first_name": "GetMoney", "username": "getmoney_bot"}
+
+
+class BotCall(NamedTuple):
+    """Bot API call made by the bot."""
+
+    method: str
+    params: dict[str, Any]
+    at: float  # time.perf_counter()
+
+    @property
+    def text(self) -> str:
+        return self.params.get("text") or self.params.get("caption") or ""
+
+    def has_button(self, text: str) -> bool:
+        """Check if the call's keyboard has a button starting with ``text``."""
+        markup = self.params.get("reply_markup") or {}
+        return any(
+            button["text"].startswith(text)
+            for row in markup.get("inline_keyboard", ())
+            for button in row
+        )
+
+
+class Sent(NamedTuple):
+    """Message as last sent or edited by the bot."""
+
+    text: str
+    reply_markup: dict[str, Any] | None
+
+
+class FakeTelegram:
+    """In-process fake Bot API server (aiohttp application)."""
+
+    def __init__(self) -> None:
+        self.app = web.Application()
+        self.app.router.add_post("/bot{token}/{method}", self._handle)
+        self._updates: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        self._update_ids = itertools.count(1)
+        self._message_ids = itertools.count(1)
+        self._callback_ids = itertools.count(1)
+        self._callback_chats: dict[str, int] = {}
+        self._calls: dict[int, asyncio.Queue[BotCall]] = {}
+        self.messages: dict[tuple[int, int], Sent] = {}
+        self.call_counts: dict[str, int] = {}
+
+    # === Driver side ===
+
+    def calls(self, chat_id: int) -> asyncio.Queue[BotCall]:
+        """Queue of bot calls addressed to ``chat_id``."""
+        return self._calls.setdefault(chat_id, asyncio.Queue())
+
+    async def wait_for(
+        self,
+        chat_id: int,
+        method: str,
+        text: str = "",
+        timeout: float = 10.0,
+    ) -> BotCall:
+        """Skip calls to ``chat_id`` until one of ``method`` whose text starts with ``text``."""
+        queue = self.calls(chat_id)
+        async with asyncio.timeout(timeout):
+            while True:
+                call = await queue.get()
+                if call.method == method and call.text.startswith(text):
+                    return call
+
+    def send_text(self, user_id: int, text: str) -> float:
+        """Inject a text message from ``user_id``; return injection time."""
+        message = {
+            "message_id": next(self._message_ids),
+            "date": int(time.time()),
+            "chat": {"id": user_id, "type": "private"},
+            "from": {"id": user_id, "is_bot": False, "first_name": f"User{user_id}"},
+            "text": text,
+        }
+        if text.startswith("/"):
+            command = text.split()[0]
+            message["entities"] = [{"type": "bot_command", "offset": 0, "length": len(command)}]
+        return self._push({"message": message})
+
+    def press(self, user_id: int, message_id: int, button: str) -> float:
+        """Press the first button starting with ``button`` on a bot message."""
+        sent = self.messages[(user_id, message_id)]
+        rows = (sent.reply_markup or {}).get("inline_keyboard", ())
+        data = next(b["callback_data"] for row in rows for b in row if b["text"].startswith(button))
+
+        callback_id = str(next(self._callback_ids))
+        self._callback_chats[callback_id] = user_id
+        return self._push(
+            {
+                "callback_query": {
+                    "id": callback_id,
+                    "from": {"id": user_id, "is_bot": False, "first_name": f"User{user_id}"},
+                    "chat_instance": str(user_id),
+                    "data": data,
+                    "message": {
+                        "message_id": message_id,
+                        "date": int(time.time()),
+                        "chat": {"id": user_id, "type": "private"},
+                        "from": BOT_USER,
+                        "text": sent.text,
+                        "reply_markup": sent.reply_markup,
+                    },
+                }
+            }
+        )
+
+    def _push(self, update: dict[str, Any]) -> float:
+        update["update_id"] = next(self._update_ids)
+        self._updates.put_nowait(update)
+        return time.perf_counter()
+
+    # === Bot API side ===
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        params = await self._params(request)
+        self.call_counts[method] = self.call_counts.get(method, 0) + 1
+
+        if method == "getUpdates":
+            result: Any = await self._get_updates(params)
+        else:
+            result = self._call(method, params)
+        return web.json_response({"ok": True, "result": result})
+
+    @staticmethod
+    async def _params(request: web.Request) -> dict[str, Any]:
+        """Decode form fields; aiogram sends objects as JSON strings."""
+        params: dict[str, Any] = {}
+        for name, value in (await request.post()).items():
+            if not isinstance(value, str):
+                params[name] = value  # Uploaded file
+            elif value[:1] in "{[":
+                params[name] = json.loads(value)
+            else:
+                params[name] = value
+        return params
+
+    async def _get_updates(self, params: dict[str, Any]) -> list[dict[str, Any]]:
+        timeout = float(params.get("timeout", 0))
+        try:
+            first = await asyncio.wait_for(self._updates.get(), timeout=timeout or 0.01)
+        except TimeoutError:
+            return []
+
+        updates = [first]
+        while not self._updates.empty() and len(updates) < int(params.get("limit", 100)):
+            updates.append(self._updates.get_nowait())
+        return updates
+
+    def _call(self, method: str, params: dict[str, Any]) -> Any:
+        if method == "getMe":
+            return BOT_USER
+
+        if method == "answerCallbackQuery":
+            chat_id = self._callback_chats.pop(params["callback_query_id"], 0)
+            self.calls(chat_id).put_nowait(BotCall(method, params, time.perf_counter()))
+            return True
+
+        if "chat_id" not in params:
+            return True  # deleteWebhook, setMyCommands, ...
+
+        chat_id = int(params["chat_id"])
+        if method in ("sendMessage", "sendDocument"):
+            message_id = next(self._message_ids)
+        elif method in ("editMessageText", "editMessageReplyMarkup"):
+            message_id = int(params["message_id"])
+        else:
+            return True
+
+        # Like Telegram, an edit without reply_markup removes the keyboard
+        previous = self.messages.get((chat_id, message_id), Sent("", None))
+        sent = Sent(params.get("text", previous.text), params.get("reply_markup"))
+        self.messages[(chat_id, message_id)] = sent
+        params["message_id"] = message_id
+        self.calls(chat_id).put_nowait(BotCall(method, params, time.perf_counter()))
+
+        message = {
+            "message_id": message_id,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"},
+            "from": BOT_USER,
+            "text": sent.text,
+        }
+        if sent.reply_markup and "inline_keyboard" in sent.reply_markup:
+            message["reply_markup"] = sent.reply_markup
+        if method == "sendDocument":
+            message["document"] = {"file_id": str(message_id), "file_unique_id": str(message_id)}
+        return message
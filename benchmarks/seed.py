@@ -0,0 +1,188 @@
+"""Synthetic request history for benchmarks.
+
+Usage:
+    BENCH_DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.seed \\
+        --households 100 --requests 2000 --years 3 --mix confirmed=70,rejected=10
+
+A household is one user (user IDs start at ``BASE_USER_ID``) whose requests
+are spread uniformly over the last ``--years`` years. Statuses are drawn
+from ``--mix`` weights; unlisted statuses get weight 0. Creation and
+transition events and monthly rollups are generated to match, and the
+tables are analyzed. Generation is deterministic for a given ``--seed``.
+"""
+
+import argparse
+import asyncio
+from typing import NamedTuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from benchmarks.common import make_engine, make_session_factory, reset_schema
+from getmoney.models import RequestStatus
+from getmoney.models.status import STATUS_CODES
+from getmoney.services.rollup import RollupService
+
+BASE_USER_ID = 1000
+
+# Roughly what a long-running installation looks like
+DEFAULT_MIX: dict[RequestStatus, float] = {
+    RequestStatus.PENDING: 2,
+    RequestStatus.APPROVED: 2,
+    RequestStatus.SENT: 1,
+    RequestStatus.CONFIRMED: 75,
+    RequestStatus.REJECTED: 10,
+    RequestStatus.CANCELLED: 9,
+    RequestStatus.DISPUTED: 1,
+}
+
+
+class SeedConfig(NamedTuple):
+    """Shape of the generated history."""
+
+    households: int = 10
+    requests: int = 1000  # Per household
+    years: float = 3
+    mix: dict[RequestStatus, float] = DEFAULT_MIX
+    seed: float = 0.42
+
+    @property
+    def total(self) -> int:
+        return self.households * self.requests
+
+    @property
+    def user_ids(self) -> range:
+        return range(BASE_USER_ID, BASE_USER_ID + self.households)
+
+
+def parse_mix(value: str) -> dict[RequestStatus, float]:
+    """Parse ``status=weight,...`` into status weights."""
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        mix[RequestStatus(name.strip())] = float(weight)
+    if not sum(mix.values()):
+        raise argparse.ArgumentTypeError("mix weights must not all be zero")
+    return mix
+
+
+def _buckets(mix: dict[RequestStatus, float]) -> tuple[list[int], list[float]]:
+    """Status codes and cumulative lower bounds in [0, 1) for width_bucket."""
+    total = sum(mix.values())
+    codes, bounds, acc = [], [], 0.0
+    for status, weight in mix.items():
+        if weight > 0:
+            codes.append(STATUS_CODES[status])
+            bounds.append(acc / total)
+            acc += weight
+    return codes, bounds
+
+
+async def seed(engine: AsyncEngine, config: SeedConfig) -> None:
+    """Reset the schema and generate requests, events and rollups."""
+    await reset_schema(engine)
+    codes, bounds = _buckets(config.mix)
+
+    async with engine.begin() as conn:
+        await conn.execute(text("SELECT setseed(:seed)"), {"seed": config.seed})
+        await conn.execute(
+            text("""
+                INSERT INTO requests (user_id, amount, status, eta, created_at, updated_at)
+                SELECT
+                    :base_user_id + g % :households,
+                    (1 + floor(random() * 50)::int) * 1000,
+                    status,
+                    CASE WHEN status = :approved THEN created_at + interval '1 day' END,
+                    created_at,
+                    created_at
+                FROM (
+                    SELECT
+                        g,
+                        (CAST(:codes AS smallint[]))[
+                            width_bucket(random(), CAST(:bounds AS float8[]))
+                        ] AS status,
+                        now() - random() * CAST(:years AS float8) * interval '365 days'
+                            AS created_at
+                    FROM generate_series(0, CAST(:total AS integer) - 1) AS g
+                ) AS generated
+                """),
+            {
+                "base_user_id": BASE_USER_ID,
+                "households": config.households,
+                "approved": STATUS_CODES[RequestStatus.APPROVED],
+                "codes": codes,
+                "bounds": bounds,
+                "years": config.years,
+                "total": config.total,
+            },
+        )
+        # Creation event for every request, one transition for the rest
+        await conn.execute(
+            text("""
+                INSERT INTO request_events
+                    (request_id, actor, old_status, new_status, created_at)
+                SELECT id, 'user', NULL, :pending, created_at FROM requests
+                UNION ALL
+                SELECT
+                    id,
+                    CASE WHEN status = ANY(CAST(:user_codes AS smallint[]))
+                        THEN 'user' ELSE 'admin' END,
+                    :pending,
+                    status,
+                    created_at + random() * interval '2 days'
+                FROM requests
+                WHERE status <> :pending
+                """),
+            {
+                "pending": STATUS_CODES[RequestStatus.PENDING],
+                "user_codes": [
+                    STATUS_CODES[s]
+                    for s in (
+                        RequestStatus.CANCELLED,
+                        RequestStatus.CONFIRMED,
+                        RequestStatus.DISPUTED,
+                    )
+                ],
+            },
+        )
+
+    async with make_session_factory(engine)() as session:
+        await RollupService(session).rebuild()
+        await session.commit()
+
+    async with engine.begin() as conn:
+        await conn.execute(text("ANALYZE"))
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add seed options to a benchmark's argument parser."""
+    defaults = SeedConfig()
+    parser.add_argument("--households", type=int, default=defaults.households)
+    parser.add_argument(
+        "--requests", type=int, default=defaults.requests, help="requests per household"
+    )
+    parser.add_argument("--years", type=float, default=defaults.years)
+    parser.add_argument("--mix", type=parse_mix, default=defaults.mix)
+    parser.add_argument("--seed", type=float, default=defaults.seed)
+
+
+def config_from(args: argparse.Namespace) -> SeedConfig:
+    """Build seed config from parsed arguments."""
+    return SeedConfig(args.households, args.requests, args.years, args.mix, args.seed)
+
+
+async def run(config: SeedConfig) -> None:
+    engine = make_engine()
+    await seed(engine, config)
+    await engine.dispose()
+    print(f"Seeded {config.total:,} requests for {config.households} households")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_arguments(parser)
+    asyncio.run(run(config_from(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""Compact callback data codec and dispatcher.
+
+Callback data is a two-letter action code followed by integer arguments in
+base 36, e.g. ``ap:2n9`` approves request 3429. Each action has a typed
+payload (a NamedTuple of ints) that handlers receive already decoded.
+
+``CallbackHandlers`` registers a single catch-all handler on a router and
+routes to the right function with one dict lookup instead of evaluating a
+chain of ``F.data.startswith(...)`` filters.
+"""
+
+from collections.abc import Awaitable, Callable
+from enum import Enum
+from typing import Any, NamedTuple
+
+from aiogram import Router
+from aiogram.dispatcher.event.handler import CallableObject
+from aiogram.types import CallbackQuery
+
+from getmoney.services.request import Cursor
+
+
+class NoPayload(NamedTuple):
+    """Callback without arguments."""
+
+
+class RequestRef(NamedTuple):
+    """Callback about a request."""
+
+    request_id: int
+
+
+class EtaChoice(NamedTuple):
+    """ETA option picked for a request."""
+
+    request_id: int
+    option: int  # Index into ETA_OPTIONS
+
+    @property
+    def option_name(self) -> str:
+        """Option name understood by ``RequestService.calculate_eta``."""
+        return ETA_OPTIONS[self.option]
+
+
+class AmountRef(NamedTuple):
+    """Amount chosen in the request creation flow."""
+
+    amount: int
+
+
+class MonthRef(NamedTuple):
+    """Monthly list of the user's requests."""
+
+    month: int  # YYYYMM
+
+    @property
+    def year_month(self) -> tuple[int, int]:
+        """Split month key into (year, month)."""
+        return divmod(self.month, 100)
+
+
+class MonthRequestRef(NamedTuple):
+    """Request opened from a monthly list."""
+
+    month: int
+    request_id: int
+
+
+class PageRef(NamedTuple):
+    """Page of the active requests list."""
+
+    newer: int  # 1 to go back to newer requests, 0 to continue with older
+    timestamp: int  # Cursor.timestamp
+    request_id: int  # Cursor.id
+
+    def cursor_args(self) -> dict[str, Cursor]:
+        """Keyword arguments for ``RequestService.get_active_page``."""
+        return _cursor_args(self.newer, self.timestamp, self.request_id)
+
+
+class MonthPageRef(NamedTuple):
+    """Page of active requests under a monthly list."""
+
+    month: int
+    newer: int
+    timestamp: int
+    request_id: int
+
+    @property
+    def year_month(self) -> tuple[int, int]:
+        """Split month key into (year, month)."""
+        return divmod(self.month, 100)
+
+    def cursor_args(self) -> dict[str, Cursor]:
+        """Keyword arguments for ``RequestService.get_active_page``."""
+        return _cursor_args(self.newer, self.timestamp, self.request_id)
+
+
+def _cursor_args(newer: int, timestamp: int, request_id: int) -> dict[str, Cursor]:
+    cursor = Cursor.from_timestamp(timestamp, request_id)
+    return {"before": cursor} if newer else {"after": cursor}
+
+
+# ETA presets, in button order
+ETA_OPTIONS = ("1h", "today", "tomorrow")
+
+
+class CallbackAction(str, Enum):
+    """Callback action code."""
+
+    # Admin
+    APPROVE = "ap"
+    ETA = "et"
+    ETA_MANUAL = "em"
+    SEND = "se"
+    REJECT = "rj"
+    REJECT_CONFIRM = "ry"
+    REJECT_COMMENT = "rc"
+    BACK = "bk"
+    OPEN = "op"
+    PAGE = "pg"
+    LIST = "ls"
+
+    # User
+    AMOUNT = "am"
+    ADD_COMMENT = "cm"
+    CONFIRM_REQUEST = "cr"
+    CANCEL_FLOW = "cf"
+    REMIND = "re"
+    CANCEL = "ca"
+    CONFIRM_RECEIPT = "ok"
+    DISPUTE = "di"
+    MY_OPEN = "mo"
+    MY_PAGE = "mp"
+    MY_LIST = "ml"
+
+
+PAYLOADS: dict[CallbackAction, type[tuple]] = {
+    CallbackAction.APPROVE: RequestRef,
+    CallbackAction.ETA: EtaChoice,
+    CallbackAction.ETA_MANUAL: RequestRef,
+    CallbackAction.SEND: RequestRef,
+    CallbackAction.REJECT: RequestRef,
+    CallbackAction.REJECT_CONFIRM: RequestRef,
+    CallbackAction.REJECT_COMMENT: RequestRef,
+    CallbackAction.BACK: RequestRef,
+    CallbackAction.OPEN: RequestRef,
+    CallbackAction.PAGE: PageRef,
+    CallbackAction.LIST: NoPayload,
+    CallbackAction.AMOUNT: AmountRef,
+    CallbackAction.ADD_COMMENT: AmountRef,
+    CallbackAction.CONFIRM_REQUEST: AmountRef,
+    CallbackAction.CANCEL_FLOW: NoPayload,
+    CallbackAction.REMIND: RequestRef,
+    CallbackAction.CANCEL: RequestRef,
+    CallbackAction.CONFIRM_RECEIPT: RequestRef,
+    CallbackAction.DISPUTE: RequestRef,
+    CallbackAction.MY_OPEN: MonthRequestRef,
+    CallbackAction.MY_PAGE: MonthPageRef,
+    CallbackAction.MY_LIST: MonthRef,
+}
+
+_ACTIONS = {action.value: action for action in CallbackAction}
+_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def pack_int(value: int) -> str:
+    """Encode a non-negative int in base 36."""
+    if value < 0:
+        raise ValueError(f"Cannot pack negative value {value}")
+    digits = ""
+    while True:
+        value, digit = divmod(value, 36)
+        digits = _DIGITS[digit] + digits
+        if not value:
+            return digits
+
+
+def pack(action: CallbackAction, *values: int | str) -> str:
+    """Encode callback data.
+
+    Strings are inserted verbatim, which lets keyboard templates keep
+    ``{}`` placeholders for values substituted at render time.
+    """
+    fields = PAYLOADS[action]._fields
+    if len(values) != len(fields):
+        raise TypeError(f"{action.name} takes {len(fields)} values, got {len(values)}")
+    return ":".join((action.value, *(v if isinstance(v, str) else pack_int(v) for v in values)))
+
+
+def unpack(data: str) -> tuple[CallbackAction, tuple] | None:
+    """Decode callback data; ``None`` if it is not valid for any action."""
+    code, *args = data.split(":")
+    action = _ACTIONS.get(code)
+    if action is None:
+        return None
+
+    payload_type = PAYLOADS[action]
+    if len(args) != len(payload_type._fields):
+        return None
+    # int() would also accept signs, spaces and underscores
+    if not all(arg.isascii() and arg.isalnum() for arg in args):
+        return None
+    return action, payload_type(*(int(arg, 36) for arg in args))
+
+
+CallbackHandler = Callable[..., Awaitable[Any]]
+
+
+class CallbackHandlers:
+    """Per-router table of callback handlers keyed by action.
+
+    Handlers take the ``CallbackQuery`` first and may ask for ``payload``
+    plus any other middleware data (``state``, ``service``, ...) by name,
+    like regular aiogram handlers. Router-level filters still apply.
+    """
+
+    def __init__(self, router: Router) -> None:
+        self._handlers: dict[CallbackAction, CallableObject] = {}
+        router.callback_query.register(self._dispatch, self._match)
+
+    def __call__(self, action: CallbackAction) -> Callable[[CallbackHandler], CallbackHandler]:
+        """Register decorated function as the handler for ``action``."""
+
+        def register(handler: CallbackHandler) -> CallbackHandler:
+            if action in self._handlers:
+                raise ValueError(f"Handler for {action.name} already registered")
+            self._handlers[action] = CallableObject(handler)
+            return handler
+
+        return register
+
+    def _match(self, callback: CallbackQuery) -> dict[str, Any] | bool:
+        """Filter: decode callback data and look up the handler."""
+        decoded = unpack(callback.data or "")
+        if decoded is None:
+            return False
+
+        action, payload = decoded
+        handler = self._handlers.get(action)
+        if handler is None:
+            return False
+        return {"payload": payload, "callback_handler": handler}
+
+    @staticmethod
+    async def _dispatch(
+        callback: CallbackQuery,
+        callback_handler: CallableObject,
+        **data: Any,
+    ) -> Any:
+        return await callback_handler.call(callback, **data)
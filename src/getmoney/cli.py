@@ -0,0 +1,40 @@
+"""Maintenance commands.
+
+Usage:
+    python -m getmoney.cli backfill-rollups
+"""
+
+import argparse
+import asyncio
+import logging
+
+from getmoney.db.session import engine, get_session
+from getmoney.services.rollup import RollupService
+
+logger = logging.getLogger(__name__)
+
+
+async def backfill_rollups() -> None:
+    """Recompute ``monthly_rollups`` from all requests."""
+    async with get_session() as session:
+        months = await RollupService(session).rebuild()
+    await engine.dispose()
+    logger.info(f"Rebuilt {months} monthly rollups")
+
+
+COMMANDS = {
+    "backfill-rollups": backfill_rollups,
+}
+
+
+def main() -> None:
+    """Run a maintenance command."""
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("command", choices=COMMANDS)
+    args = parser.parse_args()
+    asyncio.run(COMMANDS[args.command]())
+
+
+if __name__ == "__main__":
+    main()
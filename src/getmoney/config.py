@@ -1,8 +1,21 @@
 """Application configuration from environment variables."""
 
+from collections.abc import Mapping
+from enum import Enum
+from functools import cached_property
+from types import MappingProxyType
+
+from pydantic import model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class Role(str, Enum):
+    """Role of an allowed Telegram user."""
+
+    ADMIN = "admin"
+    USER = "user"
+
+
 class Settings(BaseSettings):
     """Application settings loaded from environment."""
 
@@ -21,14 +34,55 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = "postgresql+asyncpg://getmoney:password@db:5432/getmoney"
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    # Seconds before a connection is replaced (and loses its prepared statements), -1 to never
+    db_pool_recycle: int = -1
+    db_statement_cache_size: int = 100  # Prepared statements per connection, 0 to disable
+    db_pool_warmup: bool = True  # Open db_pool_size connections and prepare hot queries
 
     # Timezone
     tz: str = "Europe/Moscow"
 
-    @property
-    def allowed_user_ids(self) -> set[int]:
+    # Webhook mode (long polling is used when webhook_url is not set)
+    webhook_url: str | None = None  # Public base URL, e.g. https://bot.example.com
+    webhook_path: str = "/webhook"
+    webhook_secret: str | None = None  # Checked against X-Telegram-Bot-Api-Secret-Token
+    webhook_host: str = "0.0.0.0"
+    webhook_port: int = 8080
+
+    # Custom Bot API server (local Bot API or a fake server for load tests)
+    telegram_api_url: str | None = None
+
+    # Prometheus metrics endpoint (disabled when metrics_port is not set)
+    metrics_host: str = "127.0.0.1"
+    metrics_port: int | None = None
+
+    # Health (/health) and readiness (/ready) endpoint, used by the Docker HEALTHCHECK
+    health_host: str = "127.0.0.1"
+    health_port: int | None = 8090
+
+    # Log slow and repeated SQL statements per update (diagnostics, not for production)
+    sql_diagnostics: bool = False
+    slow_query_ms: int = 100
+
+    @model_validator(mode="after")
+    def require_webhook_secret(self) -> "Settings":
+        """Refuse webhook mode without a secret, or anyone could post fake updates."""
+        if self.webhook_url and not self.webhook_secret:
+            raise ValueError("WEBHOOK_SECRET is required when WEBHOOK_URL is set")
+        return self
+
+    @cached_property
+    def roles(self) -> Mapping[int, Role]:
+        """Read-only map of allowed user IDs to their roles."""
+        # Admin goes last so it wins if both IDs are the same
+        return MappingProxyType({self.user_user_id: Role.USER, self.admin_user_id: Role.ADMIN})
+
+    @cached_property
+    def allowed_user_ids(self) -> frozenset[int]:
         """Get set of allowed user IDs."""
-        return {self.admin_user_id, self.user_user_id}
+        return frozenset(self.roles)
 
     def is_admin(self, user_id: int) -> bool:
         """Check if user is admin."""
@@ -1,5 +1,5 @@
 """Database utilities."""
 
-from getmoney.db.session import get_session, init_db
+from getmoney.db.session import SCHEMA_REVISION, get_session, init_db, on_commit
 
-__all__ = ["get_session", "init_db"]
+__all__ = ["SCHEMA_REVISION", "get_session", "init_db", "on_commit"]
@@ -0,0 +1,143 @@
+"""PostgreSQL-backed FSM storage with a per-update write-behind cache."""
+
+import copy
+from collections.abc import Mapping
+from typing import Any, NamedTuple
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import (
+    BaseStorage,
+    DefaultKeyBuilder,
+    KeyBuilder,
+    StateType,
+    StorageKey,
+)
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from getmoney.models import FsmState
+
+
+class _Entry(NamedTuple):
+    """Cached state and data for one key."""
+
+    state: str | None
+    data: dict[str, Any]
+
+
+_EMPTY = _Entry(None, {})
+
+
+class PostgresStorage(BaseStorage):
+    """FSM storage persisted in the ``fsm_state`` table.
+
+    A key is loaded on first access and then served from the cache while
+    the update is handled. Writes only update the cache and mark the key
+    dirty; ``flush()`` writes all dirty keys with a single multi-row UPSERT
+    (keys back to an empty state are deleted instead). ``FsmFlushMiddleware``
+    flushes once per update and then evicts the key, so any number of
+    ``set_state``/``update_data`` calls in a handler cost one write, and the
+    next update reads the state fresh, even if another replica changed it.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        key_builder: KeyBuilder | None = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.key_builder = key_builder or DefaultKeyBuilder()
+        self._cache: dict[str, _Entry] = {}
+        self._dirty: set[str] = set()
+
+    async def _load(self, key: str) -> _Entry:
+        """Get cached entry, loading it from the database on first access."""
+        entry = self._cache.get(key)
+        if entry is not None:
+            return entry
+
+        async with self.session_factory() as session:
+            row = (
+                await session.execute(
+                    select(FsmState.state, FsmState.data).where(FsmState.key == key)
+                )
+            ).one_or_none()
+
+        # A concurrent write may have populated the cache meanwhile
+        entry = self._cache.get(key)
+        if entry is None:
+            entry = _Entry(row.state, row.data) if row else _EMPTY
+            self._cache[key] = entry
+        return entry
+
+    def _store(self, key: str, entry: _Entry) -> None:
+        self._cache[key] = entry
+        self._dirty.add(key)
+
+    def evict(self, key: StorageKey) -> None:
+        """Drop key from the cache unless it still has unflushed changes."""
+        k = self.key_builder.build(key)
+        if k not in self._dirty:
+            self._cache.pop(k, None)
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        """Set state for key (written on next flush)."""
+        k = self.key_builder.build(key)
+        entry = await self._load(k)
+        value = state.state if isinstance(state, State) else state
+        self._store(k, entry._replace(state=value))
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        """Get state for key."""
+        return (await self._load(self.key_builder.build(key))).state
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        """Replace data for key (written on next flush)."""
+        k = self.key_builder.build(key)
+        entry = await self._load(k)
+        self._store(k, entry._replace(data=copy.deepcopy(dict(data))))
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        """Get a copy of data for key."""
+        return copy.deepcopy((await self._load(self.key_builder.build(key))).data)
+
+    async def flush(self) -> None:
+        """Write all dirty keys to the database in one transaction."""
+        if not self._dirty:
+            return
+
+        keys, self._dirty = self._dirty, set()
+        upserts = []
+        deletes = []
+        for k in keys:
+            entry = self._cache[k]
+            if entry.state is None and not entry.data:
+                deletes.append(k)
+            else:
+                upserts.append({"key": k, "state": entry.state, "data": entry.data})
+
+        try:
+            async with self.session_factory() as session, session.begin():
+                if upserts:
+                    stmt = insert(FsmState).values(upserts)
+                    await session.execute(
+                        stmt.on_conflict_do_update(
+                            index_elements=[FsmState.key],
+                            set_={
+                                "state": stmt.excluded.state,
+                                "data": stmt.excluded.data,
+                                "updated_at": func.now(),
+                            },
+                        )
+                    )
+                if deletes:
+                    await session.execute(delete(FsmState).where(FsmState.key.in_(deletes)))
+        except Exception:
+            # Keep the changes for the next flush
+            self._dirty |= keys
+            raise
+
+    async def close(self) -> None:
+        """Flush pending writes."""
+        await self.flush()
@@ -1,19 +1,41 @@
 """Database session management."""
 
-from collections.abc import AsyncGenerator
-from contextlib import asynccontextmanager
+import asyncio
+import logging
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from contextlib import AsyncExitStack, asynccontextmanager
 
+from sqlalchemy import event, text
+from sqlalchemy.exc import ProgrammingError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from getmoney.config import settings
 from getmoney.models import Base
 
+logger = logging.getLogger(__name__)
+
+# Latest Alembic revision; must be bumped together with every new migration
+SCHEMA_REVISION = "010_reminded_at"
+
+# Checkouts are only timed when metrics are served
+pool_class: type[AsyncAdaptedQueuePool] = AsyncAdaptedQueuePool
+if settings.metrics_port:
+    from getmoney.monitoring.db import TimedQueuePool
+
+    pool_class = TimedQueuePool
+
 engine = create_async_engine(
     settings.database_url,
     echo=False,
     pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_recycle=settings.db_pool_recycle,
+    poolclass=pool_class,
+    # Size of the asyncpg dialect's per-connection LRU of prepared statements
+    connect_args={"prepared_statement_cache_size": settings.db_statement_cache_size},
 )
 
 async_session_factory = async_sessionmaker(
@@ -24,12 +46,57 @@ async_session_factory = async_sessionmaker(
 )
 
 
+async def get_schema_revision() -> str | None:
+    """Alembic revision of the database, ``None`` if migrations never ran."""
+    async with engine.connect() as conn:
+        try:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+        except ProgrammingError:
+            return None
+        return result.scalar_one_or_none()
+
+
 async def init_db() -> None:
-    """Initialize database (create tables if not exist)."""
+    """Initialize database (create tables if not exist).
+
+    A schema already migrated to ``SCHEMA_REVISION`` is left alone, which
+    saves ``create_all`` inspecting every table on each restart.
+    """
+    revision = await get_schema_revision()
+    if revision == SCHEMA_REVISION:
+        return
+
+    if revision is not None:
+        logger.warning(
+            f"Database is at revision {revision}, expected {SCHEMA_REVISION}; "
+            f"run 'alembic upgrade head'"
+        )
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
 
+async def warm_up(
+    prepare: Callable[[AsyncSession], Awaitable[object]],
+    connections: int,
+) -> bool:
+    """Open ``connections`` pooled connections and run ``prepare`` on each.
+
+    All sessions stay open until every ``prepare`` finishes, so each one
+    holds a different connection. Their transactions are rolled back.
+    Best effort: a failure is logged and ``False`` returned.
+    """
+    try:
+        async with AsyncExitStack() as stack:
+            sessions = [
+                await stack.enter_async_context(async_session_factory()) for _ in range(connections)
+            ]
+            await asyncio.gather(*(prepare(session) for session in sessions))
+    except Exception as e:
+        logger.warning(f"Database warm-up failed: {e}")
+        return False
+    return True
+
+
 @asynccontextmanager
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     """Get database session context manager."""
@@ -40,3 +107,22 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         except Exception:
             await session.rollback()
             raise
+
+
+def on_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+    """Run ``callback`` after the session's current transaction commits.
+
+    Callbacks are discarded if the transaction is rolled back instead.
+    """
+    session.sync_session.info.setdefault("on_commit", []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_on_commit(session: Session) -> None:
+    for callback in session.info.pop("on_commit", ()):
+        callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_commit(session: Session) -> None:
+    session.info.pop("on_commit", None)
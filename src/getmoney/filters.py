@@ -0,0 +1,16 @@
+"""Custom aiogram filters."""
+
+from aiogram.filters import Filter
+from aiogram.types import TelegramObject
+
+from getmoney.config import Role
+
+
+class RoleFilter(Filter):
+    """Pass events from users with the given role (set by ``AccessMiddleware``)."""
+
+    def __init__(self, role: Role) -> None:
+        self.role = role
+
+    async def __call__(self, event: TelegramObject, role: Role | None = None) -> bool:
+        return role is self.role
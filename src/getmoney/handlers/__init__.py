@@ -4,7 +4,7 @@ from aiogram import Router
 
 from getmoney.handlers.user import router as user_router
 from getmoney.handlers.admin import router as admin_router
-from getmoney.handlers.common import router as common_router
+from getmoney.handlers.common import fallback_router, router as common_router
 
 
 def setup_routers() -> Router:
@@ -15,6 +15,7 @@ def setup_routers() -> Router:
     main_router.include_router(common_router)
     main_router.include_router(admin_router)
     main_router.include_router(user_router)
+    main_router.include_router(fallback_router)
 
     return main_router
 
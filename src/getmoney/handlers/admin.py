@@ -1,20 +1,35 @@
 """Admin (husband) handlers."""
 
 from datetime import datetime
+from tempfile import SpooledTemporaryFile
 from zoneinfo import ZoneInfo
 
-from aiogram import Bot, Router, F
+from aiogram import Router, F
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.types import Message, CallbackQuery
-
-from getmoney.config import settings
-from getmoney.db import get_session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from getmoney.callbacks import (
+    CallbackAction,
+    CallbackHandlers,
+    EtaChoice,
+    NoPayload,
+    PageRef,
+    RequestRef,
+)
+from getmoney.config import Role, settings
+from getmoney.filters import RoleFilter
 from getmoney.keyboards import AdminKeyboards
-from getmoney.services import RequestService
+from getmoney.services import OutboxService, RequestService
+from getmoney.services.request import Page
 
 router = Router()
+router.message.filter(RoleFilter(Role.ADMIN))
+router.callback_query.filter(RoleFilter(Role.ADMIN))
+
+callbacks = CallbackHandlers(router)
 
 
 class AdminStates(StatesGroup):
@@ -27,90 +42,138 @@ class AdminStates(StatesGroup):
 # === Main Menu ===
 
 
-@router.message(
-    F.text == "📋 Активные запросы",
-    F.from_user.id == settings.admin_user_id,
-)
-async def show_active_requests(message: Message) -> None:
-    """Show all active requests."""
-    async with get_session() as session:
-        service = RequestService(session)
-        requests = await service.get_active_requests()
-
-    if not requests:
-        await message.answer("✅ Нет активных запросов.")
-        return
+def active_list_text(page: Page) -> str:
+    """Text of the active requests list message."""
+    if not page.requests:
+        return "✅ Нет активных запросов."
 
     text = "📋 Активные запросы:\n\n"
-    for r in requests:
-        text += f"#{r.id} — {r.format_amount()} ₽ — {r.status_enum.display_name}\n"
+    for r in page.requests:
+        text += f"#{r.id} — {r.format_amount()} ₽ — {r.status.display_name}\n"
+    return text
 
-    await message.answer(text)
 
-    # Send each request with action buttons
-    for r in requests:
-        keyboard = AdminKeyboards.request_actions(r)
-        if keyboard:
+@router.message(F.text == "📋 Активные запросы")
+async def show_active_requests(message: Message, service: RequestService) -> None:
+    """Show active requests as a single paginated message."""
+    page = await service.get_active_page()
+
+    await message.answer(
+        active_list_text(page),
+        reply_markup=AdminKeyboards.active_page(page) if page.requests else None,
+    )
+
+
+@router.message(Command("active"))
+async def cmd_active(message: Message, service: RequestService) -> None:
+    """Command to show active requests."""
+    await show_active_requests(message, service)
+
+
+@router.message(Command("export"))
+async def cmd_export(message: Message, session: AsyncSession) -> None:
+    """Send full request history as a CSV document."""
+    # Rarely used, so kept out of startup imports
+    from getmoney.services.export import (
+        MAX_DOCUMENT_SIZE,
+        SPOOL_MAX_SIZE,
+        ExportService,
+        SpooledInputFile,
+    )
+
+    with SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as file:
+        count = await ExportService(session).write_csv(file)
+        size = file.tell()
+
+        if size > MAX_DOCUMENT_SIZE:
             await message.answer(
-                f"📝 Запрос #{r.id}\n\n{r.format_full()}",
-                reply_markup=keyboard,
+                f"⚠️ Выгрузка слишком большая для Telegram ({size // (1024 * 1024)} МБ)."
             )
+            return
 
+        filename = f"requests_{datetime.now(ZoneInfo(settings.tz)):%Y-%m-%d}.csv"
+        await message.answer_document(
+            SpooledInputFile(file, filename),
+            caption=f"📄 Все запросы: {count}",
+        )
 
-@router.message(
-    Command("active"),
-    F.from_user.id == settings.admin_user_id,
-)
-async def cmd_active(message: Message) -> None:
-    """Command to show active requests."""
-    await show_active_requests(message)
+
+@callbacks(CallbackAction.PAGE)
+@callbacks(CallbackAction.LIST)
+async def turn_page(
+    callback: CallbackQuery,
+    payload: PageRef | NoPayload,
+    service: RequestService,
+) -> None:
+    """Show another page of active requests in the same message."""
+    cursor = payload.cursor_args() if isinstance(payload, PageRef) else {}
+    page = await service.get_active_page(**cursor)
+
+    await callback.message.edit_text(
+        active_list_text(page),
+        reply_markup=AdminKeyboards.active_page(page) if page.requests else None,
+    )
+    await callback.answer()
+
+
+@callbacks(CallbackAction.OPEN)
+async def open_request(
+    callback: CallbackQuery,
+    payload: RequestRef,
+    service: RequestService,
+) -> None:
+    """Show a request from the list with its actions."""
+    request = await service.get_request(payload.request_id)
+
+    if not request:
+        await callback.answer("❌ Запрос не найден", show_alert=True)
+        return
+
+    await callback.message.edit_text(
+        f"📝 Запрос #{request.id}\n\n{request.format_full()}",
+        reply_markup=AdminKeyboards.request_detail(request),
+    )
+    await callback.answer()
 
 
 # === Approve Flow ===
 
 
-@router.callback_query(
-    F.data.startswith("admin:approve:"),
-    F.from_user.id == settings.admin_user_id,
-)
-async def start_approve(callback: CallbackQuery) -> None:
+@callbacks(CallbackAction.APPROVE)
+async def start_approve(callback: CallbackQuery, payload: RequestRef) -> None:
     """Start approval - show ETA options."""
-    request_id = int(callback.data.split(":")[2])
-
     await callback.message.edit_reply_markup(
-        reply_markup=AdminKeyboards.eta_selection(request_id)
+        reply_markup=AdminKeyboards.eta_selection(payload.request_id)
     )
     await callback.answer()
 
 
-@router.callback_query(
-    F.data.startswith("admin:eta:"),
-    F.from_user.id == settings.admin_user_id,
-)
-async def select_eta(callback: CallbackQuery, bot: Bot) -> None:
+@callbacks(CallbackAction.ETA)
+async def select_eta(
+    callback: CallbackQuery,
+    payload: EtaChoice,
+    service: RequestService,
+    outbox: OutboxService,
+) -> None:
     """Handle ETA selection."""
-    parts = callback.data.split(":")
-    request_id = int(parts[2])
-    eta_option = parts[3]
+    request_id = payload.request_id
 
-    async with get_session() as session:
-        service = RequestService(session)
-        eta = service.calculate_eta(eta_option)
-        request = await service.approve_request(request_id, eta)
+    eta = service.calculate_eta(payload.option_name)
+    request = await service.approve_request(request_id, eta)
 
-        if not request:
-            await callback.answer("❌ Ошибка при одобрении", show_alert=True)
-            return
+    if not request:
+        await callback.answer("❌ Ошибка при одобрении", show_alert=True)
+        return
 
-        # Notify user
-        await bot.send_message(
-            chat_id=settings.user_user_id,
-            text=(
-                f"✅ Запрос #{request.id} одобрен!\n\n"
-                f"💰 Сумма: {request.format_amount()} ₽\n"
-                f"⏰ ETA: {eta.strftime('%d.%m.%Y %H:%M')}"
-            ),
-        )
+    # Notify user
+    outbox.enqueue(
+        chat_id=settings.user_user_id,
+        text=(
+            f"✅ Запрос #{request.id} одобрен!\n\n"
+            f"💰 Сумма: {request.format_amount()} ₽\n"
+            f"⏰ ETA: {eta.strftime('%d.%m.%Y %H:%M')}"
+        ),
+    )
 
     # Update admin message
     await callback.message.edit_text(
@@ -122,13 +185,14 @@ async def select_eta(callback: CallbackQuery, bot: Bot) -> None:
     await callback.answer("Одобрено!")
 
 
-@router.callback_query(
-    F.data.startswith("admin:eta_manual:"),
-    F.from_user.id == settings.admin_user_id,
-)
-async def ask_manual_eta(callback: CallbackQuery, state: FSMContext) -> None:
+@callbacks(CallbackAction.ETA_MANUAL)
+async def ask_manual_eta(
+    callback: CallbackQuery,
+    payload: RequestRef,
+    state: FSMContext,
+) -> None:
     """Ask for manual ETA input."""
-    request_id = int(callback.data.split(":")[2])
+    request_id = payload.request_id
     await state.update_data(request_id=request_id)
     await state.set_state(AdminStates.waiting_for_eta)
 
@@ -139,11 +203,13 @@ async def ask_manual_eta(callback: CallbackQuery, state: FSMContext) -> None:
     await callback.answer()
 
 
-@router.message(
-    AdminStates.waiting_for_eta,
-    F.from_user.id == settings.admin_user_id,
-)
-async def receive_manual_eta(message: Message, state: FSMContext, bot: Bot) -> None:
+@router.message(AdminStates.waiting_for_eta)
+async def receive_manual_eta(
+    message: Message,
+    state: FSMContext,
+    service: RequestService,
+    outbox: OutboxService,
+) -> None:
     """Receive manual ETA input."""
     data = await state.get_data()
     request_id = data.get("request_id")
@@ -176,29 +242,26 @@ async def receive_manual_eta(message: Message, state: FSMContext, bot: Bot) -> N
 
     if not eta:
         await message.answer(
-            "❌ Неверный формат. Используй: ДД.ММ.ГГГГ ЧЧ:ММ\n"
-            "Например: 25.12.2024 18:00"
+            "❌ Неверный формат. Используй: ДД.ММ.ГГГГ ЧЧ:ММ\n" "Например: 25.12.2024 18:00"
         )
         return
 
-    async with get_session() as session:
-        service = RequestService(session)
-        request = await service.approve_request(request_id, eta)
+    request = await service.approve_request(request_id, eta)
 
-        if not request:
-            await message.answer("❌ Ошибка при одобрении")
-            await state.clear()
-            return
+    if not request:
+        await message.answer("❌ Ошибка при одобрении")
+        await state.clear()
+        return
 
-        # Notify user
-        await bot.send_message(
-            chat_id=settings.user_user_id,
-            text=(
-                f"✅ Запрос #{request.id} одобрен!\n\n"
-                f"💰 Сумма: {request.format_amount()} ₽\n"
-                f"⏰ ETA: {eta.strftime('%d.%m.%Y %H:%M')}"
-            ),
-        )
+    # Notify user
+    outbox.enqueue(
+        chat_id=settings.user_user_id,
+        text=(
+            f"✅ Запрос #{request.id} одобрен!\n\n"
+            f"💰 Сумма: {request.format_amount()} ₽\n"
+            f"⏰ ETA: {eta.strftime('%d.%m.%Y %H:%M')}"
+        ),
+    )
 
     await state.clear()
     await message.answer(
@@ -212,38 +275,37 @@ async def receive_manual_eta(message: Message, state: FSMContext, bot: Bot) -> N
 # === Sent ===
 
 
-@router.callback_query(
-    F.data.startswith("admin:sent:"),
-    F.from_user.id == settings.admin_user_id,
-)
-async def mark_sent(callback: CallbackQuery, bot: Bot) -> None:
+@callbacks(CallbackAction.SEND)
+async def mark_sent(
+    callback: CallbackQuery,
+    payload: RequestRef,
+    service: RequestService,
+    outbox: OutboxService,
+) -> None:
     """Mark request as money sent."""
-    request_id = int(callback.data.split(":")[2])
+    request_id = payload.request_id
 
-    async with get_session() as session:
-        service = RequestService(session)
-        request = await service.mark_sent(request_id)
+    request = await service.mark_sent(request_id)
 
-        if not request:
-            await callback.answer("❌ Ошибка", show_alert=True)
-            return
+    if not request:
+        await callback.answer("❌ Ошибка", show_alert=True)
+        return
 
-        # Notify user with confirmation buttons
-        from getmoney.keyboards import UserKeyboards
-
-        await bot.send_message(
-            chat_id=settings.user_user_id,
-            text=(
-                f"💸 Средства отправлены!\n\n"
-                f"Запрос #{request.id}: {request.format_amount()} ₽\n\n"
-                f"Пожалуйста, подтверди получение."
-            ),
-            reply_markup=UserKeyboards.request_actions(request),
-        )
+    # Notify user with confirmation buttons
+    from getmoney.keyboards import UserKeyboards
+
+    outbox.enqueue(
+        chat_id=settings.user_user_id,
+        text=(
+            f"💸 Средства отправлены!\n\n"
+            f"Запрос #{request.id}: {request.format_amount()} ₽\n\n"
+            f"Пожалуйста, подтверди получение."
+        ),
+        reply_markup=UserKeyboards.request_actions(request),
+    )
 
     await callback.message.edit_text(
-        f"💸 Запрос #{request_id} — средства отправлены.\n\n"
-        f"Ожидаем подтверждение получения."
+        f"💸 Запрос #{request_id} — средства отправлены.\n\n" f"Ожидаем подтверждение получения."
     )
     await callback.answer("Отмечено как отправленное!")
 
@@ -251,87 +313,81 @@ async def mark_sent(callback: CallbackQuery, bot: Bot) -> None:
 # === Reject Flow ===
 
 
-@router.callback_query(
-    F.data.startswith("admin:reject:"),
-    F.from_user.id == settings.admin_user_id,
-)
-async def start_reject(callback: CallbackQuery) -> None:
+@callbacks(CallbackAction.REJECT)
+async def start_reject(callback: CallbackQuery, payload: RequestRef) -> None:
     """Start rejection flow."""
-    request_id = int(callback.data.split(":")[2])
-
     await callback.message.edit_reply_markup(
-        reply_markup=AdminKeyboards.reject_confirm(request_id)
+        reply_markup=AdminKeyboards.reject_confirm(payload.request_id)
     )
     await callback.answer()
 
 
-@router.callback_query(
-    F.data.startswith("admin:reject_confirm:"),
-    F.from_user.id == settings.admin_user_id,
-)
-async def confirm_reject(callback: CallbackQuery, bot: Bot) -> None:
+@callbacks(CallbackAction.REJECT_CONFIRM)
+async def confirm_reject(
+    callback: CallbackQuery,
+    payload: RequestRef,
+    service: RequestService,
+    outbox: OutboxService,
+) -> None:
     """Reject without comment."""
-    request_id = int(callback.data.split(":")[2])
+    request_id = payload.request_id
 
-    async with get_session() as session:
-        service = RequestService(session)
-        request = await service.reject_request(request_id)
+    request = await service.reject_request(request_id)
 
-        if not request:
-            await callback.answer("❌ Ошибка", show_alert=True)
-            return
+    if not request:
+        await callback.answer("❌ Ошибка", show_alert=True)
+        return
 
-        # Notify user
-        await bot.send_message(
-            chat_id=settings.user_user_id,
-            text=f"❌ Запрос #{request.id} на {request.format_amount()} ₽ отклонён.",
-        )
+    # Notify user
+    outbox.enqueue(
+        chat_id=settings.user_user_id,
+        text=f"❌ Запрос #{request.id} на {request.format_amount()} ₽ отклонён.",
+    )
 
     await callback.message.edit_text(f"❌ Запрос #{request_id} отклонён.")
     await callback.answer()
 
 
-@router.callback_query(
-    F.data.startswith("admin:reject_comment:"),
-    F.from_user.id == settings.admin_user_id,
-)
-async def ask_reject_comment(callback: CallbackQuery, state: FSMContext) -> None:
+@callbacks(CallbackAction.REJECT_COMMENT)
+async def ask_reject_comment(
+    callback: CallbackQuery,
+    payload: RequestRef,
+    state: FSMContext,
+) -> None:
     """Ask for rejection reason."""
-    request_id = int(callback.data.split(":")[2])
+    request_id = payload.request_id
     await state.update_data(request_id=request_id)
     await state.set_state(AdminStates.waiting_for_reject_comment)
 
-    await callback.message.edit_text(
-        f"📝 Запрос #{request_id}\n\nВведи причину отклонения:"
-    )
+    await callback.message.edit_text(f"📝 Запрос #{request_id}\n\nВведи причину отклонения:")
     await callback.answer()
 
 
-@router.message(
-    AdminStates.waiting_for_reject_comment,
-    F.from_user.id == settings.admin_user_id,
-)
-async def receive_reject_comment(message: Message, state: FSMContext, bot: Bot) -> None:
+@router.message(AdminStates.waiting_for_reject_comment)
+async def receive_reject_comment(
+    message: Message,
+    state: FSMContext,
+    service: RequestService,
+    outbox: OutboxService,
+) -> None:
     """Receive rejection comment and reject."""
     data = await state.get_data()
     request_id = data.get("request_id")
     comment = message.text[:500] if message.text else None
 
-    async with get_session() as session:
-        service = RequestService(session)
-        request = await service.reject_request(request_id, comment)
+    request = await service.reject_request(request_id, comment)
 
-        if not request:
-            await message.answer("❌ Ошибка при отклонении")
-            await state.clear()
-            return
+    if not request:
+        await message.answer("❌ Ошибка при отклонении")
+        await state.clear()
+        return
 
-        # Notify user
-        text = f"❌ Запрос #{request.id} на {request.format_amount()} ₽ отклонён."
-        if comment:
-            text += f"\n\n💬 Причина: {comment}"
+    # Notify user
+    text = f"❌ Запрос #{request.id} на {request.format_amount()} ₽ отклонён."
+    if comment:
+        text += f"\n\n💬 Причина: {comment}"
 
-        await bot.send_message(chat_id=settings.user_user_id, text=text)
+    outbox.enqueue(chat_id=settings.user_user_id, text=text)
 
     await state.clear()
     await message.answer(f"❌ Запрос #{request_id} отклонён с комментарием.")
@@ -340,25 +396,24 @@ async def receive_reject_comment(message: Message, state: FSMContext, bot: Bot)
 # === Back Navigation ===
 
 
-@router.callback_query(
-    F.data.startswith("admin:back:"),
-    F.from_user.id == settings.admin_user_id,
-)
-async def go_back(callback: CallbackQuery, state: FSMContext) -> None:
+@callbacks(CallbackAction.BACK)
+async def go_back(
+    callback: CallbackQuery,
+    payload: RequestRef,
+    state: FSMContext,
+    service: RequestService,
+) -> None:
     """Go back to original request actions."""
     await state.clear()
-    request_id = int(callback.data.split(":")[2])
 
-    async with get_session() as session:
-        service = RequestService(session)
-        request = await service.get_request(request_id)
+    request = await service.get_request(payload.request_id)
 
-        if not request:
-            await callback.answer("❌ Запрос не найден", show_alert=True)
-            return
+    if not request:
+        await callback.answer("❌ Запрос не найден", show_alert=True)
+        return
 
-        await callback.message.edit_text(
-            f"📝 Запрос #{request.id}\n\n{request.format_full()}",
-            reply_markup=AdminKeyboards.request_actions(request),
-        )
+    await callback.message.edit_text(
+        f"📝 Запрос #{request.id}\n\n{request.format_full()}",
+        reply_markup=AdminKeyboards.request_detail(request),
+    )
     await callback.answer()
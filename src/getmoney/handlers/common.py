@@ -1,28 +1,22 @@
-"""Common handlers (start, help, access control)."""
+"""Common handlers (start, help, id)."""
 
 from aiogram import Router, F
 from aiogram.filters import Command
-from aiogram.types import Message
+from aiogram.types import CallbackQuery, Message
 
-from getmoney.config import settings
+from getmoney.config import Role
 from getmoney.keyboards import UserKeyboards, AdminKeyboards
 
 router = Router()
 
+# Included last: catches callbacks no other router handled
+fallback_router = Router()
 
-@router.message(Command("start"))
-async def cmd_start(message: Message) -> None:
-    """Handle /start command."""
-    user_id = message.from_user.id if message.from_user else 0
-
-    if user_id not in settings.allowed_user_ids:
-        await message.answer(
-            "⛔ Доступ запрещён.\n"
-            "Этот бот работает только для авторизованных пользователей."
-        )
-        return
 
-    if settings.is_admin(user_id):
+@router.message(Command("start"))
+async def cmd_start(message: Message, role: Role) -> None:
+    """Handle /start command (unknown users are turned away by AccessMiddleware)."""
+    if role is Role.ADMIN:
         await message.answer(
             "👋 Привет, админ!\n\n"
             "Здесь ты будешь получать запросы на средства.\n"
@@ -39,17 +33,16 @@ async def cmd_start(message: Message) -> None:
 
 
 @router.message(Command("help"))
-async def cmd_help(message: Message) -> None:
+async def cmd_help(message: Message, role: Role) -> None:
     """Handle /help command."""
-    user_id = message.from_user.id if message.from_user else 0
-
-    if settings.is_admin(user_id):
+    if role is Role.ADMIN:
         text = (
             "📖 Справка (Админ)\n\n"
             "• Ты получаешь уведомления о новых запросах\n"
             "• Можешь одобрить, отклонить или сразу отметить как отправленное\n"
             "• При одобрении укажи ETA - когда средства будут отправлены\n"
-            "• Используй /active для просмотра всех активных запросов"
+            "• Используй /active для просмотра всех активных запросов\n"
+            "• /export - выгрузить всю историю запросов в CSV"
         )
     else:
         text = (
@@ -67,3 +60,9 @@ async def cmd_id(message: Message) -> None:
     """Show user's Telegram ID (useful for setup)."""
     user_id = message.from_user.id if message.from_user else 0
     await message.answer(f"🆔 Твой Telegram ID: `{user_id}`", parse_mode="Markdown")
+
+
+@fallback_router.callback_query()
+async def stale_callback(callback: CallbackQuery) -> None:
+    """Answer buttons that no handler recognises (e.g. from old messages)."""
+    await callback.answer("⚠️ Кнопка устарела. Открой список заново.", show_alert=True)
@@ -3,22 +3,33 @@
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
-from aiogram import Bot, Router, F
+from aiogram import Router, F
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
-from aiogram.types import Message, CallbackQuery
-
-from getmoney.config import settings
-from getmoney.db import get_session
+from aiogram.types import CallbackQuery, InlineKeyboardMarkup, Message
+
+from getmoney.callbacks import (
+    AmountRef,
+    CallbackAction,
+    CallbackHandlers,
+    MonthPageRef,
+    MonthRef,
+    MonthRequestRef,
+    RequestRef,
+)
+from getmoney.config import Role, settings
+from getmoney.filters import RoleFilter
 from getmoney.keyboards import UserKeyboards
 from getmoney.keyboards.admin import AdminKeyboards
-from getmoney.services import RequestService
+from getmoney.services import OutboxService, RequestService
 
 router = Router()
 
 # Filter: only allow the regular user (wife)
-router.message.filter(F.from_user.id == settings.user_user_id)
-router.callback_query.filter(F.from_user.id == settings.user_user_id)
+router.message.filter(RoleFilter(Role.USER))
+router.callback_query.filter(RoleFilter(Role.USER))
+
+callbacks = CallbackHandlers(router)
 
 
 class RequestStates(StatesGroup):
@@ -42,10 +53,14 @@ async def start_request(message: Message, state: FSMContext) -> None:
     )
 
 
-@router.callback_query(F.data.startswith("amount:"))
-async def select_amount(callback: CallbackQuery, state: FSMContext) -> None:
+@callbacks(CallbackAction.AMOUNT)
+async def select_amount(
+    callback: CallbackQuery,
+    payload: AmountRef,
+    state: FSMContext,
+) -> None:
     """Handle amount button selection."""
-    amount = int(callback.data.split(":")[1])
+    amount = payload.amount
     await state.update_data(amount=amount)
     await state.set_state(RequestStates.confirming)
 
@@ -78,13 +93,11 @@ async def enter_custom_amount(message: Message, state: FSMContext) -> None:
     )
 
 
-@router.callback_query(F.data.startswith("add_comment:"))
+@callbacks(CallbackAction.ADD_COMMENT)
 async def ask_for_comment(callback: CallbackQuery, state: FSMContext) -> None:
     """Ask user to enter comment."""
     await state.set_state(RequestStates.waiting_for_comment)
-    await callback.message.edit_text(
-        "💬 Введи комментарий к запросу:"
-    )
+    await callback.message.edit_text("💬 Введи комментарий к запросу:")
     await callback.answer()
 
 
@@ -98,50 +111,45 @@ async def receive_comment(message: Message, state: FSMContext) -> None:
     await state.update_data(comment=comment)
 
     await message.answer(
-        f"💰 Сумма: {amount:,} ₽\n💬 Комментарий: {comment}\n\nОтправить запрос?".replace(
-            ",", " "
-        ),
+        f"💰 Сумма: {amount:,} ₽\n💬 Комментарий: {comment}\n\nОтправить запрос?".replace(",", " "),
         reply_markup=UserKeyboards.confirm_request(amount),
     )
 
 
-@router.callback_query(F.data.startswith("confirm_request:"))
-async def confirm_request(callback: CallbackQuery, state: FSMContext, bot: Bot) -> None:
+@callbacks(CallbackAction.CONFIRM_REQUEST)
+async def confirm_request(
+    callback: CallbackQuery,
+    payload: AmountRef,
+    state: FSMContext,
+    service: RequestService,
+    outbox: OutboxService,
+) -> None:
     """Confirm and create request."""
     data = await state.get_data()
-    amount = data.get("amount") or int(callback.data.split(":")[1])
+    amount = data.get("amount") or payload.amount
     comment = data.get("comment")
 
     user_id = callback.from_user.id
 
-    async with get_session() as session:
-        service = RequestService(session)
-        request = await service.create_request(
-            user_id=user_id,
-            amount=amount,
-            comment=comment,
-        )
-
-        # Notify admin
-        admin_text = (
-            f"🆕 Новый запрос #{request.id}\n\n"
-            f"💰 Сумма: {request.format_amount()} ₽\n"
-        )
-        if comment:
-            admin_text += f"💬 Комментарий: {comment}\n"
-        admin_text += f"📅 {request.created_at.strftime('%d.%m.%Y %H:%M')}"
-
-        admin_msg = await bot.send_message(
-            chat_id=settings.admin_user_id,
-            text=admin_text,
-            reply_markup=AdminKeyboards.new_request_actions(request.id),
-        )
-
-        # Save message IDs
-        await service.update_message_ids(
-            request.id,
-            admin_message_id=admin_msg.message_id,
-        )
+    request = await service.create_request(
+        user_id=user_id,
+        amount=amount,
+        comment=comment,
+    )
+
+    # Notify admin
+    admin_text = f"🆕 Новый запрос #{request.id}\n\n" f"💰 Сумма: {request.format_amount()} ₽\n"
+    if comment:
+        admin_text += f"💬 Комментарий: {comment}\n"
+    admin_text += f"📅 {request.created_at.strftime('%d.%m.%Y %H:%M')}"
+
+    # Admin message ID is saved on the request once delivered
+    outbox.enqueue(
+        chat_id=settings.admin_user_id,
+        text=admin_text,
+        reply_markup=AdminKeyboards.new_request_actions(request.id),
+        request_id=request.id,
+    )
 
     await state.clear()
     await callback.message.edit_text(
@@ -151,7 +159,7 @@ async def confirm_request(callback: CallbackQuery, state: FSMContext, bot: Bot)
     await callback.answer()
 
 
-@router.callback_query(F.data == "cancel_request_flow")
+@callbacks(CallbackAction.CANCEL_FLOW)
 async def cancel_request_flow(callback: CallbackQuery, state: FSMContext) -> None:
     """Cancel request creation."""
     await state.clear()
@@ -162,39 +170,36 @@ async def cancel_request_flow(callback: CallbackQuery, state: FSMContext) -> Non
 # === View Requests ===
 
 
-@router.message(F.text.in_(["📋 Мои запросы (этот месяц)", "📋 Прошлый месяц"]))
-async def show_requests(message: Message) -> None:
-    """Show user's requests for month."""
-    user_id = message.from_user.id if message.from_user else 0
-    tz = ZoneInfo(settings.tz)
-    now = datetime.now(tz)
+def month_name(year: int, month: int) -> str:
+    """Human-readable month relative to now."""
+    now = datetime.now(ZoneInfo(settings.tz))
+    if (year, month) == (now.year, now.month):
+        return "этот месяц"
+    previous = (now.year - 1, 12) if now.month == 1 else (now.year, now.month - 1)
+    if (year, month) == previous:
+        return "прошлый месяц"
+    return f"{month:02d}.{year}"
 
-    if "Прошлый" in message.text:
-        # Previous month
-        if now.month == 1:
-            year, month = now.year - 1, 12
-        else:
-            year, month = now.year, now.month - 1
-        month_name = "прошлый месяц"
-    else:
-        year, month = now.year, now.month
-        month_name = "этот месяц"
 
-    async with get_session() as session:
-        service = RequestService(session)
-        requests = await service.get_monthly_requests(user_id, year, month)
-        stats = await service.get_monthly_stats(user_id, year, month)
+async def month_view(
+    service: RequestService,
+    user_id: int,
+    year: int,
+    month: int,
+) -> tuple[str, InlineKeyboardMarkup | None]:
+    """Build the monthly summary message and its active requests keyboard."""
+    name = month_name(year, month)
+    requests, stats = await service.get_monthly_view(user_id, year, month)
 
     if not requests:
-        await message.answer(f"📋 Нет запросов за {month_name}.")
-        return
+        return f"📋 Нет запросов за {name}.", None
 
     # Format requests list
-    lines = [f"📋 Запросы за {month_name}:\n"]
+    lines = [f"📋 Запросы за {name}:\n"]
 
     # Active requests first
-    active = [r for r in requests if r.status_enum.is_active]
-    completed = [r for r in requests if not r.status_enum.is_active]
+    active = [r for r in requests if r.status.is_active]
+    completed = [r for r in requests if not r.status.is_active]
 
     if active:
         lines.append("🔔 Активные:")
@@ -202,10 +207,10 @@ async def show_requests(message: Message) -> None:
             day_name = r.created_at.strftime("%a")
             lines.append(
                 f"  • {r.created_at.strftime('%d.%m')} ({day_name}) — "
-                f"{r.format_amount()} ₽ — {r.status_enum.display_name}"
+                f"{r.format_amount()} ₽ — {r.status.display_name}"
             )
-            if r.status_enum.can_confirm_receipt:
-                lines.append("    ⬆️ Нажми для подтверждения получения")
+            if r.status.can_confirm_receipt:
+                lines.append("    ⬇️ Открой запрос ниже для подтверждения получения")
         lines.append("")
 
     if completed:
@@ -214,7 +219,7 @@ async def show_requests(message: Message) -> None:
             day_name = r.created_at.strftime("%a")
             lines.append(
                 f"  • {r.created_at.strftime('%d.%m')} ({day_name}) — "
-                f"{r.format_amount()} ₽ — {r.status_enum.display_name}"
+                f"{r.format_amount()} ₽ — {r.status.display_name}"
             )
         if len(completed) > 10:
             lines.append(f"  ... и ещё {len(completed) - 10}")
@@ -228,94 +233,161 @@ async def show_requests(message: Message) -> None:
     if stats.rejected:
         lines.append(f"  ❌ Отклонено: {stats.rejected:,} ₽".replace(",", " "))
 
-    text = "\n".join(lines)
+    # The month's active requests are opened from buttons on the same message
+    page = await service.get_active_page(user_id, created=service.month_range(year, month))
+    keyboard = UserKeyboards.active_page(page, year * 100 + month) if page.requests else None
+    return "\n".join(lines), keyboard
 
-    # Send summary message
-    await message.answer(text)
 
-    # Send each active request with action buttons (like admin view)
-    actionable = [r for r in active if r.status_enum.can_cancel or r.status_enum.can_confirm_receipt or r.status_enum.can_remind]
-    for r in actionable:
-        keyboard = UserKeyboards.request_actions(r)
-        if keyboard:
-            await message.answer(
-                f"📝 Запрос #{r.id}:\n{r.format_full()}",
-                reply_markup=keyboard,
-            )
+@router.message(F.text.in_(["📋 Мои запросы (этот месяц)", "📋 Прошлый месяц"]))
+async def show_requests(message: Message, service: RequestService) -> None:
+    """Show user's requests for month as a single message."""
+    user_id = message.from_user.id if message.from_user else 0
+    tz = ZoneInfo(settings.tz)
+    now = datetime.now(tz)
+
+    if "Прошлый" in message.text:
+        # Previous month
+        if now.month == 1:
+            year, month = now.year - 1, 12
+        else:
+            year, month = now.year, now.month - 1
+    else:
+        year, month = now.year, now.month
+
+    text, keyboard = await month_view(service, user_id, year, month)
+    await message.answer(text, reply_markup=keyboard)
+
+
+@callbacks(CallbackAction.MY_PAGE)
+async def turn_page(
+    callback: CallbackQuery,
+    payload: MonthPageRef,
+    service: RequestService,
+) -> None:
+    """Show another page of the month's active requests under the same summary."""
+    page = await service.get_active_page(
+        callback.from_user.id,
+        created=service.month_range(*payload.year_month),
+        **payload.cursor_args(),
+    )
+
+    await callback.message.edit_reply_markup(
+        reply_markup=UserKeyboards.active_page(page, payload.month) if page.requests else None
+    )
+    await callback.answer()
+
+
+@callbacks(CallbackAction.MY_OPEN)
+async def open_request(
+    callback: CallbackQuery,
+    payload: MonthRequestRef,
+    service: RequestService,
+) -> None:
+    """Show a request from the list with its actions."""
+    request = await service.get_request(payload.request_id)
+
+    if not request or request.user_id != callback.from_user.id:
+        await callback.answer("❌ Запрос не найден", show_alert=True)
+        return
+
+    await callback.message.edit_text(
+        f"📝 Запрос #{request.id}:\n{request.format_full()}",
+        reply_markup=UserKeyboards.request_detail(request, payload.month),
+    )
+    await callback.answer()
+
+
+@callbacks(CallbackAction.MY_LIST)
+async def back_to_list(
+    callback: CallbackQuery,
+    payload: MonthRef,
+    service: RequestService,
+) -> None:
+    """Return from a request to the monthly list."""
+    year, month = payload.year_month
+
+    text, keyboard = await month_view(service, callback.from_user.id, year, month)
+    await callback.message.edit_text(text, reply_markup=keyboard)
+    await callback.answer()
 
 
 # === Request Actions ===
 
 
-@router.callback_query(F.data.startswith("remind:"))
-async def remind_admin(callback: CallbackQuery, bot: Bot) -> None:
+@callbacks(CallbackAction.REMIND)
+async def remind_admin(
+    callback: CallbackQuery,
+    payload: RequestRef,
+    service: RequestService,
+    outbox: OutboxService,
+) -> None:
     """Send reminder to admin."""
-    request_id = int(callback.data.split(":")[1])
-
-    async with get_session() as session:
-        service = RequestService(session)
-        request = await service.get_request(request_id)
-
-        if not request or not request.status_enum.can_remind:
-            await callback.answer("❌ Нельзя отправить напоминание", show_alert=True)
-            return
-
-        # Send reminder to admin
-        await bot.send_message(
-            chat_id=settings.admin_user_id,
-            text=(
-                f"🔔 Напоминание о запросе #{request.id}\n\n"
-                f"{request.format_full()}"
-            ),
-            reply_markup=AdminKeyboards.request_actions(request),
-        )
+    request_id = payload.request_id
+
+    request = await service.get_request(request_id)
+
+    if not request or not request.status.can_remind:
+        await callback.answer("❌ Нельзя отправить напоминание", show_alert=True)
+        return
+
+    # Send reminder to admin
+    outbox.enqueue(
+        chat_id=settings.admin_user_id,
+        text=(f"🔔 Напоминание о запросе #{request.id}\n\n" f"{request.format_full()}"),
+        reply_markup=AdminKeyboards.request_actions(request),
+    )
 
     await callback.answer("✅ Напоминание отправлено!")
 
 
-@router.callback_query(F.data.startswith("cancel:"))
-async def cancel_request(callback: CallbackQuery, bot: Bot) -> None:
+@callbacks(CallbackAction.CANCEL)
+async def cancel_request(
+    callback: CallbackQuery,
+    payload: RequestRef,
+    service: RequestService,
+    outbox: OutboxService,
+) -> None:
     """Cancel a request."""
-    request_id = int(callback.data.split(":")[1])
+    request_id = payload.request_id
 
-    async with get_session() as session:
-        service = RequestService(session)
-        request = await service.cancel_request(request_id)
+    request = await service.cancel_request(request_id)
 
-        if not request:
-            await callback.answer("❌ Нельзя отменить этот запрос", show_alert=True)
-            return
-
-        # Notify admin
-        await bot.send_message(
-            chat_id=settings.admin_user_id,
-            text=f"🚫 Запрос #{request.id} отменён пользователем.\n\n{request.format_full()}",
-        )
+    if not request:
+        await callback.answer("❌ Нельзя отменить этот запрос", show_alert=True)
+        return
 
-    await callback.message.edit_text(
-        f"🚫 Запрос #{request_id} отменён."
+    # Notify admin
+    outbox.enqueue(
+        chat_id=settings.admin_user_id,
+        text=f"🚫 Запрос #{request.id} отменён пользователем.\n\n{request.format_full()}",
     )
+
+    await callback.message.edit_text(f"🚫 Запрос #{request_id} отменён.")
     await callback.answer()
 
 
-@router.callback_query(F.data.startswith("confirm_receipt:"))
-async def confirm_receipt(callback: CallbackQuery, bot: Bot) -> None:
+@callbacks(CallbackAction.CONFIRM_RECEIPT)
+async def confirm_receipt(
+    callback: CallbackQuery,
+    payload: RequestRef,
+    service: RequestService,
+    outbox: OutboxService,
+) -> None:
     """Confirm money receipt."""
-    request_id = int(callback.data.split(":")[1])
+    request_id = payload.request_id
 
-    async with get_session() as session:
-        service = RequestService(session)
-        request = await service.confirm_receipt(request_id)
+    request = await service.confirm_receipt(request_id)
 
-        if not request:
-            await callback.answer("❌ Нельзя подтвердить этот запрос", show_alert=True)
-            return
+    if not request:
+        await callback.answer("❌ Нельзя подтвердить этот запрос", show_alert=True)
+        return
 
-        # Notify admin
-        await bot.send_message(
-            chat_id=settings.admin_user_id,
-            text=f"✅ Получение подтверждено!\n\nЗапрос #{request.id}: {request.format_amount()} ₽",
-        )
+    # Notify admin
+    outbox.enqueue(
+        chat_id=settings.admin_user_id,
+        text=f"✅ Получение подтверждено!\n\nЗапрос #{request.id}: {request.format_amount()} ₽",
+    )
 
     await callback.message.edit_text(
         f"✅ Получение {request.format_amount()} ₽ подтверждено!\n\nСпасибо! 💕"
@@ -323,39 +395,35 @@ async def confirm_receipt(callback: CallbackQuery, bot: Bot) -> None:
     await callback.answer()
 
 
-@router.callback_query(F.data.startswith("dispute:"))
-async def dispute_receipt(callback: CallbackQuery, bot: Bot) -> None:
+@callbacks(CallbackAction.DISPUTE)
+async def dispute_receipt(
+    callback: CallbackQuery,
+    payload: RequestRef,
+    service: RequestService,
+    outbox: OutboxService,
+) -> None:
     """Dispute money receipt (not received)."""
-    request_id = int(callback.data.split(":")[1])
-
-    async with get_session() as session:
-        service = RequestService(session)
-        request = await service.dispute_receipt(request_id)
-
-        if not request:
-            await callback.answer("❌ Ошибка", show_alert=True)
-            return
-
-        # Notify admin urgently
-        await bot.send_message(
-            chat_id=settings.admin_user_id,
-            text=(
-                f"⚠️ ВНИМАНИЕ: Деньги не получены!\n\n"
-                f"Запрос #{request.id}: {request.format_amount()} ₽\n\n"
-                f"Пользователь сообщает, что средства не поступили."
-            ),
-            reply_markup=AdminKeyboards.disputed_request_actions(request.id),
-        )
+    request_id = payload.request_id
+
+    request = await service.dispute_receipt(request_id)
+
+    if not request:
+        await callback.answer("❌ Ошибка", show_alert=True)
+        return
+
+    # Notify admin urgently
+    outbox.enqueue(
+        chat_id=settings.admin_user_id,
+        text=(
+            f"⚠️ ВНИМАНИЕ: Деньги не получены!\n\n"
+            f"Запрос #{request.id}: {request.format_amount()} ₽\n\n"
+            f"Пользователь сообщает, что средства не поступили."
+        ),
+        reply_markup=AdminKeyboards.disputed_request_actions(request.id),
+    )
 
     await callback.message.edit_text(
         f"⚠️ Сообщение о том, что деньги не пришли, отправлено.\n\n"
         f"Запрос #{request_id} отмечен как спорный."
     )
     await callback.answer()
-
-
-@router.callback_query(F.data == "back_to_list")
-async def back_to_list(callback: CallbackQuery) -> None:
-    """Return to requests list."""
-    await callback.message.delete()
-    await callback.answer()
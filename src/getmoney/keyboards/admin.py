@@ -1,19 +1,63 @@
 """Admin keyboards."""
 
+from functools import cache
+
 from aiogram.types import (
-    InlineKeyboardButton,
     InlineKeyboardMarkup,
     ReplyKeyboardMarkup,
     KeyboardButton,
 )
 
-from getmoney.models import Request, RequestStatus
+from getmoney.callbacks import ETA_OPTIONS, CallbackAction, pack
+from getmoney.keyboards.layout import KeyboardTemplate, compile_layouts
+from getmoney.keyboards.pagination import page_keyboard
+from getmoney.models import Request, RequestAction, RequestStatus
+from getmoney.services.request import Page
+
+# Callback data for admin request actions
+_CALLBACKS = {
+    RequestAction.APPROVE: pack(CallbackAction.APPROVE, "{}"),
+    RequestAction.SEND: pack(CallbackAction.SEND, "{}"),
+    RequestAction.REJECT: pack(CallbackAction.REJECT, "{}"),
+}
+
+_ACTIONS = compile_layouts("admin", _CALLBACKS)
+_DETAIL = compile_layouts(
+    "admin", _CALLBACKS, footer=((("⬅️ К списку", pack(CallbackAction.LIST)),),)
+)
+
+_ETA_SELECTION = KeyboardTemplate(
+    (
+        (
+            ("⏱ Через 1 час", pack(CallbackAction.ETA, "{}", ETA_OPTIONS.index("1h"))),
+            ("🌙 Сегодня вечером", pack(CallbackAction.ETA, "{}", ETA_OPTIONS.index("today"))),
+        ),
+        (
+            ("☀️ Завтра", pack(CallbackAction.ETA, "{}", ETA_OPTIONS.index("tomorrow"))),
+            ("✏️ Ввести вручную", pack(CallbackAction.ETA_MANUAL, "{}")),
+        ),
+        (("⬅️ Назад", pack(CallbackAction.BACK, "{}")),),
+    )
+)
+
+_REJECT_CONFIRM = KeyboardTemplate(
+    (
+        (("❌ Отклонить без комментария", pack(CallbackAction.REJECT_CONFIRM, "{}")),),
+        (("💬 Добавить причину", pack(CallbackAction.REJECT_COMMENT, "{}")),),
+        (("⬅️ Назад", pack(CallbackAction.BACK, "{}")),),
+    )
+)
 
 
 class AdminKeyboards:
-    """Keyboards for admin (husband)."""
+    """Keyboards for admin (husband).
+
+    Static keyboards are built once and shared, so callers must not mutate
+    the returned markup.
+    """
 
     @staticmethod
+    @cache
     def main_menu() -> ReplyKeyboardMarkup:
         """Main menu keyboard for admin."""
         return ReplyKeyboardMarkup(
@@ -27,125 +71,46 @@ class AdminKeyboards:
     @staticmethod
     def new_request_actions(request_id: int) -> InlineKeyboardMarkup:
         """Actions for new incoming request."""
-        return InlineKeyboardMarkup(
-            inline_keyboard=[
-                [
-                    InlineKeyboardButton(
-                        text="✅ Одобрить",
-                        callback_data=f"admin:approve:{request_id}",
-                    ),
-                    InlineKeyboardButton(
-                        text="💸 Отправлено",
-                        callback_data=f"admin:sent:{request_id}",
-                    ),
-                ],
-                [
-                    InlineKeyboardButton(
-                        text="❌ Отклонить",
-                        callback_data=f"admin:reject:{request_id}",
-                    ),
-                ],
-            ]
-        )
+        return _ACTIONS[RequestStatus.PENDING].render(request_id)
 
     @staticmethod
     def eta_selection(request_id: int) -> InlineKeyboardMarkup:
         """ETA selection keyboard."""
-        return InlineKeyboardMarkup(
-            inline_keyboard=[
-                [
-                    InlineKeyboardButton(
-                        text="⏱ Через 1 час",
-                        callback_data=f"admin:eta:{request_id}:1h",
-                    ),
-                    InlineKeyboardButton(
-                        text="🌙 Сегодня вечером",
-                        callback_data=f"admin:eta:{request_id}:today",
-                    ),
-                ],
-                [
-                    InlineKeyboardButton(
-                        text="☀️ Завтра",
-                        callback_data=f"admin:eta:{request_id}:tomorrow",
-                    ),
-                    InlineKeyboardButton(
-                        text="✏️ Ввести вручную",
-                        callback_data=f"admin:eta_manual:{request_id}",
-                    ),
-                ],
-                [
-                    InlineKeyboardButton(
-                        text="⬅️ Назад",
-                        callback_data=f"admin:back:{request_id}",
-                    ),
-                ],
-            ]
-        )
+        return _ETA_SELECTION.render(request_id)
 
     @staticmethod
     def approved_request_actions(request_id: int) -> InlineKeyboardMarkup:
         """Actions for approved request (waiting to send)."""
-        return InlineKeyboardMarkup(
-            inline_keyboard=[
-                [
-                    InlineKeyboardButton(
-                        text="💸 Отправлено",
-                        callback_data=f"admin:sent:{request_id}",
-                    ),
-                ],
-            ]
-        )
+        return _ACTIONS[RequestStatus.APPROVED].render(request_id)
 
     @staticmethod
     def disputed_request_actions(request_id: int) -> InlineKeyboardMarkup:
         """Actions for disputed request."""
-        return InlineKeyboardMarkup(
-            inline_keyboard=[
-                [
-                    InlineKeyboardButton(
-                        text="💸 Отправлено повторно",
-                        callback_data=f"admin:sent:{request_id}",
-                    ),
-                ],
-            ]
-        )
+        return _ACTIONS[RequestStatus.DISPUTED].render(request_id)
 
     @staticmethod
     def request_actions(request: Request) -> InlineKeyboardMarkup | None:
         """Get appropriate keyboard for request status."""
-        status = request.status_enum
+        return _ACTIONS[request.status].render(request.id)
 
-        if status == RequestStatus.PENDING:
-            return AdminKeyboards.new_request_actions(request.id)
-        elif status == RequestStatus.APPROVED:
-            return AdminKeyboards.approved_request_actions(request.id)
-        elif status == RequestStatus.DISPUTED:
-            return AdminKeyboards.disputed_request_actions(request.id)
+    @staticmethod
+    def active_page(page: Page) -> InlineKeyboardMarkup:
+        """Page of active requests: one button per request plus navigation."""
+        return page_keyboard(
+            page,
+            label=lambda r: f"#{r.id} · {r.format_amount()} ₽ · {r.status.display_name}",
+            open_data=lambda r: pack(CallbackAction.OPEN, r.id),
+            page_data=lambda newer, cursor: pack(
+                CallbackAction.PAGE, int(newer), cursor.timestamp, cursor.id
+            ),
+        )
 
-        return None
+    @staticmethod
+    def request_detail(request: Request) -> InlineKeyboardMarkup:
+        """Request actions with a button back to the active list."""
+        return _DETAIL[request.status].render(request.id)
 
     @staticmethod
     def reject_confirm(request_id: int) -> InlineKeyboardMarkup:
         """Confirm rejection keyboard."""
-        return InlineKeyboardMarkup(
-            inline_keyboard=[
-                [
-                    InlineKeyboardButton(
-                        text="❌ Отклонить без комментария",
-                        callback_data=f"admin:reject_confirm:{request_id}",
-                    ),
-                ],
-                [
-                    InlineKeyboardButton(
-                        text="💬 Добавить причину",
-                        callback_data=f"admin:reject_comment:{request_id}",
-                    ),
-                ],
-                [
-                    InlineKeyboardButton(
-                        text="⬅️ Назад",
-                        callback_data=f"admin:back:{request_id}",
-                    ),
-                ],
-            ]
-        )
+        return _REJECT_CONFIRM.render(request_id)
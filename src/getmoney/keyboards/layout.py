@@ -0,0 +1,84 @@
+"""Precompiled inline keyboard templates.
+
+Building aiogram markup validates every button through pydantic, which
+dominates the cost of a keyboard. Templates validate their buttons once at
+import time; rendering only copies them with the callback data filled in.
+"""
+
+from collections.abc import Mapping
+
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from getmoney.callbacks import pack_int
+from getmoney.models import RequestAction, RequestStatus
+from getmoney.models.status import STATUS_TABLE, Layout
+
+# Rows of (button text, callback data format)
+ButtonRows = tuple[tuple[tuple[str, str], ...], ...]
+
+
+class KeyboardTemplate:
+    """Inline keyboard with ``str.format`` placeholders in callback data."""
+
+    def __init__(self, rows: ButtonRows) -> None:
+        self.rows = rows
+        self._markup = (
+            InlineKeyboardMarkup(
+                inline_keyboard=[
+                    [
+                        InlineKeyboardButton(text=text, callback_data=callback)
+                        for text, callback in row
+                    ]
+                    for row in rows
+                ]
+            )
+            if rows
+            else None
+        )
+        self._static = all("{" not in callback for row in rows for _, callback in row)
+
+    def render(self, *values: int | str) -> InlineKeyboardMarkup | None:
+        """Render keyboard with ``values`` substituted into callback data.
+
+        Ints are packed the same way as ``callbacks.pack`` does.
+        """
+        if self._markup is None or self._static:
+            return self._markup
+        values = tuple(v if isinstance(v, str) else pack_int(v) for v in values)
+        return self._markup.model_copy(
+            update={
+                "inline_keyboard": [
+                    [
+                        (
+                            button.model_copy(
+                                update={"callback_data": button.callback_data.format(*values)}
+                            )
+                            if "{" in button.callback_data
+                            else button
+                        )
+                        for button in row
+                    ]
+                    for row in self._markup.inline_keyboard
+                ]
+            }
+        )
+
+
+def compile_layouts(
+    side: str,
+    callbacks: Mapping[RequestAction, str],
+    footer: ButtonRows = (),
+) -> dict[RequestStatus, KeyboardTemplate]:
+    """Compile ``admin``/``user`` keyboard layouts of every status to templates.
+
+    ``footer`` rows are appended to every layout, empty ones included, so a
+    detail view can always go back even when no action is left.
+    """
+    compiled = {}
+    for status, info in STATUS_TABLE.items():
+        layout: Layout = getattr(info, f"{side}_keyboard")
+        rows = tuple(
+            tuple((button.text, callbacks[button.action]) for button in row) for row in layout
+        )
+        compiled[status] = KeyboardTemplate(rows + footer)
+    return compiled
@@ -0,0 +1,38 @@
+"""Inline keyboards for paginated request lists."""
+
+from collections.abc import Callable
+
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from getmoney.models import Request
+from getmoney.services.request import Cursor, Page
+
+
+def page_keyboard(
+    page: Page,
+    label: Callable[[Request], str],
+    open_data: Callable[[Request], str],
+    page_data: Callable[[bool, Cursor], str],
+) -> InlineKeyboardMarkup:
+    """One button per request on the page plus a prev/next navigation row.
+
+    ``open_data`` builds callback data opening a request, ``page_data``
+    builds callback data for the newer (``True``) or older page.
+    """
+    rows = [
+        [InlineKeyboardButton(text=label(r), callback_data=open_data(r))] for r in page.requests
+    ]
+
+    navigation = []
+    if page.newer:
+        navigation.append(
+            InlineKeyboardButton(text="⬅️ Новее", callback_data=page_data(True, page.newer))
+        )
+    if page.older:
+        navigation.append(
+            InlineKeyboardButton(text="Старее ➡️", callback_data=page_data(False, page.older))
+        )
+    if navigation:
+        rows.append(navigation)
+
+    return InlineKeyboardMarkup(inline_keyboard=rows)
@@ -1,14 +1,60 @@
 """User keyboards."""
 
-from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup, ReplyKeyboardMarkup, KeyboardButton
-
-from getmoney.models import Request, RequestStatus
+from functools import cache
+
+from aiogram.types import InlineKeyboardMarkup, ReplyKeyboardMarkup, KeyboardButton
+
+from getmoney.callbacks import CallbackAction, pack
+from getmoney.keyboards.layout import KeyboardTemplate, compile_layouts
+from getmoney.keyboards.pagination import page_keyboard
+from getmoney.models import Request, RequestAction
+from getmoney.services.request import Page
+
+# Callback data for user request actions
+_CALLBACKS = {
+    RequestAction.REMIND: pack(CallbackAction.REMIND, "{}"),
+    RequestAction.CANCEL: pack(CallbackAction.CANCEL, "{}"),
+    RequestAction.CONFIRM: pack(CallbackAction.CONFIRM_RECEIPT, "{}"),
+    RequestAction.DISPUTE: pack(CallbackAction.DISPUTE, "{}"),
+}
+
+_ACTIONS = compile_layouts("user", _CALLBACKS)
+# Rendered with (request ID, month)
+_DETAIL = compile_layouts(
+    "user",
+    _CALLBACKS,
+    footer=((("⬅️ К списку запросов", pack(CallbackAction.MY_LIST, "{1}")),),),
+)
+
+_AMOUNTS = [5000, 10000, 15000, 20000, 30000, 50000]
+
+_CONFIRM_REQUEST = KeyboardTemplate(
+    (
+        (
+            ("✅ Да, запросить", pack(CallbackAction.CONFIRM_REQUEST, "{}")),
+            ("❌ Отмена", pack(CallbackAction.CANCEL_FLOW)),
+        ),
+    )
+)
+
+_ADD_COMMENT = KeyboardTemplate(
+    (
+        (("💬 Добавить комментарий", pack(CallbackAction.ADD_COMMENT, "{}")),),
+        (("✅ Отправить без комментария", pack(CallbackAction.CONFIRM_REQUEST, "{}")),),
+        (("❌ Отмена", pack(CallbackAction.CANCEL_FLOW)),),
+    )
+)
 
 
 class UserKeyboards:
-    """Keyboards for regular user (wife)."""
+    """Keyboards for regular user (wife).
+
+    Static keyboards are built once and shared, so callers must not mutate
+    the returned markup.
+    """
 
     @staticmethod
+    @cache
     def main_menu() -> ReplyKeyboardMarkup:
         """Main menu keyboard."""
         return ReplyKeyboardMarkup(
@@ -24,125 +70,60 @@ class UserKeyboards:
         )
 
     @staticmethod
+    @cache
     def amount_selection() -> InlineKeyboardMarkup:
         """Amount selection keyboard."""
-        amounts = [5000, 10000, 15000, 20000, 30000, 50000]
-        buttons = []
+        rows = []
 
         # Two buttons per row
-        for i in range(0, len(amounts), 2):
-            row = []
-            for amount in amounts[i : i + 2]:
-                row.append(
-                    InlineKeyboardButton(
-                        text=f"{amount:,}₽".replace(",", " "),
-                        callback_data=f"amount:{amount}",
-                    )
+        for i in range(0, len(_AMOUNTS), 2):
+            rows.append(
+                tuple(
+                    (f"{amount:,}₽".replace(",", " "), pack(CallbackAction.AMOUNT, amount))
+                    for amount in _AMOUNTS[i : i + 2]
                 )
-            buttons.append(row)
+            )
 
         # Cancel button
-        buttons.append([
-            InlineKeyboardButton(text="❌ Отмена", callback_data="cancel_request_flow")
-        ])
+        rows.append((("❌ Отмена", pack(CallbackAction.CANCEL_FLOW)),))
 
-        return InlineKeyboardMarkup(inline_keyboard=buttons)
+        return KeyboardTemplate(tuple(rows)).render()
 
     @staticmethod
     def confirm_request(amount: int) -> InlineKeyboardMarkup:
         """Confirm request keyboard."""
-        return InlineKeyboardMarkup(
-            inline_keyboard=[
-                [
-                    InlineKeyboardButton(
-                        text="✅ Да, запросить",
-                        callback_data=f"confirm_request:{amount}",
-                    ),
-                    InlineKeyboardButton(
-                        text="❌ Отмена",
-                        callback_data="cancel_request_flow",
-                    ),
-                ],
-            ]
-        )
+        return _CONFIRM_REQUEST.render(amount)
 
     @staticmethod
     def add_comment(amount: int) -> InlineKeyboardMarkup:
         """Ask if user wants to add comment."""
-        return InlineKeyboardMarkup(
-            inline_keyboard=[
-                [
-                    InlineKeyboardButton(
-                        text="💬 Добавить комментарий",
-                        callback_data=f"add_comment:{amount}",
-                    ),
-                ],
-                [
-                    InlineKeyboardButton(
-                        text="✅ Отправить без комментария",
-                        callback_data=f"confirm_request:{amount}",
-                    ),
-                ],
-                [
-                    InlineKeyboardButton(
-                        text="❌ Отмена",
-                        callback_data="cancel_request_flow",
-                    ),
-                ],
-            ]
-        )
+        return _ADD_COMMENT.render(amount)
 
     @staticmethod
     def request_actions(request: Request) -> InlineKeyboardMarkup | None:
         """Actions keyboard for a request based on its status."""
-        status = request.status_enum
-        buttons = []
-
-        if status.can_remind:
-            buttons.append([
-                InlineKeyboardButton(
-                    text="🔔 Напомнить",
-                    callback_data=f"remind:{request.id}",
-                )
-            ])
-
-        if status.can_cancel:
-            buttons.append([
-                InlineKeyboardButton(
-                    text="🚫 Отменить запрос",
-                    callback_data=f"cancel:{request.id}",
-                )
-            ])
-
-        if status.can_confirm_receipt:
-            buttons.append([
-                InlineKeyboardButton(
-                    text="✅ Подтвердить получение",
-                    callback_data=f"confirm_receipt:{request.id}",
-                ),
-            ])
-            buttons.append([
-                InlineKeyboardButton(
-                    text="❌ Деньги не пришли",
-                    callback_data=f"dispute:{request.id}",
-                ),
-            ])
-
-        if not buttons:
-            return None
-
-        return InlineKeyboardMarkup(inline_keyboard=buttons)
+        return _ACTIONS[request.status].render(request.id)
 
     @staticmethod
-    def back_to_list() -> InlineKeyboardMarkup:
-        """Back to requests list."""
-        return InlineKeyboardMarkup(
-            inline_keyboard=[
-                [
-                    InlineKeyboardButton(
-                        text="⬅️ К списку запросов",
-                        callback_data="back_to_list",
-                    )
-                ]
-            ]
+    def active_page(page: Page, month: int) -> InlineKeyboardMarkup:
+        """Page of active requests under the monthly summary.
+
+        ``month`` (``YYYYMM``) is carried along so the detail view can
+        return to the same month.
+        """
+        return page_keyboard(
+            page,
+            label=lambda r: (
+                f"{r.created_at.strftime('%d.%m')} · {r.format_amount()} ₽ · "
+                f"{r.status.display_name}"
+            ),
+            open_data=lambda r: pack(CallbackAction.MY_OPEN, month, r.id),
+            page_data=lambda newer, cursor: pack(
+                CallbackAction.MY_PAGE, month, int(newer), cursor.timestamp, cursor.id
+            ),
         )
+
+    @staticmethod
+    def request_detail(request: Request, month: int) -> InlineKeyboardMarkup:
+        """Request actions with a button back to the monthly list."""
+        return _DETAIL[request.status].render(request.id, month)
@@ -2,16 +2,33 @@
 
 import asyncio
 import logging
+import signal
 import sys
+from typing import TYPE_CHECKING
 
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
 from aiogram.enums import ParseMode
-from aiogram.fsm.storage.memory import MemoryStorage
 
 from getmoney.config import settings
 from getmoney.db import init_db
+from getmoney.db.fsm import PostgresStorage
+from getmoney.db.session import async_session_factory, engine, warm_up
 from getmoney.handlers import setup_routers
+from getmoney.middlewares import (
+    AccessMiddleware,
+    CommitBeforeRequestMiddleware,
+    DbSessionMiddleware,
+    FsmFlushMiddleware,
+)
+from getmoney.services import EventWriter, OutboxDispatcher, RequestService
+from getmoney.services.reminders import EtaScheduler
+
+# aiohttp's server is only needed in webhook mode, so it is imported on use
+if TYPE_CHECKING:
+    from aiohttp import web
 
 # Configure logging
 logging.basicConfig(
@@ -22,12 +39,29 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-async def on_startup(bot: Bot) -> None:
+async def on_startup(
+    bot: Bot,
+    outbox_dispatcher: OutboxDispatcher,
+    event_writer: EventWriter,
+    eta_scheduler: EtaScheduler,
+) -> None:
     """Actions to perform on bot startup."""
     logger.info("Initializing database...")
     await init_db()
     logger.info("Database initialized.")
 
+    if settings.db_pool_warmup:
+        # The first updates should not pay for connecting and preparing
+        if await warm_up(
+            lambda session: RequestService(session).prepare_statements(),
+            settings.db_pool_size,
+        ):
+            logger.info(f"Warmed up {settings.db_pool_size} database connections.")
+
+    await outbox_dispatcher.start()
+    await event_writer.start()
+    await eta_scheduler.start()
+
     # Notify admin that bot is online
     try:
         await bot.send_message(
@@ -40,10 +74,19 @@ async def on_startup(bot: Bot) -> None:
     logger.info("Bot started successfully!")
 
 
-async def on_shutdown(bot: Bot) -> None:
+async def on_shutdown(
+    bot: Bot,
+    outbox_dispatcher: OutboxDispatcher,
+    event_writer: EventWriter,
+    eta_scheduler: EtaScheduler,
+) -> None:
     """Actions to perform on bot shutdown."""
     logger.info("Shutting down bot...")
 
+    await eta_scheduler.stop()
+    await outbox_dispatcher.stop()
+    await event_writer.stop()
+
     try:
         await bot.send_message(
             chat_id=settings.admin_user_id,
@@ -55,31 +98,208 @@ async def on_shutdown(bot: Bot) -> None:
     logger.info("Bot stopped.")
 
 
-async def main() -> None:
-    """Main function to run the bot."""
-    logger.info("Starting GetMoney Bot...")
+async def on_webhook_startup(bot: Bot, dispatcher: Dispatcher) -> None:
+    """Register webhook with Telegram (webhook mode only)."""
+    await bot.set_webhook(
+        url=settings.webhook_url.rstrip("/") + settings.webhook_path,
+        secret_token=settings.webhook_secret,
+        allowed_updates=dispatcher.resolve_used_update_types(),
+    )
+    logger.info("Webhook set.")
+
+
+def create_bot() -> Bot:
+    """Create bot, optionally talking to a custom Bot API server."""
+    session = None
+    if settings.telegram_api_url:
+        session = AiohttpSession(api=TelegramAPIServer.from_base(settings.telegram_api_url))
 
-    # Initialize bot
     bot = Bot(
         token=settings.bot_token,
+        session=session,
         default=DefaultBotProperties(parse_mode=ParseMode.HTML),
     )
 
-    # Initialize dispatcher with memory storage for FSM
-    dp = Dispatcher(storage=MemoryStorage())
+    # Release DB connections before any outgoing Bot API call
+    bot.session.middleware(CommitBeforeRequestMiddleware())
+
+    # Registered last so it times only the request itself
+    if settings.metrics_port:
+        from getmoney.monitoring import BotApiTimingMiddleware
+
+        bot.session.middleware(BotApiTimingMiddleware())
+
+    return bot
+
+
+def create_dispatcher(bot: Bot) -> Dispatcher:
+    """Create dispatcher with middlewares, routers and lifecycle hooks."""
+    # FSM state survives restarts; reads are cached and writes coalesced per update
+    storage = PostgresStorage(async_session_factory)
+    dp = Dispatcher(storage=storage)
+
+    # Unknown senders are dropped right after the sender is resolved, before
+    # the FSM middleware loads their state and before any router filter
+    dp.update.outer_middleware.unregister(dp.fsm)
+    dp.update.outer_middleware(AccessMiddleware(settings.roles))
+    dp.update.outer_middleware(dp.fsm)
+
+    if settings.sql_diagnostics:
+        setup_query_diagnostics(dp)
+
+    dp.update.middleware(FsmFlushMiddleware(storage))
+
+    # One lazily-connected session per update
+    dp.update.middleware(DbSessionMiddleware(async_session_factory))
 
     # Setup routers
     dp.include_router(setup_routers())
 
+    if settings.metrics_port:
+        setup_metrics(dp)
+
+    # Notifications queued by handlers are delivered in the background
+    dp["outbox_dispatcher"] = OutboxDispatcher(bot, async_session_factory)
+
+    # Request status changes are logged in batches after commit
+    dp["event_writer"] = EventWriter(async_session_factory)
+
+    # Admin is reminded when an approved request's ETA passes
+    dp["eta_scheduler"] = EtaScheduler(async_session_factory)
+
     # Register startup/shutdown handlers
     dp.startup.register(on_startup)
     dp.shutdown.register(on_shutdown)
 
-    # Start polling
+    # Registered after on_startup, so readiness waits for it to finish
+    if settings.health_port:
+        setup_health(dp)
+
+    return dp
+
+
+def setup_metrics(dp: Dispatcher) -> None:
+    """Time handlers and SQL statements and serve them on the metrics port."""
+    from getmoney.monitoring import (
+        HandlerTimingMiddleware,
+        MetricsServer,
+        instrument_engine,
+        registry,
+    )
+
+    # Inner middlewares run after filters, so the matched handler is known
+    for observer in (dp.message, dp.callback_query):
+        observer.middleware(HandlerTimingMiddleware())
+    instrument_engine(engine)
+
+    metrics = MetricsServer(registry, settings.metrics_host, settings.metrics_port)
+    dp.startup.register(metrics.start)
+    dp.shutdown.register(metrics.stop)
+
+
+def setup_health(dp: Dispatcher) -> None:
+    """Serve liveness and readiness from samples taken in the background."""
+    from getmoney.monitoring import HealthMonitor, HealthServer
+
+    monitor = HealthMonitor(
+        async_session_factory,
+        engine.sync_engine.pool,
+        capacity=settings.db_pool_size + settings.db_max_overflow,
+    )
+    # Innermost outer middleware: only updates from allowed users count
+    dp.update.outer_middleware(monitor.track_update)
+
+    server = HealthServer(monitor, settings.health_host, settings.health_port)
+    dp.startup.register(monitor.start)
+    dp.startup.register(server.start)
+    dp.startup.register(monitor.mark_started)
+    dp.shutdown.register(server.stop)
+    dp.shutdown.register(monitor.stop)
+
+
+def setup_query_diagnostics(dp: Dispatcher) -> None:
+    """Log slow and repeated SQL statements of each update with its handler."""
+    from getmoney.monitoring import QueryDiagnosticsMiddleware, instrument_engine
+
+    diagnostics = QueryDiagnosticsMiddleware(slow_threshold=settings.slow_query_ms / 1000)
+    # Outer, ahead of the FSM middleware, so loading FSM state is included along
+    # with the FSM flush and the session's commit
+    dp.update.outer_middleware.unregister(dp.fsm)
+    dp.update.outer_middleware(diagnostics)
+    dp.update.outer_middleware(dp.fsm)
+    for observer in (dp.message, dp.callback_query):
+        observer.middleware(diagnostics.handler_middleware)
+    instrument_engine(engine)
+
+
+def create_webhook_app(
+    bot: Bot,
+    dp: Dispatcher,
+    secret_token: str | None = None,
+) -> "web.Application":
+    """Create aiohttp application serving Telegram updates.
+
+    Dispatcher startup/shutdown hooks run with the application's own.
+    """
+    from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+    from aiohttp import web
+
+    app = web.Application()
+    SimpleRequestHandler(
+        dispatcher=dp,
+        bot=bot,
+        secret_token=secret_token,
+    ).register(app, path=settings.webhook_path)
+    setup_application(app, dp, bot=bot)
+    return app
+
+
+async def run_polling(bot: Bot, dp: Dispatcher) -> None:
+    """Receive updates with long polling."""
     logger.info("Starting long polling...")
     await dp.start_polling(bot, allowed_updates=dp.resolve_used_update_types())
 
 
+async def run_webhook(bot: Bot, dp: Dispatcher) -> None:
+    """Receive updates on an embedded aiohttp server until SIGINT/SIGTERM."""
+    from aiohttp import web
+
+    dp.startup.register(on_webhook_startup)
+    app = create_webhook_app(bot, dp, secret_token=settings.webhook_secret)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    try:
+        site = web.TCPSite(runner, settings.webhook_host, settings.webhook_port)
+        await site.start()
+        logger.info(
+            f"Serving webhook on {settings.webhook_host}:{settings.webhook_port}"
+            f"{settings.webhook_path}"
+        )
+        await stop.wait()
+    finally:
+        # Runs dispatcher shutdown hooks and closes the bot session
+        await runner.cleanup()
+
+
+async def main() -> None:
+    """Main function to run the bot."""
+    logger.info("Starting GetMoney Bot...")
+
+    bot = create_bot()
+    dp = create_dispatcher(bot)
+
+    if settings.webhook_url:
+        await run_webhook(bot, dp)
+    else:
+        await run_polling(bot, dp)
+
+
 if __name__ == "__main__":
     try:
         asyncio.run(main())
@@ -0,0 +1,12 @@
+"""Aiogram middlewares."""
+
+from getmoney.middlewares.access import AccessMiddleware
+from getmoney.middlewares.db import CommitBeforeRequestMiddleware, DbSessionMiddleware
+from getmoney.middlewares.fsm import FsmFlushMiddleware
+
+__all__ = [
+    "AccessMiddleware",
+    "CommitBeforeRequestMiddleware",
+    "DbSessionMiddleware",
+    "FsmFlushMiddleware",
+]
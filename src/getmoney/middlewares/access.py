@@ -0,0 +1,57 @@
+"""Access control middleware."""
+
+import logging
+from collections.abc import Awaitable, Callable, Mapping
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, Update, User
+
+from getmoney.config import Role
+
+logger = logging.getLogger(__name__)
+
+# Commands unknown users still get an answer to (with their ID, for setup)
+_DENIAL_COMMANDS = ("/start", "/id")
+
+
+class AccessMiddleware(BaseMiddleware):
+    """Drop updates from unknown senders before any router sees them.
+
+    Registered as an outer ``update`` middleware, so rejected updates skip
+    the FSM storage, the database session and all router filters. Allowed
+    updates get ``data["role"]`` for ``RoleFilter``.
+    """
+
+    def __init__(self, roles: Mapping[int, Role]) -> None:
+        self.roles = roles
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        user: User | None = data.get("event_from_user")
+        role = self.roles.get(user.id) if user else None
+        if role is None:
+            await self._deny(event, user)
+            return None
+
+        data["role"] = role
+        return await handler(event, data)
+
+    @staticmethod
+    async def _deny(event: TelegramObject, user: User | None) -> None:
+        """Tell an unknown user their ID if they ask for it; ignore the rest."""
+        if user is None:
+            return
+        logger.info(f"Dropped update from unknown user {user.id}")
+
+        message = event.message if isinstance(event, Update) else None
+        if message and message.text and message.text.startswith(_DENIAL_COMMANDS):
+            await message.answer(
+                "⛔ Доступ запрещён.\n"
+                "Этот бот работает только для авторизованных пользователей.\n\n"
+                f"🆔 Твой Telegram ID: {user.id}"
+            )
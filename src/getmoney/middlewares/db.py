@@ -0,0 +1,71 @@
+"""Request-scoped database session middleware."""
+
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from typing import Any
+
+from aiogram import BaseMiddleware, Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.methods import TelegramMethod
+from aiogram.methods.base import TelegramType
+from aiogram.types import TelegramObject
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from getmoney.services import OutboxService, RequestService
+
+# Session of the update being handled in the current task
+_current_session: ContextVar[AsyncSession | None] = ContextVar("db_session", default=None)
+
+
+class DbSessionMiddleware(BaseMiddleware):
+    """Inject a session, RequestService and OutboxService into handler data.
+
+    The session only checks out a connection on its first query. It is
+    committed when the handler returns (or earlier, before any Bot API call,
+    see ``CommitBeforeRequestMiddleware``) and rolled back on error.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        self.session_factory = session_factory
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        async with self.session_factory() as session:
+            data["session"] = session
+            data["service"] = RequestService(session)
+            data["outbox"] = OutboxService(session)
+
+            token = _current_session.set(session)
+            try:
+                result = await handler(event, data)
+                await session.commit()
+                return result
+            finally:
+                _current_session.reset(token)
+
+
+class CommitBeforeRequestMiddleware(BaseRequestMiddleware):
+    """Commit the current update's session before any outgoing Bot API call.
+
+    This returns the connection to the pool instead of holding it (and an
+    open transaction) across a network round trip. Later queries in the same
+    handler transparently start a new transaction.
+    """
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Any:
+        session = _current_session.get()
+        if session is not None and session.in_transaction():
+            await session.commit()
+        return await make_request(bot, method)
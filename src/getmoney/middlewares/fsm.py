@@ -0,0 +1,36 @@
+"""FSM storage flush middleware."""
+
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.fsm.context import FSMContext
+from aiogram.types import TelegramObject
+
+from getmoney.db.fsm import PostgresStorage
+
+
+class FsmFlushMiddleware(BaseMiddleware):
+    """Write FSM changes made while handling an update in one UPSERT.
+
+    The update's key is evicted afterwards, so the cache never outlives it.
+    """
+
+    def __init__(self, storage: PostgresStorage) -> None:
+        self.storage = storage
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        state: FSMContext | None = data.get("state")
+        try:
+            return await handler(event, data)
+        finally:
+            try:
+                await self.storage.flush()
+            finally:
+                if state is not None:
+                    self.storage.evict(state.key)
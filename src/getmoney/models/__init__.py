@@ -1,6 +1,20 @@
 """Database models."""
 
 from getmoney.models.base import Base
-from getmoney.models.request import Request, RequestStatus
+from getmoney.models.event import RequestEvent
+from getmoney.models.fsm import FsmState
+from getmoney.models.outbox import OutboxMessage
+from getmoney.models.request import Request
+from getmoney.models.rollup import MonthlyRollup
+from getmoney.models.status import RequestAction, RequestStatus
 
-__all__ = ["Base", "Request", "RequestStatus"]
+__all__ = [
+    "Base",
+    "FsmState",
+    "MonthlyRollup",
+    "OutboxMessage",
+    "Request",
+    "RequestAction",
+    "RequestEvent",
+    "RequestStatus",
+]
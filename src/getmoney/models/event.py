@@ -0,0 +1,37 @@
+"""Request event log model."""
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from getmoney.models.base import Base
+from getmoney.models.status import RequestStatus
+from getmoney.models.types import StatusType
+
+
+class RequestEvent(Base):
+    """Append-only record of a request status change.
+
+    ``old_status`` is empty for the creation event. The time a request spent
+    in a status is the gap to its next event, so rows are indexed by request
+    and time.
+    """
+
+    __tablename__ = "request_events"
+    __table_args__ = (Index("ix_request_events_request_id_created_at", "request_id", "created_at"),)
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    request_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("requests.id", ondelete="CASCADE"), nullable=False
+    )
+    actor: Mapped[str] = mapped_column(String(10), nullable=False)  # Role value
+    old_status: Mapped[RequestStatus | None] = mapped_column(StatusType, nullable=True)
+    new_status: Mapped[RequestStatus] = mapped_column(StatusType, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self) -> str:
+        return (
+            f"<RequestEvent(request_id={self.request_id}, "
+            f"{self.old_status} -> {self.new_status})>"
+        )
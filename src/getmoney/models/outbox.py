@@ -0,0 +1,54 @@
+"""Outgoing Telegram message outbox model."""
+
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import BigInteger, DateTime, Index, Integer, Text, func
+from sqlalchemy import text as sql_text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from getmoney.models.base import Base
+
+
+class OutboxMessage(Base):
+    """Telegram message queued in the same transaction as a state change.
+
+    Rows are deleted once delivered; ``failed_at`` is set when delivery is
+    given up on.
+    """
+
+    __tablename__ = "outbox"
+    __table_args__ = (
+        # Only undelivered rows are ever scanned by the dispatcher
+        Index(
+            "ix_outbox_pending",
+            "next_attempt_at",
+            postgresql_where=sql_text("failed_at IS NULL"),
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    chat_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    text: Mapped[str] = mapped_column(Text, nullable=False)
+    reply_markup: Mapped[dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
+
+    # Request whose stored message ID should be set to the delivered message
+    request_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    failed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<OutboxMessage(id={self.id}, chat_id={self.chat_id}, attempts={self.attempts})>"
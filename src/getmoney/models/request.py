@@ -1,88 +1,38 @@
 """Money request model."""
 
 from datetime import datetime
-from enum import Enum
 
-from sqlalchemy import BigInteger, DateTime, Integer, String, Text
+from sqlalchemy import BigInteger, DateTime, Index, Integer, Text, literal
+from sqlalchemy import text as sql_text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from getmoney.models.base import Base, TimestampMixin
-
-
-class RequestStatus(str, Enum):
-    """Request status enumeration."""
-
-    PENDING = "pending"  # Waiting for admin action
-    APPROVED = "approved"  # Approved with ETA
-    SENT = "sent"  # Money sent, waiting for confirmation
-    CONFIRMED = "confirmed"  # User confirmed receipt (final)
-    REJECTED = "rejected"  # Admin rejected (final)
-    CANCELLED = "cancelled"  # User cancelled (final)
-    DISPUTED = "disputed"  # User says money not received
-
-    @property
-    def is_final(self) -> bool:
-        """Check if status is final (no more actions possible)."""
-        return self in (
-            RequestStatus.CONFIRMED,
-            RequestStatus.REJECTED,
-            RequestStatus.CANCELLED,
-        )
-
-    @property
-    def is_active(self) -> bool:
-        """Check if request is active (requires attention)."""
-        return not self.is_final
-
-    @property
-    def display_name(self) -> str:
-        """Human-readable status name in Russian."""
-        names = {
-            RequestStatus.PENDING: "⏳ Ожидает",
-            RequestStatus.APPROVED: "✅ Одобрено",
-            RequestStatus.SENT: "💸 Отправлено",
-            RequestStatus.CONFIRMED: "✔️ Получено",
-            RequestStatus.REJECTED: "❌ Отклонено",
-            RequestStatus.CANCELLED: "🚫 Отменено",
-            RequestStatus.DISPUTED: "⚠️ Спорный",
-        }
-        return names.get(self, self.value)
-
-    @property
-    def can_cancel(self) -> bool:
-        """Check if user can cancel this request."""
-        return self in (RequestStatus.PENDING, RequestStatus.APPROVED)
-
-    @property
-    def can_remind(self) -> bool:
-        """Check if user can send reminder for this request."""
-        return self in (
-            RequestStatus.PENDING,
-            RequestStatus.APPROVED,
-            RequestStatus.DISPUTED,
-        )
-
-    @property
-    def can_confirm_receipt(self) -> bool:
-        """Check if user can confirm receipt."""
-        return self == RequestStatus.SENT
-
-    @property
-    def can_dispute(self) -> bool:
-        """Check if user can dispute (say money not received)."""
-        return self == RequestStatus.SENT
+from getmoney.models.status import ACTIVE_STATUSES, STATUS_CODES, RequestStatus
+from getmoney.models.types import StatusType
 
 
 class Request(Base, TimestampMixin):
     """Money request model."""
 
     __tablename__ = "requests"
+    __table_args__ = (
+        # Covers per-user lookups and month range scans
+        Index("ix_requests_user_id_created_at", "user_id", "created_at"),
+        # ETAs not reminded about yet, loaded by the reminder scheduler on startup
+        Index(
+            "ix_requests_eta_approved",
+            "eta",
+            postgresql_where=sql_text(
+                f"status = {STATUS_CODES[RequestStatus.APPROVED]} AND reminded_at IS NULL"
+            ),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    user_id: Mapped[int] = mapped_column(BigInteger, nullable=False, index=True)
+    user_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
     amount: Mapped[int] = mapped_column(Integer, nullable=False)
     status: Mapped[RequestStatus] = mapped_column(
-        String(20),
+        StatusType,
         default=RequestStatus.PENDING,
         nullable=False,
         index=True,
@@ -90,6 +40,8 @@ class Request(Base, TimestampMixin):
     user_comment: Mapped[str | None] = mapped_column(Text, nullable=True)
     admin_comment: Mapped[str | None] = mapped_column(Text, nullable=True)
     eta: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Set when the ETA reminder is queued, so it is sent once across restarts
+    reminded_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     # Message IDs for updating inline keyboards
     user_message_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
@@ -98,29 +50,22 @@ class Request(Base, TimestampMixin):
     def __repr__(self) -> str:
         return f"<Request(id={self.id}, amount={self.amount}, status={self.status.value})>"
 
-    @property
-    def status_enum(self) -> RequestStatus:
-        """Get status as enum (handles string from DB)."""
-        if isinstance(self.status, RequestStatus):
-            return self.status
-        return RequestStatus(self.status)
-
     def format_amount(self) -> str:
         """Format amount with thousands separator."""
         return f"{self.amount:,}".replace(",", " ")
 
     def format_short(self) -> str:
         """Short format for lists."""
-        return f"{self.format_amount()} ₽ — {self.status_enum.display_name}"
+        return f"{self.format_amount()} ₽ — {self.status.display_name}"
 
     def format_full(self, include_eta: bool = True) -> str:
         """Full format with all details."""
         lines = [
             f"💰 Сумма: {self.format_amount()} ₽",
-            f"📊 Статус: {self.status_enum.display_name}",
+            f"📊 Статус: {self.status.display_name}",
         ]
 
-        if include_eta and self.eta and self.status_enum == RequestStatus.APPROVED:
+        if include_eta and self.eta and self.status == RequestStatus.APPROVED:
             lines.append(f"⏰ ETA: {self.eta.strftime('%d.%m.%Y %H:%M')}")
 
         if self.user_comment:
@@ -132,3 +77,19 @@ class Request(Base, TimestampMixin):
         lines.append(f"📅 Создан: {self.created_at.strftime('%d.%m.%Y %H:%M')}")
 
         return "\n".join(lines)
+
+
+# Active statuses are inlined as constants rather than bind parameters, so
+# the planner can prove the partial index predicate below even for generic
+# plans of prepared statements
+IS_ACTIVE = Request.status.in_(
+    [literal(status, StatusType(), literal_execute=True) for status in ACTIVE_STATUSES]
+)
+
+# Active requests are a small, hot fraction of the table; newest first
+Index(
+    "ix_requests_active_created_at",
+    Request.created_at.desc(),
+    Request.id.desc(),
+    postgresql_where=IS_ACTIVE,
+)
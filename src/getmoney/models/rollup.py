@@ -0,0 +1,35 @@
+"""Monthly request totals model."""
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, SmallInteger, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from getmoney.models.base import Base
+
+
+class MonthlyRollup(Base):
+    """Per-user monthly sums, kept up to date by ``RequestService``.
+
+    Months are calendar months in the configured timezone, the same bounds
+    ``RequestService.month_range`` uses.
+    """
+
+    __tablename__ = "monthly_rollups"
+
+    user_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    year: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    month: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    requested: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    approved: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    confirmed: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    rejected: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<MonthlyRollup(user_id={self.user_id}, {self.year}-{self.month:02d})>"
@@ -0,0 +1,211 @@
+"""Request status state machine.
+
+All rules about what can happen to a request in a given status live in
+``STATUS_TABLE``. It is built once at import time; everything else
+(service transitions, keyboards, handlers) reads from it.
+"""
+
+from enum import Enum
+from typing import NamedTuple
+
+
+class RequestStatus(str, Enum):
+    """Request status enumeration."""
+
+    PENDING = "pending"  # Waiting for admin action
+    APPROVED = "approved"  # Approved with ETA
+    SENT = "sent"  # Money sent, waiting for confirmation
+    CONFIRMED = "confirmed"  # User confirmed receipt (final)
+    REJECTED = "rejected"  # Admin rejected (final)
+    CANCELLED = "cancelled"  # User cancelled (final)
+    DISPUTED = "disputed"  # User says money not received
+
+    @property
+    def info(self) -> "StatusInfo":
+        """Get state machine entry for this status."""
+        return STATUS_TABLE[self]
+
+    def allows(self, action: "RequestAction") -> bool:
+        """Check if action is allowed in this status."""
+        return action in STATUS_TABLE[self].actions
+
+    @property
+    def is_final(self) -> bool:
+        """Check if status is final (no more actions possible)."""
+        return STATUS_TABLE[self].is_final
+
+    @property
+    def is_active(self) -> bool:
+        """Check if request is active (requires attention)."""
+        return not STATUS_TABLE[self].is_final
+
+    @property
+    def display_name(self) -> str:
+        """Human-readable status name in Russian."""
+        return STATUS_TABLE[self].label
+
+    @property
+    def can_approve(self) -> bool:
+        """Check if admin can approve this request."""
+        return self.allows(RequestAction.APPROVE)
+
+    @property
+    def can_reject(self) -> bool:
+        """Check if admin can reject this request."""
+        return self.allows(RequestAction.REJECT)
+
+    @property
+    def can_mark_sent(self) -> bool:
+        """Check if admin can mark money as sent (or resent)."""
+        return self.allows(RequestAction.SEND)
+
+    @property
+    def can_cancel(self) -> bool:
+        """Check if user can cancel this request."""
+        return self.allows(RequestAction.CANCEL)
+
+    @property
+    def can_remind(self) -> bool:
+        """Check if user can send reminder for this request."""
+        return self.allows(RequestAction.REMIND)
+
+    @property
+    def can_confirm_receipt(self) -> bool:
+        """Check if user can confirm receipt."""
+        return self.allows(RequestAction.CONFIRM)
+
+    @property
+    def can_dispute(self) -> bool:
+        """Check if user can dispute (say money not received)."""
+        return self.allows(RequestAction.DISPUTE)
+
+
+class RequestAction(str, Enum):
+    """Action that can be performed on a request."""
+
+    APPROVE = "approve"  # Admin approves with ETA
+    REJECT = "reject"  # Admin rejects
+    SEND = "send"  # Admin marks money as sent
+    CONFIRM = "confirm"  # User confirms receipt
+    DISPUTE = "dispute"  # User says money not received
+    CANCEL = "cancel"  # User cancels
+    REMIND = "remind"  # User reminds admin (no status change)
+
+
+class Button(NamedTuple):
+    """Inline button shown for an action."""
+
+    action: RequestAction
+    text: str
+
+
+# Keyboard layout: rows of buttons
+Layout = tuple[tuple[Button, ...], ...]
+
+
+class StatusInfo(NamedTuple):
+    """State machine entry for a single status."""
+
+    label: str
+    is_final: bool
+    actions: frozenset[RequestAction]
+    admin_keyboard: Layout
+    user_keyboard: Layout
+
+
+_APPROVE_BUTTON = Button(RequestAction.APPROVE, "✅ Одобрить")
+_SEND_BUTTON = Button(RequestAction.SEND, "💸 Отправлено")
+_RESEND_BUTTON = Button(RequestAction.SEND, "💸 Отправлено повторно")
+_REJECT_BUTTON = Button(RequestAction.REJECT, "❌ Отклонить")
+_REMIND_BUTTON = Button(RequestAction.REMIND, "🔔 Напомнить")
+_CANCEL_BUTTON = Button(RequestAction.CANCEL, "🚫 Отменить запрос")
+_CONFIRM_BUTTON = Button(RequestAction.CONFIRM, "✅ Подтвердить получение")
+_DISPUTE_BUTTON = Button(RequestAction.DISPUTE, "❌ Деньги не пришли")
+
+
+def _status(
+    label: str,
+    actions: tuple[RequestAction, ...] = (),
+    admin_keyboard: Layout = (),
+    user_keyboard: Layout = (),
+) -> StatusInfo:
+    """Build a status entry; statuses without actions are final."""
+    return StatusInfo(
+        label=label,
+        is_final=not actions,
+        actions=frozenset(actions),
+        admin_keyboard=admin_keyboard,
+        user_keyboard=user_keyboard,
+    )
+
+
+STATUS_TABLE: dict[RequestStatus, StatusInfo] = {
+    RequestStatus.PENDING: _status(
+        "⏳ Ожидает",
+        (
+            RequestAction.APPROVE,
+            RequestAction.REJECT,
+            RequestAction.SEND,
+            RequestAction.CANCEL,
+            RequestAction.REMIND,
+        ),
+        admin_keyboard=((_APPROVE_BUTTON, _SEND_BUTTON), (_REJECT_BUTTON,)),
+        user_keyboard=((_REMIND_BUTTON,), (_CANCEL_BUTTON,)),
+    ),
+    RequestStatus.APPROVED: _status(
+        "✅ Одобрено",
+        (
+            RequestAction.REJECT,
+            RequestAction.SEND,
+            RequestAction.CANCEL,
+            RequestAction.REMIND,
+        ),
+        admin_keyboard=((_SEND_BUTTON,),),
+        user_keyboard=((_REMIND_BUTTON,), (_CANCEL_BUTTON,)),
+    ),
+    RequestStatus.SENT: _status(
+        "💸 Отправлено",
+        (RequestAction.CONFIRM, RequestAction.DISPUTE),
+        user_keyboard=((_CONFIRM_BUTTON,), (_DISPUTE_BUTTON,)),
+    ),
+    RequestStatus.CONFIRMED: _status("✔️ Получено"),
+    RequestStatus.REJECTED: _status("❌ Отклонено"),
+    RequestStatus.CANCELLED: _status("🚫 Отменено"),
+    RequestStatus.DISPUTED: _status(
+        "⚠️ Спорный",
+        (RequestAction.SEND, RequestAction.REMIND),
+        admin_keyboard=((_RESEND_BUTTON,),),
+        user_keyboard=((_REMIND_BUTTON,),),
+    ),
+}
+
+# Status each state-changing action moves a request to
+ACTION_TARGETS: dict[RequestAction, RequestStatus] = {
+    RequestAction.APPROVE: RequestStatus.APPROVED,
+    RequestAction.REJECT: RequestStatus.REJECTED,
+    RequestAction.SEND: RequestStatus.SENT,
+    RequestAction.CONFIRM: RequestStatus.CONFIRMED,
+    RequestAction.DISPUTE: RequestStatus.DISPUTED,
+    RequestAction.CANCEL: RequestStatus.CANCELLED,
+}
+
+# Statuses each action is allowed from
+ACTION_SOURCES: dict[RequestAction, tuple[RequestStatus, ...]] = {
+    action: tuple(status for status, info in STATUS_TABLE.items() if action in info.actions)
+    for action in RequestAction
+}
+
+ACTIVE_STATUSES = tuple(s for s, info in STATUS_TABLE.items() if not info.is_final)
+FINAL_STATUSES = tuple(s for s, info in STATUS_TABLE.items() if info.is_final)
+
+# Stored in the database as smallint: never renumber, only append
+STATUS_CODES: dict[RequestStatus, int] = {
+    RequestStatus.PENDING: 0,
+    RequestStatus.APPROVED: 1,
+    RequestStatus.SENT: 2,
+    RequestStatus.CONFIRMED: 3,
+    RequestStatus.REJECTED: 4,
+    RequestStatus.CANCELLED: 5,
+    RequestStatus.DISPUTED: 6,
+}
+STATUS_BY_CODE: dict[int, RequestStatus] = {code: s for s, code in STATUS_CODES.items()}
@@ -0,0 +1,32 @@
+"""Custom column types."""
+
+from typing import Any
+
+from sqlalchemy import Dialect, SmallInteger
+from sqlalchemy.types import TypeDecorator
+
+from getmoney.models.status import STATUS_BY_CODE, STATUS_CODES, RequestStatus
+
+
+class StatusType(TypeDecorator[RequestStatus]):
+    """``RequestStatus`` stored as a smallint code (see ``STATUS_CODES``)."""
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect: Dialect) -> int | None:
+        if value is None:
+            return None
+        return STATUS_CODES[RequestStatus(value)]
+
+    def process_literal_param(self, value: Any, dialect: Dialect) -> str:
+        return str(STATUS_CODES[RequestStatus(value)])
+
+    def process_result_value(self, value: int | None, dialect: Dialect) -> RequestStatus | None:
+        if value is None:
+            return None
+        return STATUS_BY_CODE[value]
+
+    @property
+    def python_type(self) -> type[RequestStatus]:
+        return RequestStatus
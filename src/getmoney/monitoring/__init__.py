@@ -0,0 +1,55 @@
+"""Latency metrics, SQL diagnostics and health checks.
+
+Names are imported from submodules on first access, so ``db.session`` can
+use the pool class without pulling in aiohttp's server for the endpoint.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from getmoney.monitoring.bot import BotApiTimingMiddleware, HandlerTimingMiddleware
+    from getmoney.monitoring.db import TimedQueuePool, instrument_engine
+    from getmoney.monitoring.health import HealthMonitor, HealthServer
+    from getmoney.monitoring.metrics import Gauge, Histogram, Registry, registry
+    from getmoney.monitoring.queries import QueryDiagnosticsMiddleware
+    from getmoney.monitoring.server import MetricsServer
+
+_SUBMODULES = {
+    "BotApiTimingMiddleware": "bot",
+    "HandlerTimingMiddleware": "bot",
+    "TimedQueuePool": "db",
+    "instrument_engine": "db",
+    "HealthMonitor": "health",
+    "HealthServer": "health",
+    "Gauge": "metrics",
+    "Histogram": "metrics",
+    "Registry": "metrics",
+    "registry": "metrics",
+    "QueryDiagnosticsMiddleware": "queries",
+    "MetricsServer": "server",
+}
+
+__all__ = [
+    "BotApiTimingMiddleware",
+    "Gauge",
+    "HandlerTimingMiddleware",
+    "HealthMonitor",
+    "HealthServer",
+    "Histogram",
+    "MetricsServer",
+    "QueryDiagnosticsMiddleware",
+    "Registry",
+    "TimedQueuePool",
+    "instrument_engine",
+    "registry",
+]
+
+
+def __getattr__(name: str) -> Any:
+    submodule = _SUBMODULES.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f"{__name__}.{submodule}"), name)
+    globals()[name] = value
+    return value
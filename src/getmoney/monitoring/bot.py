@@ -0,0 +1,61 @@
+"""Handler and Bot API call timing."""
+
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from aiogram import BaseMiddleware, Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.dispatcher.event.handler import CallableObject
+from aiogram.methods import TelegramMethod
+from aiogram.methods.base import TelegramType
+from aiogram.types import TelegramObject
+
+from getmoney.monitoring.metrics import bot_api_seconds, handler_seconds
+
+
+def handler_name(data: dict[str, Any]) -> str:
+    """Name of the function that will handle the event, e.g. ``admin.cmd_export``."""
+    # CallbackHandlers routes through one catch-all handler; use the real one
+    handler: CallableObject | None = data.get("callback_handler") or data.get("handler")
+    if handler is None:
+        return "unknown"
+    callback = handler.callback
+    module = getattr(callback, "__module__", None) or ""
+    name = getattr(callback, "__qualname__", None) or type(callback).__name__
+    return f"{module.rsplit('.', 1)[-1]}.{name}" if module else name
+
+
+class HandlerTimingMiddleware(BaseMiddleware):
+    """Inner middleware recording each handler's run time by handler name."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        start = time.perf_counter()
+        try:
+            return await handler(event, data)
+        finally:
+            handler_seconds.observe(time.perf_counter() - start, handler_name(data))
+
+
+class BotApiTimingMiddleware(BaseRequestMiddleware):
+    """Bot session middleware recording each API call's duration by method."""
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Any:
+        start = time.perf_counter()
+        try:
+            return await make_request(bot, method)
+        finally:
+            bot_api_seconds.observe(time.perf_counter() - start, method.__api_method__)
@@ -0,0 +1,84 @@
+"""SQLAlchemy statement and connection pool timing."""
+
+import time
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+from getmoney.monitoring.metrics import (
+    Gauge,
+    db_pool_checkout_seconds,
+    db_statement_seconds,
+    registry,
+)
+from getmoney.monitoring.queries import record_query
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool recording how long each checkout takes.
+
+    The time includes waiting for a free connection when the pool is
+    exhausted, opening a new one and the pre-ping.
+    """
+
+    def connect(self) -> PoolProxiedConnection:
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            db_pool_checkout_seconds.observe(time.perf_counter() - start)
+
+
+def statement_operation(statement: str) -> str:
+    """First SQL keyword of a statement, e.g. ``SELECT``."""
+    head = statement.lstrip()[:16].split(None, 1)
+    return head[0].upper() if head else ""
+
+
+def _before_execute(conn: Connection, cursor: Any, statement: str, *args: Any) -> None:
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_execute(
+    conn: Connection, cursor: Any, statement: str, parameters: Any, *args: Any
+) -> None:
+    duration = time.perf_counter() - conn.info["query_start"].pop()
+    db_statement_seconds.observe(duration, statement_operation(statement))
+    record_query(statement, parameters, duration)
+
+
+def _handle_error(context: Any) -> None:
+    # after_cursor_execute does not run for failed statements
+    starts = context.connection.info.get("query_start") if context.connection else None
+    if starts:
+        starts.pop()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Time every statement run on ``engine`` and expose its pool state."""
+    sync_engine = engine.sync_engine
+    if event.contains(sync_engine, "before_cursor_execute", _before_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+    pool = sync_engine.pool
+    if not isinstance(pool, AsyncAdaptedQueuePool):
+        return
+    for name, documentation, read in (
+        ("getmoney_db_pool_size", "Configured pool size.", pool.size),
+        ("getmoney_db_pool_checked_out", "Connections currently in use.", pool.checkedout),
+        ("getmoney_db_pool_checked_in", "Idle connections in the pool.", pool.checkedin),
+        # QueuePool counts overflow from -pool_size until the pool is full
+        (
+            "getmoney_db_pool_overflow",
+            "Connections above pool size.",
+            lambda: max(pool.overflow(), 0),
+        ),
+    ):
+        registry.unregister(name)
+        registry.register(Gauge(name, documentation, read))
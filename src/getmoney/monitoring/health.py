@@ -0,0 +1,181 @@
+"""Health and readiness of the running bot, served without any I/O per check."""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Any, NamedTuple
+
+from aiogram.types import TelegramObject
+from aiohttp import web
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from getmoney.models import OutboxMessage
+from getmoney.monitoring.server import LocalServer
+
+logger = logging.getLogger(__name__)
+
+# Loop lag samples kept, so a short stall is still visible to the next check
+LAG_WINDOW = 10
+
+
+class HealthReport(NamedTuple):
+    """Latest samples; served as JSON."""
+
+    healthy: bool
+    ready: bool
+    loop_lag_ms: float  # Worst over the last LAG_WINDOW samples
+    pool_checked_out: int
+    pool_capacity: int
+    last_update_age_s: float | None  # None until the first update
+    outbox_backlog: int | None  # None until the first successful sample
+    outbox_oldest_age_s: float | None
+    database_ok: bool
+
+
+class HealthMonitor:
+    """Background task sampling event-loop lag and the outbox backlog.
+
+    Checks only read the latest samples, so they answer in microseconds and
+    keep working when the pool is exhausted. The process is healthy while
+    the loop keeps up; it is ready once startup finished, the last database
+    sample succeeded and the pool has a free connection.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        pool: QueuePool,
+        capacity: int,
+        interval: float = 1.0,
+        backlog_interval: float = 15.0,
+        max_loop_lag: float = 1.0,
+    ) -> None:
+        self.session_factory = session_factory
+        self.pool = pool
+        self.capacity = capacity  # pool_size + max_overflow
+        self.interval = interval
+        self.backlog_interval = backlog_interval
+        self.max_loop_lag = max_loop_lag
+        self.started = False
+        self.lag_samples: deque[float] = deque(maxlen=LAG_WINDOW)
+        self.last_update_at: float | None = None
+        self.outbox_backlog: int | None = None
+        self.outbox_oldest_age: float | None = None
+        self.database_ok = False
+        self._task: asyncio.Task[None] | None = None
+        self._stopping = asyncio.Event()
+
+    async def start(self) -> None:
+        """Start sampling."""
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run(), name="health-monitor")
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        self.started = False
+        self._stopping.set()
+        if self._task:
+            await self._task
+            self._task = None
+
+    async def mark_started(self) -> None:
+        """Startup hook run last: the bot is about to receive updates."""
+        self.started = True
+
+    async def track_update(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        """Outer update middleware recording when the last update was handled."""
+        try:
+            return await handler(event, data)
+        finally:
+            self.last_update_at = time.monotonic()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_sample = loop.time()
+        while not self._stopping.is_set():
+            if loop.time() >= next_sample:
+                await self.sample_outbox()
+                next_sample = loop.time() + self.backlog_interval
+
+            # The loop is late waking us up by as long as it was busy
+            start = loop.time()
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.interval)
+                return
+            except TimeoutError:
+                self.lag_samples.append(max(loop.time() - start - self.interval, 0.0))
+
+    async def sample_outbox(self) -> None:
+        """Count undelivered outbox messages; also proves the database answers."""
+        try:
+            async with self.session_factory() as session:
+                result = await session.execute(
+                    select(
+                        func.count(),
+                        func.extract("epoch", func.now() - func.min(OutboxMessage.created_at)),
+                    ).where(OutboxMessage.failed_at.is_(None))
+                )
+                count, oldest_age = result.one()
+        except Exception as e:
+            logger.warning(f"Health check query failed: {e}")
+            self.database_ok = False
+            return
+        self.outbox_backlog = count
+        self.outbox_oldest_age = float(oldest_age) if oldest_age is not None else None
+        self.database_ok = True
+
+    def report(self) -> HealthReport:
+        """Current state from the latest samples."""
+        running = self._task is not None and not self._task.done()
+        loop_lag = max(self.lag_samples, default=0.0)
+        healthy = running and loop_lag < self.max_loop_lag
+        checked_out = self.pool.checkedout()
+        last_update = self.last_update_at
+        return HealthReport(
+            healthy=healthy,
+            ready=healthy and self.started and self.database_ok and checked_out < self.capacity,
+            loop_lag_ms=round(loop_lag * 1000, 3),
+            pool_checked_out=checked_out,
+            pool_capacity=self.capacity,
+            last_update_age_s=(
+                round(time.monotonic() - last_update, 3) if last_update is not None else None
+            ),
+            outbox_backlog=self.outbox_backlog,
+            outbox_oldest_age_s=self.outbox_oldest_age,
+            database_ok=self.database_ok,
+        )
+
+
+class HealthServer(LocalServer):
+    """Server exposing ``GET /health`` (liveness) and ``GET /ready`` (readiness).
+
+    Both return the full report as JSON, with status 503 when failing.
+    """
+
+    def __init__(self, monitor: HealthMonitor, host: str, port: int) -> None:
+        super().__init__(host, port)
+        self.monitor = monitor
+
+    def create_app(self) -> web.Application:
+        """Application with the health routes."""
+        app = web.Application()
+        app.router.add_get("/health", self._health)
+        app.router.add_get("/ready", self._ready)
+        return app
+
+    async def _health(self, request: web.Request) -> web.Response:
+        report = self.monitor.report()
+        return web.json_response(report._asdict(), status=200 if report.healthy else 503)
+
+    async def _ready(self, request: web.Request) -> web.Response:
+        report = self.monitor.report()
+        return web.json_response(report._asdict(), status=200 if report.ready else 503)
@@ -0,0 +1,149 @@
+"""Minimal in-process metrics rendered in the Prometheus text format."""
+
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+from typing import TypeVar
+
+# Upper bounds in seconds, Prometheus client defaults
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Finer bounds for single SQL statements and pool checkouts
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs: list[tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+class _Series:
+    """Bucket counts (not cumulative, last one is +Inf) and sum of one label set."""
+
+    __slots__ = ("counts", "sum")
+
+    def __init__(self, size: int) -> None:
+        self.counts = [0] * size
+        self.sum = 0.0
+
+
+class Histogram:
+    """Histogram of durations in seconds, optionally split by labels."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._series: dict[tuple[str, ...], _Series] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Record one observation for the given label values."""
+        series = self._series.get(labels)
+        if series is None:
+            if len(labels) != len(self.labelnames):
+                raise ValueError(f"{self.name} takes labels {self.labelnames}, got {labels}")
+            series = self._series[labels] = _Series(len(self.buckets) + 1)
+        # le is inclusive: a value equal to a bound falls into that bucket
+        series.counts[bisect_left(self.buckets, value)] += 1
+        series.sum += value
+
+    def count(self, *labels: str) -> int:
+        """Number of observations for the given label values."""
+        series = self._series.get(labels)
+        return sum(series.counts) if series else 0
+
+    def collect(self) -> Iterator[str]:
+        """Sample lines of the exposition format."""
+        bounds = [*(_number(bound) for bound in self.buckets), "+Inf"]
+        for labels, series in sorted(self._series.items()):
+            pairs = list(zip(self.labelnames, labels))
+            total = 0
+            for bound, count in zip(bounds, series.counts):
+                total += count
+                yield f"{self.name}_bucket{_labels([*pairs, ('le', bound)])} {total}"
+            yield f"{self.name}_sum{_labels(pairs)} {_number(series.sum)}"
+            yield f"{self.name}_count{_labels(pairs)} {total}"
+
+
+class Gauge:
+    """Value read from a callback at scrape time."""
+
+    def __init__(self, name: str, documentation: str, read: Callable[[], float]) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.read = read
+
+    def collect(self) -> Iterator[str]:
+        """Sample lines of the exposition format."""
+        yield f"{self.name} {_number(self.read())}"
+
+
+M = TypeVar("M", Histogram, Gauge)
+
+
+class Registry:
+    """Named set of metrics rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Histogram | Gauge] = {}
+
+    def register(self, metric: M) -> M:
+        """Add ``metric``; names must be unique."""
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def unregister(self, name: str) -> None:
+        """Remove a metric if present."""
+        self._metrics.pop(name, None)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics.values():
+            kind = "histogram" if isinstance(metric, Histogram) else "gauge"
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {kind}")
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+handler_seconds = registry.register(
+    Histogram("getmoney_handler_seconds", "Time spent in aiogram handlers.", ("handler",))
+)
+db_statement_seconds = registry.register(
+    Histogram(
+        "getmoney_db_statement_seconds",
+        "SQL statement execution time.",
+        ("operation",),
+        DB_BUCKETS,
+    )
+)
+db_pool_checkout_seconds = registry.register(
+    Histogram(
+        "getmoney_db_pool_checkout_seconds",
+        "Time to check a connection out of the pool, including waiting for one.",
+        buckets=DB_BUCKETS,
+    )
+)
+bot_api_seconds = registry.register(
+    Histogram("getmoney_bot_api_seconds", "Telegram Bot API call duration.", ("method",))
+)
@@ -0,0 +1,119 @@
+"""Per-update SQL diagnostics: slow statements and repeated round trips."""
+
+import logging
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from typing import Any, NamedTuple
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from getmoney.monitoring.bot import handler_name
+
+logger = logging.getLogger(__name__)
+
+# Longest statement text written to the log
+MAX_LOGGED_LENGTH = 500
+
+
+class QueryRecord(NamedTuple):
+    """Statement executed while handling an update."""
+
+    statement: str
+    parameters: str  # repr(), so records can be compared and counted
+    duration: float  # Seconds
+
+
+class UpdateQueries:
+    """Statements of the update being handled in the current task."""
+
+    def __init__(self) -> None:
+        self.handler = "unhandled"  # Set once a handler has matched
+        self.records: list[QueryRecord] = []
+
+
+_current_queries: ContextVar[UpdateQueries | None] = ContextVar("update_queries", default=None)
+
+
+def record_query(statement: str, parameters: Any, duration: float) -> None:
+    """Add a statement to the current update's log, if diagnostics are on."""
+    queries = _current_queries.get()
+    if queries is not None:
+        queries.records.append(QueryRecord(statement, repr(parameters), duration))
+
+
+def _shorten(statement: str) -> str:
+    text = " ".join(statement.split())
+    return text if len(text) <= MAX_LOGGED_LENGTH else text[:MAX_LOGGED_LENGTH] + "…"
+
+
+class QueryDiagnosticsMiddleware(BaseMiddleware):
+    """Update middleware logging slow and repeated SQL statements.
+
+    Register it as an outer ``dp.update`` middleware ahead of ``dp.fsm`` so
+    FSM state loads, the FSM flush and the final commit are included, and
+    ``handler_middleware`` on each event observer to label the report with
+    the handler name. Statements are captured by the
+    engine hooks from ``instrument_engine``.
+    """
+
+    def __init__(self, slow_threshold: float, repeat_threshold: int = 5) -> None:
+        self.slow_threshold = slow_threshold  # Seconds
+        self.repeat_threshold = repeat_threshold
+        self.handler_middleware = _HandlerNameMiddleware()
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        queries = UpdateQueries()
+        token = _current_queries.set(queries)
+        try:
+            return await handler(event, data)
+        finally:
+            _current_queries.reset(token)
+            self.report(queries)
+
+    def report(self, queries: UpdateQueries) -> None:
+        """Log slow statements, identical repeats and likely N+1 loops."""
+        for record in queries.records:
+            if record.duration >= self.slow_threshold:
+                logger.warning(
+                    f"Slow query in {queries.handler} ({record.duration * 1000:.1f} ms): "
+                    f"{_shorten(record.statement)} {record.parameters}"
+                )
+
+        # Same statement with the same parameters: the result was already known
+        identical = Counter((r.statement, r.parameters) for r in queries.records)
+        for (statement, parameters), count in identical.items():
+            if count > 1:
+                logger.warning(
+                    f"Repeated query in {queries.handler} ({count}x): "
+                    f"{_shorten(statement)} {parameters}"
+                )
+
+        # Same statement with varying parameters: probably a per-row query in a loop
+        texts = Counter(r.statement for r in queries.records)
+        for statement, count in texts.items():
+            if count >= self.repeat_threshold:
+                logger.warning(
+                    f"Possible N+1 in {queries.handler} ({count}x): {_shorten(statement)}"
+                )
+
+
+class _HandlerNameMiddleware(BaseMiddleware):
+    """Inner middleware recording which handler the update was routed to."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        queries = _current_queries.get()
+        if queries is not None:
+            queries.handler = handler_name(data)
+        return await handler(event, data)
@@ -0,0 +1,61 @@
+"""Local HTTP endpoints for metrics and health checks."""
+
+import logging
+from abc import ABC, abstractmethod
+
+from aiohttp import web
+
+from getmoney.monitoring.metrics import Registry
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class LocalServer(ABC):
+    """Small aiohttp server for operational endpoints, run next to the bot."""
+
+    def __init__(self, host: str, port: int) -> None:
+        self.host = host
+        self.port = port
+        self._runner: web.AppRunner | None = None
+
+    @abstractmethod
+    def create_app(self) -> web.Application:
+        """Application with the server's routes."""
+
+    async def start(self) -> None:
+        """Start listening."""
+        if self._runner is not None:
+            return
+        self._runner = web.AppRunner(self.create_app(), access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info(f"{type(self).__name__} listening on {self.host}:{self.port}")
+
+    async def stop(self) -> None:
+        """Stop listening."""
+        if self._runner is None:
+            return
+        await self._runner.cleanup()
+        self._runner = None
+
+
+class MetricsServer(LocalServer):
+    """Server exposing ``GET /metrics``."""
+
+    def __init__(self, registry: Registry, host: str, port: int) -> None:
+        super().__init__(host, port)
+        self.registry = registry
+
+    def create_app(self) -> web.Application:
+        """Application with the metrics route."""
+        app = web.Application()
+        app.router.add_get("/metrics", self._metrics)
+        return app
+
+    async def _metrics(self, request: web.Request) -> web.Response:
+        return web.Response(
+            body=self.registry.render().encode(),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
@@ -1,5 +1,7 @@
 """Business logic services."""
 
+from getmoney.services.events import EventWriter
+from getmoney.services.outbox import OutboxDispatcher, OutboxService
 from getmoney.services.request import RequestService
 
-__all__ = ["RequestService"]
+__all__ = ["EventWriter", "OutboxDispatcher", "OutboxService", "RequestService"]
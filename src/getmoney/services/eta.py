@@ -0,0 +1,83 @@
+"""In-memory queue of upcoming ETAs of approved requests."""
+
+import asyncio
+import heapq
+from datetime import datetime
+from functools import partial
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from getmoney.db import on_commit
+from getmoney.models import Request, RequestStatus
+
+
+class EtaQueue:
+    """Min-heap of (eta, request_id) with lazy removal.
+
+    ``_etas`` holds the current ETA of every scheduled request; heap entries
+    that no longer match it (rescheduled or unscheduled requests) are dropped
+    when they reach the top. ``changed`` is set whenever the earliest
+    deadline may have moved, so a sleeping scheduler can recompute it.
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[datetime, int]] = []
+        self._etas: dict[int, datetime] = {}
+        self.changed = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._etas)
+
+    def schedule(self, request_id: int, eta: datetime) -> None:
+        """Add request or move it to a new ETA."""
+        self._etas[request_id] = eta
+        heapq.heappush(self._heap, (eta, request_id))
+        if len(self._heap) > 2 * len(self._etas) + 16:
+            self._compact()
+        self.changed.set()
+
+    def unschedule(self, request_id: int) -> None:
+        """Remove request (no-op if it is not scheduled)."""
+        if self._etas.pop(request_id, None) is not None:
+            self.changed.set()
+
+    def _compact(self) -> None:
+        """Drop stale heap entries."""
+        self._heap = [(eta, rid) for rid, eta in self._etas.items()]
+        heapq.heapify(self._heap)
+
+    def _drop_stale(self) -> None:
+        while self._heap:
+            eta, request_id = self._heap[0]
+            if self._etas.get(request_id) == eta:
+                return
+            heapq.heappop(self._heap)
+
+    def next_deadline(self) -> datetime | None:
+        """Earliest scheduled ETA."""
+        self._drop_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime) -> list[int]:
+        """Remove and return requests whose ETA is not later than ``now``."""
+        due = []
+        self._drop_stale()
+        while self._heap and self._heap[0][0] <= now:
+            _, request_id = heapq.heappop(self._heap)
+            del self._etas[request_id]
+            due.append(request_id)
+            self._drop_stale()
+        return due
+
+
+# Shared by RequestService (updates) and EtaScheduler (consumer)
+eta_queue = EtaQueue()
+
+
+def track_eta(session: AsyncSession, request: Request, queue: EtaQueue = eta_queue) -> None:
+    """Update ``queue`` for ``request`` once the session's transaction commits."""
+    if request.status == RequestStatus.APPROVED and request.eta is not None:
+        callback = partial(queue.schedule, request.id, request.eta)
+    else:
+        callback = partial(queue.unschedule, request.id)
+    on_commit(session, callback)
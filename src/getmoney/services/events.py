@@ -0,0 +1,174 @@
+"""Request event log - status changes written in background batches."""
+
+import asyncio
+import logging
+from datetime import datetime
+from functools import partial
+from typing import Any, NamedTuple
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from getmoney.config import Role
+from getmoney.db import on_commit
+from getmoney.models import Request, RequestAction, RequestEvent, RequestStatus
+
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT statement (6 parameters each, well below the 32767 limit)
+BATCH_SIZE = 500
+
+# Who performs each state-changing action
+ACTION_ACTORS: dict[RequestAction, Role] = {
+    RequestAction.APPROVE: Role.ADMIN,
+    RequestAction.REJECT: Role.ADMIN,
+    RequestAction.SEND: Role.ADMIN,
+    RequestAction.CONFIRM: Role.USER,
+    RequestAction.DISPUTE: Role.USER,
+    RequestAction.CANCEL: Role.USER,
+}
+
+# Committed events waiting for the writer
+_pending: list[dict[str, Any]] = []
+
+# Set when a full batch is waiting to wake the writer early
+_full = asyncio.Event()
+
+
+def _enqueue(event: dict[str, Any]) -> None:
+    _pending.append(event)
+    if len(_pending) >= BATCH_SIZE:
+        _full.set()
+
+
+class StateTime(NamedTuple):
+    """Time spent in a status, in seconds."""
+
+    count: int
+    median: float
+    p95: float
+
+
+class EventLog:
+    """Record request events in the current database transaction.
+
+    Events are not written by the transaction itself: they are handed to
+    ``EventWriter`` once it commits (and dropped if it rolls back), so a
+    transition costs no extra statement in the handler.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    def record(
+        self,
+        request: Request,
+        actor: Role,
+        old_status: RequestStatus | None,
+        at: datetime,
+    ) -> None:
+        """Queue an event for ``request`` entering its current status."""
+        event = {
+            "request_id": request.id,
+            "actor": actor.value,
+            "old_status": old_status,
+            "new_status": request.status,
+            "created_at": at,
+        }
+        on_commit(self.session, partial(_enqueue, event))
+
+    async def time_in_state(self, since: datetime) -> dict[RequestStatus, StateTime]:
+        """Time requests spent in each status they left since ``since``."""
+        events = (
+            select(
+                RequestEvent.new_status.label("status"),
+                (
+                    func.lead(RequestEvent.created_at).over(
+                        partition_by=RequestEvent.request_id,
+                        order_by=RequestEvent.created_at,
+                    )
+                    - RequestEvent.created_at
+                ).label("duration"),
+            )
+            .where(RequestEvent.created_at >= since)
+            .subquery()
+        )
+
+        seconds = func.extract("epoch", events.c.duration)
+        result = await self.session.execute(
+            select(
+                events.c.status,
+                func.count(),
+                func.percentile_cont(0.5).within_group(seconds),
+                func.percentile_cont(0.95).within_group(seconds),
+            )
+            .where(events.c.duration.is_not(None))
+            .group_by(events.c.status)
+        )
+        return {
+            status: StateTime(count, median, p95) for status, count, median, p95 in result.all()
+        }
+
+
+class EventWriter:
+    """Background task writing committed events with multi-row INSERTs.
+
+    Events are flushed every ``flush_interval`` seconds, or as soon as a full
+    batch is waiting. Events still buffered when the process dies are lost;
+    the log is for latency analysis, not an audit trail.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        flush_interval: float = 5.0,
+    ) -> None:
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self._task: asyncio.Task[None] | None = None
+        self._stopping = False
+
+    async def start(self) -> None:
+        """Start background writing."""
+        self._stopping = False
+        self._task = asyncio.create_task(self._run(), name="event-writer")
+
+    async def stop(self) -> None:
+        """Stop background writing and flush what is left."""
+        self._stopping = True
+        _full.set()
+        if self._task:
+            await self._task
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(_full.wait(), timeout=self.flush_interval)
+            except TimeoutError:
+                pass
+            _full.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Writing request events failed")
+
+    async def flush(self) -> int:
+        """Write all pending events; return number written."""
+        if not _pending:
+            return 0
+
+        events = _pending[:]
+        del _pending[: len(events)]
+        try:
+            async with self.session_factory() as session, session.begin():
+                for start in range(0, len(events), BATCH_SIZE):
+                    await session.execute(
+                        insert(RequestEvent).values(events[start : start + BATCH_SIZE])
+                    )
+        except Exception:
+            # Keep the events (in order) for the next flush
+            _pending[:0] = events
+            raise
+        return len(events)
@@ -0,0 +1,88 @@
+"""Export service - full request history as CSV."""
+
+import csv
+import io
+from collections.abc import AsyncGenerator
+from datetime import datetime
+from typing import IO, Any
+from zoneinfo import ZoneInfo
+
+from aiogram import Bot
+from aiogram.types import InputFile
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from getmoney.config import settings
+from getmoney.models import Request, RequestStatus
+
+# Rows fetched from the server-side cursor at a time
+CHUNK_SIZE = 2000
+
+# Exports up to this size stay in memory, larger ones spill to disk
+SPOOL_MAX_SIZE = 1024 * 1024
+
+# Bot API limit for uploaded documents
+MAX_DOCUMENT_SIZE = 50 * 1024 * 1024
+
+EXPORT_COLUMNS = (
+    Request.id,
+    Request.user_id,
+    Request.amount,
+    Request.status,
+    Request.created_at,
+    Request.updated_at,
+    Request.eta,
+    Request.user_comment,
+    Request.admin_comment,
+)
+
+
+class ExportService:
+    """Write request history without loading it into memory."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+        self.tz = ZoneInfo(settings.tz)
+
+    def _format(self, value: Any) -> Any:
+        if isinstance(value, RequestStatus):
+            return value.value
+        if isinstance(value, datetime):
+            return value.astimezone(self.tz).isoformat(sep=" ", timespec="seconds")
+        return value
+
+    async def write_csv(self, file: IO[bytes], chunk_size: int = CHUNK_SIZE) -> int:
+        """Write all requests to ``file`` as UTF-8 CSV; return number of rows.
+
+        Rows are read from a server-side cursor ``chunk_size`` at a time and
+        encoded chunk by chunk, so memory use does not depend on history size.
+        """
+        # BOM so spreadsheet apps detect UTF-8 in Cyrillic comments
+        text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+        writer = csv.writer(text)
+        writer.writerow(column.key for column in EXPORT_COLUMNS)
+
+        count = 0
+        result = await self.session.stream(
+            select(*EXPORT_COLUMNS).order_by(Request.id).execution_options(yield_per=chunk_size)
+        )
+        async for rows in result.partitions():
+            writer.writerows([self._format(value) for value in row] for row in rows)
+            count += len(rows)
+
+        text.flush()
+        text.detach()
+        return count
+
+
+class SpooledInputFile(InputFile):
+    """Upload an already written file object in chunks, from its start."""
+
+    def __init__(self, file: IO[bytes], filename: str) -> None:
+        super().__init__(filename=filename)
+        self.file = file
+
+    async def read(self, bot: Bot) -> AsyncGenerator[bytes, None]:
+        self.file.seek(0)
+        while chunk := self.file.read(self.chunk_size):
+            yield chunk
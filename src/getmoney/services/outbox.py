@@ -0,0 +1,258 @@
+"""Outbox service - Telegram notifications delivered after commit."""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, NamedTuple
+
+from aiogram import Bot
+from aiogram.exceptions import (
+    TelegramBadRequest,
+    TelegramForbiddenError,
+    TelegramNotFound,
+    TelegramRetryAfter,
+)
+from aiogram.types import InlineKeyboardMarkup
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from getmoney.config import settings
+from getmoney.db import on_commit
+from getmoney.models import OutboxMessage
+from getmoney.services.request import RequestService
+
+logger = logging.getLogger(__name__)
+
+# Errors that will not go away on retry
+PERMANENT_ERRORS = (TelegramBadRequest, TelegramForbiddenError, TelegramNotFound)
+
+MAX_ATTEMPTS = 8
+RETRY_BASE = timedelta(seconds=2)
+RETRY_MAX = timedelta(minutes=10)
+
+# How long a claimed batch is hidden from other dispatchers while sending
+CLAIM_LEASE = timedelta(minutes=2)
+
+# Set when new messages are committed to wake the dispatcher early
+_wakeup = asyncio.Event()
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff delay after ``attempts`` failed deliveries."""
+    return min(RETRY_BASE * 2 ** min(attempts - 1, 16), RETRY_MAX)
+
+
+class OutboxService:
+    """Queue Telegram messages in the current database transaction."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    def enqueue(
+        self,
+        chat_id: int,
+        text: str,
+        reply_markup: InlineKeyboardMarkup | None = None,
+        request_id: int | None = None,
+    ) -> None:
+        """Queue a message; it is only sent if the transaction commits.
+
+        If ``request_id`` is given, the delivered message ID is stored on the
+        request (admin or user message ID depending on ``chat_id``).
+        """
+        self.session.add(
+            OutboxMessage(
+                chat_id=chat_id,
+                text=text,
+                reply_markup=(
+                    reply_markup.model_dump(mode="json", exclude_none=True)
+                    if reply_markup
+                    else None
+                ),
+                request_id=request_id,
+            )
+        )
+        on_commit(self.session, _wakeup.set)
+
+
+class _Delivery(NamedTuple):
+    """Result of one delivery attempt."""
+
+    message: OutboxMessage
+    message_id: int | None = None
+    error: Exception | None = None
+    retry_after: timedelta | None = None
+
+
+class OutboxDispatcher:
+    """Background task draining the outbox in batches with retries.
+
+    A batch is claimed in a short transaction (rows are leased by pushing
+    ``next_attempt_at`` forward), sent without holding a database connection,
+    and the results are written back in a second short transaction.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        session_factory: async_sessionmaker[AsyncSession],
+        batch_size: int = 50,
+        poll_interval: float = 5.0,
+    ) -> None:
+        self.bot = bot
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._task: asyncio.Task[None] | None = None
+        self._stopping = False
+
+    async def start(self) -> None:
+        """Start background delivery."""
+        self._stopping = False
+        self._task = asyncio.create_task(self._run(), name="outbox-dispatcher")
+
+    async def stop(self) -> None:
+        """Stop background delivery after the current batch."""
+        self._stopping = True
+        _wakeup.set()
+        if self._task:
+            await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            _wakeup.clear()
+            try:
+                processed = await self.drain_once()
+            except Exception:
+                logger.exception("Outbox delivery failed")
+                processed = 0
+
+            # A full batch means more rows are likely waiting
+            if processed >= self.batch_size:
+                continue
+
+            try:
+                await asyncio.wait_for(_wakeup.wait(), timeout=self.poll_interval)
+            except TimeoutError:
+                pass
+
+    async def drain_once(self) -> int:
+        """Deliver one batch of due messages; return number processed."""
+        batch = await self._claim()
+        if not batch:
+            return 0
+
+        deliveries = []
+        for message in batch:
+            delivery = await self._send(message)
+            deliveries.append(delivery)
+            if delivery.retry_after is not None:
+                # Flood limit applies to the whole bot; leave the rest for later
+                break
+
+        await self._record(deliveries, unsent=batch[len(deliveries) :])
+        return len(deliveries)
+
+    async def _claim(self) -> list[OutboxMessage]:
+        """Lease a batch of due messages."""
+        async with self.session_factory() as session, session.begin():
+            result = await session.execute(
+                select(OutboxMessage)
+                .where(
+                    OutboxMessage.failed_at.is_(None),
+                    OutboxMessage.next_attempt_at <= func.now(),
+                )
+                .order_by(OutboxMessage.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            batch = list(result.scalars().all())
+            if batch:
+                await session.execute(
+                    update(OutboxMessage)
+                    .where(OutboxMessage.id.in_([m.id for m in batch]))
+                    .values(next_attempt_at=func.now() + CLAIM_LEASE)
+                )
+            return batch
+
+    async def _send(self, message: OutboxMessage) -> _Delivery:
+        """Send a single message."""
+        reply_markup = (
+            InlineKeyboardMarkup.model_validate(message.reply_markup)
+            if message.reply_markup
+            else None
+        )
+        try:
+            sent = await self.bot.send_message(
+                chat_id=message.chat_id,
+                text=message.text,
+                reply_markup=reply_markup,
+            )
+        except TelegramRetryAfter as e:
+            return _Delivery(message, error=e, retry_after=timedelta(seconds=e.retry_after))
+        except Exception as e:
+            return _Delivery(message, error=e)
+        return _Delivery(message, message_id=sent.message_id)
+
+    async def _record(self, deliveries: list[_Delivery], unsent: list[OutboxMessage]) -> None:
+        """Write delivery results back in one transaction."""
+        async with self.session_factory() as session, session.begin():
+            delivered = [d for d in deliveries if d.error is None]
+            if delivered:
+                await session.execute(
+                    delete(OutboxMessage).where(
+                        OutboxMessage.id.in_([d.message.id for d in delivered])
+                    )
+                )
+
+            service = RequestService(session)
+            for d in delivered:
+                if d.message.request_id is None:
+                    continue
+                if d.message.chat_id == settings.admin_user_id:
+                    await service.update_message_ids(
+                        d.message.request_id, admin_message_id=d.message_id
+                    )
+                else:
+                    await service.update_message_ids(
+                        d.message.request_id, user_message_id=d.message_id
+                    )
+
+            now = datetime.now().astimezone()
+            for d in deliveries:
+                if d.error is not None:
+                    await session.execute(
+                        update(OutboxMessage)
+                        .where(OutboxMessage.id == d.message.id)
+                        .values(**self._failure_values(d, now))
+                    )
+
+            if unsent:
+                # Release the lease on messages skipped after a flood limit
+                await session.execute(
+                    update(OutboxMessage)
+                    .where(OutboxMessage.id.in_([m.id for m in unsent]))
+                    .values(next_attempt_at=func.now())
+                )
+
+    @staticmethod
+    def _failure_values(delivery: _Delivery, now: datetime) -> dict[str, Any]:
+        """Column values for a failed delivery."""
+        message, error = delivery.message, delivery.error
+        values: dict[str, Any] = {"last_error": repr(error)[:1000]}
+
+        if delivery.retry_after is not None:
+            # Flood control is not the message's fault
+            values["next_attempt_at"] = now + delivery.retry_after
+            return values
+
+        attempts = message.attempts + 1
+        values["attempts"] = attempts
+        if isinstance(error, PERMANENT_ERRORS) or attempts >= MAX_ATTEMPTS:
+            logger.error(f"Giving up on outbox message {message.id}: {error!r}")
+            values["failed_at"] = now
+        else:
+            logger.warning(f"Outbox message {message.id} failed (attempt {attempts}): {error!r}")
+            values["next_attempt_at"] = now + retry_delay(attempts)
+        return values
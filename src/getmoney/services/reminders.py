@@ -0,0 +1,120 @@
+"""ETA reminders - admin is notified when an approved request's ETA passes."""
+
+import asyncio
+import logging
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from getmoney.config import settings
+from getmoney.keyboards import AdminKeyboards
+from getmoney.models import Request, RequestStatus
+from getmoney.services.eta import EtaQueue, eta_queue
+from getmoney.services.outbox import OutboxService
+
+logger = logging.getLogger(__name__)
+
+# Delay before retrying reminders that could not be queued
+RETRY_DELAY = timedelta(seconds=30)
+
+
+class EtaScheduler:
+    """Background task sleeping until the next ETA.
+
+    ETAs not reminded about yet are loaded once on start (from the partial
+    index on approved requests); after that the queue is kept current by
+    ``RequestService`` transitions, so the table is never polled. ETAs that
+    passed while the bot was down fire right after the start. Reminders are
+    queued in the outbox, which handles delivery and retries, together with
+    setting ``reminded_at``, so each request is reminded about only once.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        queue: EtaQueue = eta_queue,
+    ) -> None:
+        self.session_factory = session_factory
+        self.queue = queue
+        self._task: asyncio.Task[None] | None = None
+        self._stopping = False
+
+    async def start(self) -> None:
+        """Load pending ETAs and start the timer."""
+        await self.load()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run(), name="eta-scheduler")
+
+    async def stop(self) -> None:
+        """Stop the timer."""
+        self._stopping = True
+        self.queue.changed.set()
+        if self._task:
+            await self._task
+            self._task = None
+
+    async def load(self) -> int:
+        """Schedule all approved requests not reminded about yet; return count."""
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(Request.id, Request.eta).where(
+                    Request.status == RequestStatus.APPROVED,
+                    Request.reminded_at.is_(None),
+                    Request.eta.is_not(None),
+                )
+            )
+            rows = result.all()
+
+        for request_id, eta in rows:
+            self.queue.schedule(request_id, eta)
+        logger.info(f"Scheduled {len(rows)} ETA reminders")
+        return len(rows)
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            self.queue.changed.clear()
+            now = datetime.now(UTC)
+            due = self.queue.pop_due(now)
+            if due:
+                try:
+                    await self.remind(due, now)
+                except Exception:
+                    logger.exception("Queueing ETA reminders failed")
+                    for request_id in due:
+                        self.queue.schedule(request_id, now + RETRY_DELAY)
+
+            deadline = self.queue.next_deadline()
+            timeout = (
+                None if deadline is None else max((deadline - datetime.now(UTC)).total_seconds(), 0)
+            )
+            try:
+                await asyncio.wait_for(self.queue.changed.wait(), timeout=timeout)
+            except TimeoutError:
+                pass
+
+    async def remind(self, request_ids: list[int], now: datetime) -> int:
+        """Queue admin reminders for requests still approved, due and not reminded."""
+        async with self.session_factory() as session, session.begin():
+            # Marked in the same transaction, so another replica skips them
+            result = await session.execute(
+                update(Request)
+                .where(
+                    Request.id.in_(request_ids),
+                    Request.status == RequestStatus.APPROVED,
+                    Request.eta <= now,
+                    Request.reminded_at.is_(None),
+                )
+                .values(reminded_at=now)
+                .returning(Request)
+            )
+            requests = list(result.scalars().all())
+
+            outbox = OutboxService(session)
+            for request in requests:
+                outbox.enqueue(
+                    chat_id=settings.admin_user_id,
+                    text=f"⏰ Наступил ETA по запросу #{request.id}\n\n{request.format_full()}",
+                    reply_markup=AdminKeyboards.request_actions(request),
+                )
+        return len(requests)
@@ -1,23 +1,70 @@
 """Request service - business logic for money requests."""
 
-from datetime import datetime, timedelta
-from typing import NamedTuple
+from datetime import UTC, datetime, timedelta
+from typing import Any, NamedTuple, Self
 from zoneinfo import ZoneInfo
 
-from sqlalchemy import and_, extract, func, select
+from sqlalchemy import ColumnElement, Select, and_, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from getmoney.config import settings
-from getmoney.models import Request, RequestStatus
+from getmoney.config import Role, settings
+from getmoney.models import Request, RequestAction, RequestStatus
+from getmoney.models.request import IS_ACTIVE
+from getmoney.models.status import ACTION_SOURCES, ACTION_TARGETS, FINAL_STATUSES
+from getmoney.services.eta import track_eta
+from getmoney.services.events import ACTION_ACTORS, EventLog
+from getmoney.services.rollup import ZERO_STATS, MonthlyStats, RollupService, stats_columns
 
 
-class MonthlyStats(NamedTuple):
-    """Monthly statistics for requests."""
+class MonthlyView(NamedTuple):
+    """Requests for a month together with their statistics."""
 
-    requested: int  # Total requested amount
-    approved: int  # Total approved (including sent, confirmed)
-    confirmed: int  # Total confirmed received
-    rejected: int  # Total rejected
+    requests: list[Request]
+    stats: MonthlyStats
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class Cursor(NamedTuple):
+    """Keyset position of a request in a list ordered by ``(created_at, id)``."""
+
+    created_at: datetime
+    id: int
+
+    @classmethod
+    def of(cls, request: Request) -> Self:
+        """Get cursor pointing at a request."""
+        return cls(request.created_at, request.id)
+
+    @property
+    def timestamp(self) -> int:
+        """Microseconds since the epoch (exact, unlike a float timestamp)."""
+        return (self.created_at - _EPOCH) // _MICROSECOND
+
+    @classmethod
+    def from_timestamp(cls, timestamp: int, request_id: int) -> Self:
+        """Build cursor from ``timestamp`` and request ID."""
+        return cls(_EPOCH + timedelta(microseconds=timestamp), request_id)
+
+
+class Page(NamedTuple):
+    """One page of a request list, newest first."""
+
+    requests: list[Request]
+    newer: Cursor | None  # Cursor for the previous page, if any
+    older: Cursor | None  # Cursor for the next page, if any
+
+
+# Requests per list page (one inline button each)
+PAGE_SIZE = 8
+
+# Monthly list ordering: active first, then by date
+MONTHLY_ORDER = (
+    Request.status.in_(FINAL_STATUSES),
+    Request.created_at.desc(),
+)
 
 
 class RequestService:
@@ -26,6 +73,8 @@ class RequestService:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
         self.tz = ZoneInfo(settings.tz)
+        self.rollups = RollupService(session)
+        self.events = EventLog(session)
 
     async def create_request(
         self,
@@ -43,32 +92,109 @@ class RequestService:
         self.session.add(request)
         await self.session.flush()
         await self.session.refresh(request)
+        await self.rollups.add(user_id, request.created_at, MonthlyStats.of(request.status, amount))
+        self.events.record(request, Role.USER, None, request.created_at)
         return request
 
     async def get_request(self, request_id: int) -> Request | None:
         """Get request by ID."""
-        result = await self.session.execute(
-            select(Request).where(Request.id == request_id)
-        )
+        result = await self.session.execute(select(Request).where(Request.id == request_id))
         return result.scalar_one_or_none()
 
     async def get_active_requests(self, user_id: int | None = None) -> list[Request]:
         """Get all active requests, optionally filtered by user."""
-        query = select(Request).where(
-            Request.status.in_([
-                RequestStatus.PENDING,
-                RequestStatus.APPROVED,
-                RequestStatus.SENT,
-                RequestStatus.DISPUTED,
-            ])
-        )
+        query = select(Request).where(IS_ACTIVE)
         if user_id:
             query = query.where(Request.user_id == user_id)
-        query = query.order_by(Request.created_at.desc())
+        query = query.order_by(Request.created_at.desc(), Request.id.desc())
 
         result = await self.session.execute(query)
         return list(result.scalars().all())
 
+    async def get_active_page(
+        self,
+        user_id: int | None = None,
+        after: Cursor | None = None,
+        before: Cursor | None = None,
+        limit: int = PAGE_SIZE,
+        created: tuple[datetime, datetime] | None = None,
+    ) -> Page:
+        """Get a page of active requests, newest first, using keyset pagination.
+
+        ``after`` continues with requests older than the cursor, ``before``
+        goes back to newer ones. One extra row is fetched to tell whether
+        there is another page in that direction, so no COUNT is needed.
+        ``created`` limits the list to a half-open range, e.g. ``month_range``.
+        """
+        result = await self.session.execute(
+            self.active_page_query(user_id, after, before, created).limit(limit + 1)
+        )
+        requests = list(result.scalars().all())
+        has_more = len(requests) > limit
+        del requests[limit:]
+
+        if not requests and (after is not None or before is not None):
+            # Requests on the far side of the cursor were closed meanwhile
+            return await self.get_active_page(user_id, limit=limit, created=created)
+
+        if before is not None:
+            requests.reverse()
+            has_newer, has_older = has_more, True
+        else:
+            has_newer, has_older = after is not None, has_more
+
+        return Page(
+            requests=requests,
+            newer=Cursor.of(requests[0]) if has_newer else None,
+            older=Cursor.of(requests[-1]) if has_older else None,
+        )
+
+    @staticmethod
+    def active_page_query(
+        user_id: int | None = None,
+        after: Cursor | None = None,
+        before: Cursor | None = None,
+        created: tuple[datetime, datetime] | None = None,
+    ) -> Select[tuple[Request]]:
+        """Build the keyset query behind ``get_active_page``.
+
+        Without ``user_id`` it is a range scan of the partial index on
+        active requests in ``(created_at, id)`` order (backwards for
+        ``before``), stopping after the page.
+        """
+        key = tuple_(Request.created_at, Request.id)
+        query = select(Request).where(IS_ACTIVE)
+        if user_id:
+            query = query.where(Request.user_id == user_id)
+        if created is not None:
+            start, end = created
+            query = query.where(Request.created_at >= start, Request.created_at < end)
+
+        if before is not None:
+            return query.where(key > tuple_(*before)).order_by(Request.created_at, Request.id)
+
+        if after is not None:
+            query = query.where(key < tuple_(*after))
+        return query.order_by(Request.created_at.desc(), Request.id.desc())
+
+    def month_range(self, year: int, month: int) -> tuple[datetime, datetime]:
+        """Get half-open [start, end) bounds of a month in the configured timezone."""
+        start = datetime(year, month, 1, tzinfo=self.tz)
+        if month == 12:
+            end = datetime(year + 1, 1, 1, tzinfo=self.tz)
+        else:
+            end = datetime(year, month + 1, 1, tzinfo=self.tz)
+        return start, end
+
+    def _monthly_filter(self, user_id: int, year: int, month: int) -> ColumnElement[bool]:
+        """Build WHERE clause for a user's requests in a month."""
+        start, end = self.month_range(year, month)
+        return and_(
+            Request.user_id == user_id,
+            Request.created_at >= start,
+            Request.created_at < end,
+        )
+
     async def get_monthly_requests(
         self,
         user_id: int,
@@ -78,22 +204,8 @@ class RequestService:
         """Get all requests for a specific month."""
         result = await self.session.execute(
             select(Request)
-            .where(
-                and_(
-                    Request.user_id == user_id,
-                    extract("year", Request.created_at) == year,
-                    extract("month", Request.created_at) == month,
-                )
-            )
-            .order_by(
-                # Active first, then by date
-                Request.status.in_([
-                    RequestStatus.CONFIRMED,
-                    RequestStatus.REJECTED,
-                    RequestStatus.CANCELLED,
-                ]),
-                Request.created_at.desc(),
-            )
+            .where(self._monthly_filter(user_id, year, month))
+            .order_by(*MONTHLY_ORDER)
         )
         return list(result.scalars().all())
 
@@ -103,32 +215,70 @@ class RequestService:
         year: int,
         month: int,
     ) -> MonthlyStats:
-        """Calculate monthly statistics."""
-        requests = await self.get_monthly_requests(user_id, year, month)
-
-        requested = sum(r.amount for r in requests)
-        approved = sum(
-            r.amount
-            for r in requests
-            if r.status_enum in (
-                RequestStatus.APPROVED,
-                RequestStatus.SENT,
-                RequestStatus.CONFIRMED,
-            )
+        """Get monthly statistics from the maintained rollup row."""
+        return await self.rollups.get(user_id, year, month)
+
+    async def get_monthly_view(
+        self,
+        user_id: int,
+        year: int,
+        month: int,
+    ) -> MonthlyView:
+        """Get requests for a month together with statistics in one query."""
+        result = await self.session.execute(
+            select(Request, *stats_columns(window=True))
+            .where(self._monthly_filter(user_id, year, month))
+            .order_by(*MONTHLY_ORDER)
         )
-        confirmed = sum(
-            r.amount for r in requests if r.status_enum == RequestStatus.CONFIRMED
+        rows = result.all()
+        if not rows:
+            return MonthlyView(requests=[], stats=ZERO_STATS)
+
+        stats = MonthlyStats(*(int(value) for value in rows[0][1:]))
+        return MonthlyView(requests=[row[0] for row in rows], stats=stats)
+
+    async def _transition(
+        self,
+        request_id: int,
+        action: RequestAction,
+        **values: Any,
+    ) -> Request | None:
+        """Atomically apply ``action`` if the request's status allows it.
+
+        Runs a single conditional UPDATE ... RETURNING, so the status check and
+        the write cannot be interleaved with a concurrent transition. The row
+        is locked in a CTE to also return the previous status, which is used
+        to update the monthly rollup in the same transaction, to log the
+        event and to keep the ETA reminder queue current.
+        """
+        old = (
+            select(Request.id, Request.status)
+            .where(Request.id == request_id, Request.status.in_(ACTION_SOURCES[action]))
+            .with_for_update()
+            .cte("old")
         )
-        rejected = sum(
-            r.amount for r in requests if r.status_enum == RequestStatus.REJECTED
+        result = await self.session.execute(
+            update(Request)
+            .where(Request.id == old.c.id)
+            .values(status=ACTION_TARGETS[action], **values)
+            .returning(Request, old.c.status)
+            .execution_options(populate_existing=True)
         )
+        row = result.one_or_none()
+        if row is None:
+            return None
 
-        return MonthlyStats(
-            requested=requested,
-            approved=approved,
-            confirmed=confirmed,
-            rejected=rejected,
+        request, old_status = row
+        await self.rollups.add(
+            request.user_id,
+            request.created_at,
+            MonthlyStats.of(request.status, request.amount)
+            - MonthlyStats.of(old_status, request.amount),
         )
+        self.events.record(request, ACTION_ACTORS[action], old_status, request.updated_at)
+        if RequestStatus.APPROVED in (old_status, request.status):
+            track_eta(self.session, request)
+        return request
 
     async def approve_request(
         self,
@@ -137,17 +287,10 @@ class RequestService:
         comment: str | None = None,
     ) -> Request | None:
         """Approve a request with ETA."""
-        request = await self.get_request(request_id)
-        if not request or request.status_enum != RequestStatus.PENDING:
-            return None
-
-        request.status = RequestStatus.APPROVED
-        request.eta = eta
+        values: dict[str, Any] = {"eta": eta}
         if comment:
-            request.admin_comment = comment
-
-        await self.session.flush()
-        return request
+            values["admin_comment"] = comment
+        return await self._transition(request_id, RequestAction.APPROVE, **values)
 
     async def reject_request(
         self,
@@ -155,63 +298,26 @@ class RequestService:
         comment: str | None = None,
     ) -> Request | None:
         """Reject a request."""
-        request = await self.get_request(request_id)
-        if not request or request.status_enum not in (
-            RequestStatus.PENDING,
-            RequestStatus.APPROVED,
-        ):
-            return None
-
-        request.status = RequestStatus.REJECTED
+        values: dict[str, Any] = {}
         if comment:
-            request.admin_comment = comment
-
-        await self.session.flush()
-        return request
+            values["admin_comment"] = comment
+        return await self._transition(request_id, RequestAction.REJECT, **values)
 
     async def mark_sent(self, request_id: int) -> Request | None:
         """Mark request as money sent."""
-        request = await self.get_request(request_id)
-        if not request or request.status_enum not in (
-            RequestStatus.PENDING,
-            RequestStatus.APPROVED,
-            RequestStatus.DISPUTED,
-        ):
-            return None
-
-        request.status = RequestStatus.SENT
-        await self.session.flush()
-        return request
+        return await self._transition(request_id, RequestAction.SEND)
 
     async def confirm_receipt(self, request_id: int) -> Request | None:
         """User confirms money receipt."""
-        request = await self.get_request(request_id)
-        if not request or request.status_enum != RequestStatus.SENT:
-            return None
-
-        request.status = RequestStatus.CONFIRMED
-        await self.session.flush()
-        return request
+        return await self._transition(request_id, RequestAction.CONFIRM)
 
     async def dispute_receipt(self, request_id: int) -> Request | None:
         """User disputes money receipt (says not received)."""
-        request = await self.get_request(request_id)
-        if not request or request.status_enum != RequestStatus.SENT:
-            return None
-
-        request.status = RequestStatus.DISPUTED
-        await self.session.flush()
-        return request
+        return await self._transition(request_id, RequestAction.DISPUTE)
 
     async def cancel_request(self, request_id: int) -> Request | None:
         """User cancels their request."""
-        request = await self.get_request(request_id)
-        if not request or not request.status_enum.can_cancel:
-            return None
-
-        request.status = RequestStatus.CANCELLED
-        await self.session.flush()
-        return request
+        return await self._transition(request_id, RequestAction.CANCEL)
 
     async def update_message_ids(
         self,
@@ -219,17 +325,46 @@ class RequestService:
         user_message_id: int | None = None,
         admin_message_id: int | None = None,
     ) -> None:
-        """Update stored message IDs for a request."""
-        request = await self.get_request(request_id)
-        if not request:
-            return
-
+        """Update stored message IDs for a request in a single UPDATE."""
+        values = {}
         if user_message_id is not None:
-            request.user_message_id = user_message_id
+            values["user_message_id"] = user_message_id
         if admin_message_id is not None:
-            request.admin_message_id = admin_message_id
+            values["admin_message_id"] = admin_message_id
+        if not values:
+            return
 
-        await self.session.flush()
+        # Also refreshes the request if it is already loaded in the session
+        await self.session.execute(update(Request).where(Request.id == request_id).values(**values))
+
+    async def prepare_statements(self) -> None:
+        """Run the handlers' queries once so the connection has them prepared.
+
+        asyncpg prepares each statement on first use per connection (and
+        SQLAlchemy compiles it once per engine). Reads use real arguments;
+        writes target request ID 0, which never exists, so nothing changes.
+        ``create_request`` is left out since its INSERT cannot match no row.
+        """
+        now = datetime.now(self.tz)
+        cursor = Cursor(now, 0)
+        # Admin's list of all active requests, user's list under a month
+        month = self.month_range(now.year, now.month)
+        for user_id, created in ((None, None), (settings.user_user_id, month)):
+            await self.get_active_page(user_id, created=created)
+            await self.get_active_page(user_id, after=cursor, created=created)
+            await self.get_active_page(user_id, before=cursor, created=created)
+        await self.get_monthly_view(settings.user_user_id, now.year, now.month)
+        await self.get_request(0)
+
+        await self.approve_request(0, now)
+        await self.reject_request(0)
+        await self.reject_request(0, comment="-")
+        await self.mark_sent(0)
+        await self.confirm_receipt(0)
+        await self.dispute_receipt(0)
+        await self.cancel_request(0)
+        await self.update_message_ids(0, user_message_id=0)
+        await self.update_message_ids(0, admin_message_id=0)
 
     def calculate_eta(self, option: str) -> datetime:
         """Calculate ETA datetime from option string."""
@@ -243,9 +378,7 @@ class RequestService:
                 return now.replace(hour=21, minute=0, second=0, microsecond=0)
             case "tomorrow":
                 # Tomorrow at 12:00
-                return (now + timedelta(days=1)).replace(
-                    hour=12, minute=0, second=0, microsecond=0
-                )
+                return (now + timedelta(days=1)).replace(hour=12, minute=0, second=0, microsecond=0)
             case _:
                 # Default: +24 hours
                 return now + timedelta(hours=24)
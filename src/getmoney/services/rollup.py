@@ -0,0 +1,134 @@
+"""Monthly rollup service - per-user monthly totals maintained on write."""
+
+from datetime import datetime
+from typing import NamedTuple
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import ColumnElement, SmallInteger, delete, func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from getmoney.config import settings
+from getmoney.models import MonthlyRollup, Request, RequestStatus
+
+
+class MonthlyStats(NamedTuple):
+    """Monthly statistics for requests."""
+
+    requested: int  # Total requested amount
+    approved: int  # Total approved (including sent, confirmed)
+    confirmed: int  # Total confirmed received
+    rejected: int  # Total rejected
+
+    @classmethod
+    def of(cls, status: RequestStatus, amount: int) -> "MonthlyStats":
+        """Contribution of a single request to the totals."""
+        return cls(
+            requested=amount,
+            approved=amount if status in APPROVED_STATUSES else 0,
+            confirmed=amount if status == RequestStatus.CONFIRMED else 0,
+            rejected=amount if status == RequestStatus.REJECTED else 0,
+        )
+
+    def __sub__(self, other: "MonthlyStats") -> "MonthlyStats":
+        return MonthlyStats(*(a - b for a, b in zip(self, other)))
+
+
+ZERO_STATS = MonthlyStats(0, 0, 0, 0)
+
+# Statuses counted as approved in monthly statistics
+APPROVED_STATUSES = (
+    RequestStatus.APPROVED,
+    RequestStatus.SENT,
+    RequestStatus.CONFIRMED,
+)
+
+
+def stats_columns(window: bool = False) -> list[ColumnElement[int]]:
+    """Build SUM(amount) FILTER (...) columns in MonthlyStats order.
+
+    With ``window`` the sums are computed over the whole result set so
+    they can be selected alongside the rows themselves.
+    """
+    sums = [
+        func.sum(Request.amount),
+        func.sum(Request.amount).filter(Request.status.in_(APPROVED_STATUSES)),
+        func.sum(Request.amount).filter(Request.status == RequestStatus.CONFIRMED),
+        func.sum(Request.amount).filter(Request.status == RequestStatus.REJECTED),
+    ]
+    return [
+        func.coalesce(agg.over() if window else agg, 0).label(name)
+        for agg, name in zip(sums, MonthlyStats._fields)
+    ]
+
+
+class RollupService:
+    """Read and update ``monthly_rollups`` in the caller's transaction."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+        self.tz = ZoneInfo(settings.tz)
+
+    async def add(self, user_id: int, created_at: datetime, delta: MonthlyStats) -> None:
+        """Add ``delta`` to the month a request created at ``created_at`` belongs to."""
+        if not any(delta):
+            return
+
+        local = created_at.astimezone(self.tz)
+        stmt = insert(MonthlyRollup).values(
+            user_id=user_id,
+            year=local.year,
+            month=local.month,
+            **delta._asdict(),
+        )
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[MonthlyRollup.user_id, MonthlyRollup.year, MonthlyRollup.month],
+                set_={
+                    **{
+                        name: getattr(MonthlyRollup, name) + getattr(stmt.excluded, name)
+                        for name in MonthlyStats._fields
+                    },
+                    "updated_at": func.now(),
+                },
+            )
+        )
+
+    async def get(self, user_id: int, year: int, month: int) -> MonthlyStats:
+        """Get totals for a month (zeros if the user has no requests in it)."""
+        result = await self.session.execute(
+            select(
+                MonthlyRollup.requested,
+                MonthlyRollup.approved,
+                MonthlyRollup.confirmed,
+                MonthlyRollup.rejected,
+            ).where(
+                MonthlyRollup.user_id == user_id,
+                MonthlyRollup.year == year,
+                MonthlyRollup.month == month,
+            )
+        )
+        row = result.one_or_none()
+        return MonthlyStats(*row) if row else ZERO_STATS
+
+    async def rebuild(self) -> int:
+        """Recompute all rollups from ``requests``; return number of months.
+
+        The table is locked first, so transitions running concurrently wait
+        and then apply their deltas on top of the rebuilt totals.
+        """
+        await self.session.execute(text("LOCK TABLE monthly_rollups IN EXCLUSIVE MODE"))
+        await self.session.execute(delete(MonthlyRollup))
+
+        local = func.timezone(settings.tz, Request.created_at)
+        year = func.extract("year", local).cast(SmallInteger)
+        month = func.extract("month", local).cast(SmallInteger)
+        result = await self.session.execute(
+            insert(MonthlyRollup).from_select(
+                ["user_id", "year", "month", *MonthlyStats._fields],
+                select(Request.user_id, year, month, *stats_columns()).group_by(
+                    Request.user_id, year, month
+                ),
+            )
+        )
+        return result.rowcount
@@ -0,0 +1,38 @@
+"""Shared test fixtures."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from aiogram import Dispatcher
+
+
+@pytest.fixture
+def session() -> MagicMock:
+    """Session mock with awaitable ``execute``/``commit`` and ``async with session.begin()``.
+
+    ``execute`` returns a plain mock result, configured per test.
+    """
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=MagicMock())
+    session.commit = AsyncMock()
+    session.begin.return_value.__aenter__ = AsyncMock()
+    session.begin.return_value.__aexit__ = AsyncMock(return_value=None)
+    return session
+
+
+@pytest.fixture
+def session_factory(session: MagicMock) -> MagicMock:
+    """Session factory mock; ``async with factory()`` yields ``session``."""
+    factory = MagicMock()
+    factory.return_value.__aenter__ = AsyncMock(return_value=session)
+    factory.return_value.__aexit__ = AsyncMock(return_value=None)
+    return factory
+
+
+@pytest.fixture(scope="session")
+def dispatcher() -> Dispatcher:
+    """Application dispatcher; built once, since routers attach to one parent."""
+    from getmoney.main import create_bot, create_dispatcher
+
+    return create_dispatcher(create_bot())
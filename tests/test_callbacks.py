@@ -0,0 +1,127 @@
+"""Tests for callback data codec and dispatcher."""
+
+from datetime import datetime
+
+import pytest
+from aiogram import Bot, Dispatcher, Router
+from aiogram.types import CallbackQuery, Chat, Message, Update, User
+
+from getmoney.callbacks import (
+    CallbackAction,
+    CallbackHandlers,
+    EtaChoice,
+    NoPayload,
+    PAYLOADS,
+    RequestRef,
+    pack,
+    unpack,
+)
+
+
+def make_update(data: str) -> Update:
+    """Build an update with a callback query."""
+    user = User(id=1, is_bot=False, first_name="Test")
+    message = Message(
+        message_id=1,
+        date=datetime.now(),
+        chat=Chat(id=1, type="private"),
+        text="test",
+    )
+    return Update(
+        update_id=1,
+        callback_query=CallbackQuery(
+            id="1", from_user=user, chat_instance="1", message=message, data=data
+        ),
+    )
+
+
+class TestCodec:
+    """Tests for pack/unpack."""
+
+    def test_roundtrip(self) -> None:
+        """Test packed data decodes to the typed payload."""
+        data = pack(CallbackAction.ETA, 123456, 2)
+        assert data == "et:2n9c:2"
+        assert unpack(data) == (CallbackAction.ETA, EtaChoice(123456, 2))
+
+    def test_no_arguments(self) -> None:
+        """Test action without payload fields."""
+        assert pack(CallbackAction.LIST) == "ls"
+        assert unpack("ls") == (CallbackAction.LIST, NoPayload())
+
+    def test_placeholder(self) -> None:
+        """Test string values are kept for templates."""
+        assert pack(CallbackAction.APPROVE, "{}") == "ap:{}"
+
+    def test_wrong_arity(self) -> None:
+        """Test packing with wrong number of values fails."""
+        with pytest.raises(TypeError):
+            pack(CallbackAction.APPROVE, 1, 2)
+
+    @pytest.mark.parametrize(
+        "data", ["", "zz:1", "ap", "ap:1:2", "ap:-1", "ap: 1", "ap:!", "admin:approve:7"]
+    )
+    def test_invalid(self, data: str) -> None:
+        """Test invalid or legacy data is not decoded."""
+        assert unpack(data) is None
+
+    def test_codes_unique(self) -> None:
+        """Test every action has a payload type and a distinct code."""
+        assert set(PAYLOADS) == set(CallbackAction)
+        assert len({action.value for action in CallbackAction}) == len(CallbackAction)
+
+
+class TestCallbackHandlers:
+    """Tests for dict-based callback dispatch."""
+
+    async def test_routes_with_payload_and_data(self) -> None:
+        """Test handler receives decoded payload and middleware data."""
+        router = Router()
+        callbacks = CallbackHandlers(router)
+        seen = {}
+
+        @callbacks(CallbackAction.APPROVE)
+        async def approve(callback: CallbackQuery, payload: RequestRef, service: str) -> None:
+            seen.update(payload=payload, service=service)
+
+        dp = Dispatcher()
+        dp.include_router(router)
+        bot = Bot("1:test")
+
+        await dp.feed_update(bot, make_update("ap:7"), service="svc")
+
+        assert seen == {"payload": RequestRef(7), "service": "svc"}
+
+    async def test_unknown_action_falls_through(self) -> None:
+        """Test unregistered actions are left to other routers."""
+        router = Router()
+        callbacks = CallbackHandlers(router)
+        fallback = Router()
+        seen = []
+
+        @callbacks(CallbackAction.APPROVE)
+        async def approve(callback: CallbackQuery) -> None:
+            seen.append("approve")
+
+        @fallback.callback_query()
+        async def other(callback: CallbackQuery) -> None:
+            seen.append("fallback")
+
+        dp = Dispatcher()
+        dp.include_router(router)
+        dp.include_router(fallback)
+
+        await dp.feed_update(Bot("1:test"), make_update("rj:7"))
+
+        assert seen == ["fallback"]
+
+    def test_duplicate_registration(self) -> None:
+        """Test an action can only have one handler per router."""
+        callbacks = CallbackHandlers(Router())
+
+        @callbacks(CallbackAction.APPROVE)
+        async def first(callback: CallbackQuery) -> None:
+            pass
+
+        with pytest.raises(ValueError):
+            callbacks(CallbackAction.APPROVE)(first)
@@ -0,0 +1,97 @@
+"""Tests for database initialization."""
+
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from getmoney.config import settings
+from getmoney.db import SCHEMA_REVISION, init_db
+from getmoney.db.session import engine, warm_up
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def make_engine() -> tuple[MagicMock, MagicMock]:
+    """Create engine mock whose ``begin()`` yields a connection."""
+    conn = MagicMock()
+    conn.run_sync = AsyncMock()
+    engine = MagicMock()
+    engine.begin.return_value.__aenter__ = AsyncMock(return_value=conn)
+    engine.begin.return_value.__aexit__ = AsyncMock(return_value=None)
+    return engine, conn
+
+
+class TestEngine:
+    """Tests for the engine's pool."""
+
+    @pytest.mark.skipif(settings.metrics_port is not None, reason="metrics enabled")
+    def test_checkouts_untimed_without_metrics(self) -> None:
+        """Test the timing pool is only used when metrics are served."""
+        assert type(engine.sync_engine.pool) is AsyncAdaptedQueuePool
+
+
+class TestInitDb:
+    """Tests for init_db."""
+
+    def test_revision_is_alembic_head(self) -> None:
+        """Test SCHEMA_REVISION is bumped together with migrations."""
+        config = Config()
+        config.set_main_option("script_location", str(ROOT / "alembic"))
+
+        assert ScriptDirectory.from_config(config).get_current_head() == SCHEMA_REVISION
+
+    async def test_skips_create_all_at_head(self) -> None:
+        """Test a migrated schema is not inspected."""
+        engine, conn = make_engine()
+        with (
+            patch("getmoney.db.session.engine", engine),
+            patch(
+                "getmoney.db.session.get_schema_revision",
+                AsyncMock(return_value=SCHEMA_REVISION),
+            ),
+        ):
+            await init_db()
+
+        engine.begin.assert_not_called()
+
+    async def test_creates_tables_without_migrations(self) -> None:
+        """Test tables are created when Alembic never ran."""
+        engine, conn = make_engine()
+        with (
+            patch("getmoney.db.session.engine", engine),
+            patch("getmoney.db.session.get_schema_revision", AsyncMock(return_value=None)),
+        ):
+            await init_db()
+
+        conn.run_sync.assert_awaited_once()
+
+
+class TestWarmUp:
+    """Tests for warm_up."""
+
+    async def test_runs_on_concurrent_sessions(self, session_factory: MagicMock) -> None:
+        """Test every session stays open while the others prepare."""
+        sessions = [MagicMock() for _ in range(3)]
+        session_factory.return_value.__aenter__.side_effect = sessions
+        seen = []
+
+        async def prepare(session: MagicMock) -> None:
+            session_factory.return_value.__aexit__.assert_not_awaited()
+            seen.append(session)
+
+        with patch("getmoney.db.session.async_session_factory", session_factory):
+            assert await warm_up(prepare, 3)
+
+        assert seen == sessions
+        assert session_factory.return_value.__aexit__.await_count == 3
+
+    async def test_failure_is_logged(self, session_factory: MagicMock) -> None:
+        """Test a failed warm-up does not stop startup."""
+        prepare = AsyncMock(side_effect=OSError("connection refused"))
+
+        with patch("getmoney.db.session.async_session_factory", session_factory):
+            assert not await warm_up(prepare, 2)
@@ -0,0 +1,99 @@
+"""Tests for request event log."""
+
+from datetime import UTC, datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from getmoney.config import Role
+from getmoney.models import Request, RequestAction, RequestStatus
+from getmoney.models.status import ACTION_TARGETS
+from getmoney.services import events
+from getmoney.services.events import ACTION_ACTORS, BATCH_SIZE, EventLog, EventWriter
+
+NOW = datetime(2024, 5, 1, 12, 0, tzinfo=UTC)
+
+
+def commit(session: MagicMock) -> None:
+    """Run the session's on-commit callbacks."""
+    for callback in session.sync_session.info.pop("on_commit", ()):
+        callback()
+
+
+@pytest.fixture(autouse=True)
+def clear_pending() -> None:
+    events._pending.clear()
+    events._full.clear()
+
+
+class TestEventLog:
+    """Tests for EventLog."""
+
+    def test_recorded_on_commit(self) -> None:
+        """Test events reach the writer only after commit."""
+        session = MagicMock()
+        session.sync_session.info = {}
+        request = Request(id=3, status=RequestStatus.APPROVED)
+
+        EventLog(session).record(request, Role.ADMIN, RequestStatus.PENDING, NOW)
+        assert events._pending == []
+
+        commit(session)
+        assert events._pending == [
+            {
+                "request_id": 3,
+                "actor": "admin",
+                "old_status": RequestStatus.PENDING,
+                "new_status": RequestStatus.APPROVED,
+                "created_at": NOW,
+            }
+        ]
+
+    def test_every_transition_has_actor(self) -> None:
+        """Test each state-changing action is attributed to a role."""
+        assert set(ACTION_ACTORS) == set(ACTION_TARGETS)
+        assert ACTION_ACTORS[RequestAction.CANCEL] == Role.USER
+
+
+class TestEventWriter:
+    """Tests for EventWriter."""
+
+    async def test_flush_batches(self, session: MagicMock, session_factory: MagicMock) -> None:
+        """Test pending events are written with one INSERT per batch."""
+        writer = EventWriter(session_factory)
+        events._pending.extend({"request_id": i} for i in range(BATCH_SIZE + 1))
+
+        assert await writer.flush() == BATCH_SIZE + 1
+
+        assert session.execute.await_count == 2
+        assert events._pending == []
+
+    async def test_flush_without_events(
+        self, session: MagicMock, session_factory: MagicMock
+    ) -> None:
+        """Test nothing is written when there are no events."""
+        writer = EventWriter(session_factory)
+
+        assert await writer.flush() == 0
+
+        session.execute.assert_not_awaited()
+
+    async def test_failed_flush_keeps_events(
+        self, session: MagicMock, session_factory: MagicMock
+    ) -> None:
+        """Test events are kept in order for the next flush after an error."""
+        writer = EventWriter(session_factory)
+        session.execute.side_effect = RuntimeError("db down")
+        events._pending.extend([{"request_id": 1}, {"request_id": 2}])
+
+        with pytest.raises(RuntimeError):
+            await writer.flush()
+
+        assert events._pending == [{"request_id": 1}, {"request_id": 2}]
+
+    def test_full_batch_wakes_writer(self) -> None:
+        """Test writer is woken early once a batch fills up."""
+        for i in range(BATCH_SIZE):
+            events._enqueue({"request_id": i})
+
+        assert events._full.is_set()
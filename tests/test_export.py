@@ -0,0 +1,72 @@
+"""Tests for CSV export."""
+
+from datetime import UTC, datetime
+from tempfile import SpooledTemporaryFile
+from unittest.mock import AsyncMock, MagicMock
+
+from aiogram import Bot
+
+from getmoney.services.export import ExportService, SpooledInputFile
+
+
+def stream_session(*chunks: list[tuple]) -> MagicMock:
+    """Create session whose ``stream()`` yields the given row chunks."""
+
+    async def partitions():
+        for chunk in chunks:
+            yield chunk
+
+    result = MagicMock()
+    result.partitions = partitions
+    session = MagicMock()
+    session.stream = AsyncMock(return_value=result)
+    return session
+
+
+class TestExportService:
+    """Tests for ExportService."""
+
+    async def test_write_csv(self) -> None:
+        """Test rows from all chunks are written after the header."""
+        created = datetime(2024, 5, 1, 9, 30, tzinfo=UTC)
+        session = stream_session(
+            [(1, 2, 5000, "pending", created, created, None, "на кофе, чай", None)],
+            [(2, 2, 1000, "rejected", created, created, None, None, "нет")],
+        )
+
+        with SpooledTemporaryFile() as file:
+            count = await ExportService(session).write_csv(file)
+            file.seek(0)
+            data = file.read().decode("utf-8-sig")
+
+        assert count == 2
+        lines = data.splitlines()
+        assert lines[0].startswith("id,user_id,amount,status,created_at")
+        assert lines[1] == (
+            "1,2,5000,pending,2024-05-01 12:30:00+03:00,"
+            '2024-05-01 12:30:00+03:00,,"на кофе, чай",'
+        )
+        assert lines[2].endswith(",,нет")
+
+    async def test_file_left_open(self) -> None:
+        """Test the target file can still be read after writing."""
+        with SpooledTemporaryFile() as file:
+            await ExportService(stream_session()).write_csv(file)
+
+            assert not file.closed
+            assert file.tell() > 0
+
+
+class TestSpooledInputFile:
+    """Tests for uploading a spooled file."""
+
+    async def test_reads_from_start(self) -> None:
+        """Test upload rewinds and yields the whole file in chunks."""
+        with SpooledTemporaryFile() as file:
+            file.write(b"x" * 100_000)
+            input_file = SpooledInputFile(file, "requests.csv")
+
+            chunks = [chunk async for chunk in input_file.read(Bot("1:test"))]
+
+        assert b"".join(chunks) == b"x" * 100_000
+        assert len(chunks) > 1
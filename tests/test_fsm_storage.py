@@ -0,0 +1,102 @@
+"""Tests for PostgreSQL FSM storage."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from aiogram.fsm.storage.base import StorageKey
+
+from getmoney.db.fsm import PostgresStorage
+from getmoney.handlers.user import RequestStates
+
+KEY = StorageKey(bot_id=1, chat_id=2, user_id=2)
+
+
+@pytest.fixture
+def storage(session: MagicMock, session_factory: MagicMock) -> PostgresStorage:
+    """Storage over the mocked session factory; every key starts out missing."""
+    session.execute.return_value.one_or_none.return_value = None
+    return PostgresStorage(session_factory)
+
+
+class TestPostgresStorage:
+    """Tests for PostgresStorage."""
+
+    async def test_reads_are_cached(self, storage: PostgresStorage, session: MagicMock) -> None:
+        """Test key is loaded from the database only once."""
+        assert await storage.get_state(KEY) is None
+        assert await storage.get_data(KEY) == {}
+
+        assert session.execute.await_count == 1
+
+    async def test_writes_are_coalesced(self, storage: PostgresStorage, session: MagicMock) -> None:
+        """Test several writes in one update become a single statement."""
+        await storage.set_state(KEY, RequestStates.waiting_for_amount)
+        await storage.update_data(KEY, {"amount": 5000})
+        await storage.update_data(KEY, {"comment": "на продукты"})
+        await storage.set_state(KEY, RequestStates.confirming)
+        loads = session.execute.await_count
+
+        await storage.flush()
+
+        assert session.execute.await_count == loads + 1
+        assert await storage.get_state(KEY) == RequestStates.confirming.state
+        assert await storage.get_data(KEY) == {"amount": 5000, "comment": "на продукты"}
+
+    async def test_flush_without_changes(
+        self, storage: PostgresStorage, session: MagicMock
+    ) -> None:
+        """Test flush is a no-op when nothing changed."""
+        await storage.get_state(KEY)
+        loads = session.execute.await_count
+
+        await storage.flush()
+
+        assert session.execute.await_count == loads
+
+    async def test_failed_flush_is_retried(
+        self, storage: PostgresStorage, session: MagicMock
+    ) -> None:
+        """Test changes stay dirty if the write fails."""
+        await storage.set_state(KEY, RequestStates.confirming)
+        session.execute.side_effect = RuntimeError("db down")
+
+        try:
+            await storage.flush()
+        except RuntimeError:
+            pass
+
+        session.execute.side_effect = None
+        calls = session.execute.await_count
+        await storage.flush()
+        assert session.execute.await_count == calls + 1
+
+    async def test_data_is_copied(self, storage: PostgresStorage) -> None:
+        """Test callers cannot mutate cached data."""
+        await storage.set_data(KEY, {"amount": 1})
+
+        data = await storage.get_data(KEY)
+        data["amount"] = 2
+
+        assert await storage.get_data(KEY) == {"amount": 1}
+
+    async def test_evicted_key_is_reloaded(
+        self, storage: PostgresStorage, session: MagicMock
+    ) -> None:
+        """Test the next update reads state written by another replica."""
+        assert await storage.get_state(KEY) is None
+        storage.evict(KEY)
+        session.execute.return_value.one_or_none.return_value = MagicMock(
+            state=RequestStates.confirming.state, data={"amount": 1}
+        )
+
+        assert await storage.get_state(KEY) == RequestStates.confirming.state
+        assert session.execute.await_count == 2
+
+    async def test_dirty_key_is_not_evicted(self, storage: PostgresStorage) -> None:
+        """Test unflushed changes survive eviction until written."""
+        await storage.set_state(KEY, RequestStates.confirming)
+
+        storage.evict(KEY)
+
+        assert await storage.get_state(KEY) == RequestStates.confirming.state
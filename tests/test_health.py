@@ -0,0 +1,110 @@
+"""Tests for the health endpoint."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from getmoney.monitoring import HealthMonitor, HealthServer
+
+
+def make_monitor(session_factory: MagicMock, checked_out: int = 0) -> HealthMonitor:
+    """Create monitor with a mocked pool of capacity 3."""
+    pool = MagicMock()
+    pool.checkedout.return_value = checked_out
+    return HealthMonitor(session_factory, pool, capacity=3, interval=0.01)
+
+
+class TestHealthMonitor:
+    """Tests for HealthMonitor."""
+
+    async def test_ready_after_startup(
+        self, session: MagicMock, session_factory: MagicMock
+    ) -> None:
+        """Test the bot is ready once sampled and marked started."""
+        session.execute.return_value.one.return_value = (4, 12.5)
+        monitor = make_monitor(session_factory)
+        await monitor.start()
+        await asyncio.sleep(0.05)
+
+        assert monitor.report().healthy
+        assert not monitor.report().ready
+
+        await monitor.mark_started()
+        report = monitor.report()
+        await monitor.stop()
+
+        assert report.ready
+        assert report.outbox_backlog == 4
+        assert report.outbox_oldest_age_s == 12.5
+        assert not monitor.report().healthy
+
+    async def test_not_ready_when_pool_exhausted(
+        self, session: MagicMock, session_factory: MagicMock
+    ) -> None:
+        """Test readiness fails when every connection is checked out."""
+        session.execute.return_value.one.return_value = (0, None)
+        monitor = make_monitor(session_factory, checked_out=3)
+        await monitor.start()
+        await monitor.mark_started()
+        await asyncio.sleep(0.02)
+        report = monitor.report()
+        await monitor.stop()
+
+        assert report.healthy
+        assert not report.ready
+
+    async def test_database_failure(self, session: MagicMock, session_factory: MagicMock) -> None:
+        """Test a failing query marks the database as down."""
+        session.execute.side_effect = OSError("connection refused")
+        monitor = make_monitor(session_factory)
+
+        await monitor.sample_outbox()
+
+        assert not monitor.database_ok
+        assert monitor.report().outbox_backlog is None
+
+    async def test_loop_lag(self, session_factory: MagicMock) -> None:
+        """Test blocking the event loop shows up as lag."""
+        monitor = make_monitor(session_factory)
+        monitor.max_loop_lag = 0.05
+        await monitor.start()
+        await asyncio.sleep(0.02)
+        time.sleep(0.1)  # Block the loop
+        await asyncio.sleep(0.02)
+        report = monitor.report()
+        await monitor.stop()
+
+        assert report.loop_lag_ms >= 50
+        assert not report.healthy
+
+    async def test_tracks_updates(self, session_factory: MagicMock) -> None:
+        """Test handled updates reset the time since the last update."""
+        monitor = make_monitor(session_factory)
+        assert monitor.report().last_update_age_s is None
+
+        await monitor.track_update(AsyncMock(), MagicMock(), {})
+
+        assert monitor.report().last_update_age_s < 1
+
+
+class TestHealthServer:
+    """Tests for the health routes."""
+
+    async def test_routes(self, session_factory: MagicMock) -> None:
+        """Test liveness and readiness status codes and JSON body."""
+        monitor = make_monitor(session_factory)
+        await monitor.start()
+        server = HealthServer(monitor, "127.0.0.1", 0)
+
+        async with TestClient(TestServer(server.create_app())) as client:
+            health = await client.get("/health")
+            ready = await client.get("/ready")
+            body = await health.json()
+
+        await monitor.stop()
+        assert health.status == 200
+        assert ready.status == 503
+        assert body["healthy"] is True
+        assert body["pool_capacity"] == 3
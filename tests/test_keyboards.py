@@ -0,0 +1,142 @@
+"""Tests for keyboards."""
+
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from getmoney.keyboards import AdminKeyboards, UserKeyboards
+from getmoney.callbacks import CallbackAction, MonthPageRef, pack, unpack
+from getmoney.models import Request, RequestStatus
+from getmoney.services.request import Cursor, Page
+
+
+def callbacks(markup) -> list[list[str]]:
+    """Extract callback data rows from inline keyboard."""
+    return [[button.callback_data for button in row] for row in markup.inline_keyboard]
+
+
+class TestRequestActions:
+    """Tests for per-status request action keyboards."""
+
+    def test_admin_pending(self) -> None:
+        """Test admin keyboard for pending request."""
+        request = Request(id=7, status=RequestStatus.PENDING)
+        assert callbacks(AdminKeyboards.request_actions(request)) == [
+            ["ap:7", "se:7"],
+            ["rj:7"],
+        ]
+
+    def test_admin_disputed(self) -> None:
+        """Test admin keyboard for disputed request."""
+        markup = AdminKeyboards.request_actions(Request(id=7, status=RequestStatus.DISPUTED))
+        assert callbacks(markup) == [["se:7"]]
+        assert markup.inline_keyboard[0][0].text == "💸 Отправлено повторно"
+
+    def test_admin_final(self) -> None:
+        """Test no admin keyboard for final statuses."""
+        for status in (RequestStatus.SENT, RequestStatus.CONFIRMED, RequestStatus.CANCELLED):
+            assert AdminKeyboards.request_actions(Request(id=7, status=status)) is None
+
+    def test_user_sent(self) -> None:
+        """Test user keyboard for sent request."""
+        request = Request(id=7, status=RequestStatus.SENT)
+        assert callbacks(UserKeyboards.request_actions(request)) == [
+            ["ok:7"],
+            ["di:7"],
+        ]
+
+    def test_user_approved(self) -> None:
+        """Test user keyboard for approved request."""
+        request = Request(id=7, status=RequestStatus.APPROVED)
+        assert callbacks(UserKeyboards.request_actions(request)) == [
+            ["re:7"],
+            ["ca:7"],
+        ]
+
+    def test_user_rejected(self) -> None:
+        """Test no user keyboard for rejected request."""
+        assert UserKeyboards.request_actions(Request(id=7, status=RequestStatus.REJECTED)) is None
+
+
+class TestPagination:
+    """Tests for paginated list keyboards."""
+
+    cursor = Cursor(datetime(2024, 5, 1, 12, 30, tzinfo=ZoneInfo("UTC")), 123456)
+
+    def test_admin_page(self) -> None:
+        """Test one button per request and navigation row."""
+        requests = [Request(id=7, amount=5000, status=RequestStatus.PENDING)]
+        markup = AdminKeyboards.active_page(Page(requests, newer=self.cursor, older=self.cursor))
+
+        rows = callbacks(markup)
+        assert rows[0] == ["op:7"]
+        assert [unpack(data)[1].cursor_args() for data in rows[1]] == [
+            {"before": self.cursor},
+            {"after": self.cursor},
+        ]
+
+    def test_no_navigation_on_single_page(self) -> None:
+        """Test navigation row is omitted without cursors."""
+        requests = [Request(id=7, amount=5000, status=RequestStatus.PENDING)]
+        assert callbacks(AdminKeyboards.active_page(Page(requests, None, None))) == [["op:7"]]
+
+    def test_user_callback_data_fits(self) -> None:
+        """Test user callback data stays within Telegram's 64-byte limit."""
+        requests = [
+            Request(
+                id=2**31 - 1,
+                amount=5000,
+                status=RequestStatus.SENT,
+                created_at=self.cursor.created_at,
+            )
+        ]
+        markup = UserKeyboards.active_page(Page(requests, self.cursor, self.cursor), 202405)
+
+        for row in callbacks(markup):
+            for data in row:
+                assert len(data.encode()) <= 64
+        assert unpack(callbacks(markup)[1][1]) == (
+            CallbackAction.MY_PAGE,
+            MonthPageRef(202405, 0, self.cursor.timestamp, self.cursor.id),
+        )
+
+    def test_detail_back_button(self) -> None:
+        """Test detail view ends with a back-to-list button."""
+        request = Request(id=7, status=RequestStatus.SENT)
+        assert callbacks(UserKeyboards.request_detail(request, 202405)) == [
+            ["ok:7"],
+            ["di:7"],
+            [pack(CallbackAction.MY_LIST, 202405)],
+        ]
+        assert callbacks(AdminKeyboards.request_detail(request)) == [["ls"]]
+
+
+class TestTemplates:
+    """Tests for cached and templated keyboards."""
+
+    def test_static_keyboards_cached(self) -> None:
+        """Test static keyboards are built once."""
+        assert UserKeyboards.main_menu() is UserKeyboards.main_menu()
+        assert UserKeyboards.amount_selection() is UserKeyboards.amount_selection()
+        assert AdminKeyboards.main_menu() is AdminKeyboards.main_menu()
+
+    def test_render_substitutes_id(self) -> None:
+        """Test each render gets its own callback data."""
+        first = AdminKeyboards.eta_selection(1)
+        second = AdminKeyboards.eta_selection(2)
+
+        assert callbacks(first)[0] == ["et:1:0", "et:1:1"]
+        assert callbacks(second)[2] == ["bk:2"]
+        assert callbacks(AdminKeyboards.eta_selection(1)) == callbacks(first)
+
+    def test_render_keeps_static_buttons(self) -> None:
+        """Test buttons without placeholders are left as is."""
+        assert callbacks(UserKeyboards.confirm_request(5000)) == [
+            [pack(CallbackAction.CONFIRM_REQUEST, 5000), "cf"]
+        ]
+
+    def test_rendered_markup_serializes(self) -> None:
+        """Test rendered markup serializes like a freshly built one."""
+        markup = AdminKeyboards.reject_confirm(7)
+        assert markup.model_dump(mode="json", exclude_none=True)["inline_keyboard"][0] == [
+            {"text": "❌ Отклонить без комментария", "callback_data": "ry:7"}
+        ]
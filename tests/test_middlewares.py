@@ -0,0 +1,191 @@
+"""Tests for middlewares."""
+
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from aiogram import Dispatcher
+from aiogram.types import Chat, Message, Update, User
+
+from getmoney.config import Role
+from getmoney.filters import RoleFilter
+from getmoney.middlewares import (
+    AccessMiddleware,
+    CommitBeforeRequestMiddleware,
+    DbSessionMiddleware,
+    FsmFlushMiddleware,
+)
+from getmoney.services import OutboxService, RequestService
+
+
+class TestDbSessionMiddleware:
+    """Tests for DbSessionMiddleware."""
+
+    async def test_injects_services_and_commits(
+        self, session: MagicMock, session_factory: MagicMock
+    ) -> None:
+        """Test handler gets services and session is committed afterwards."""
+        middleware = DbSessionMiddleware(session_factory)
+        seen = {}
+
+        async def handler(event: object, data: dict) -> str:
+            seen.update(data)
+            session.commit.assert_not_awaited()
+            return "ok"
+
+        result = await middleware(handler, MagicMock(), {})
+
+        assert result == "ok"
+        assert seen["session"] is session
+        assert isinstance(seen["service"], RequestService)
+        assert isinstance(seen["outbox"], OutboxService)
+        session.commit.assert_awaited_once()
+
+    async def test_no_commit_on_error(self, session: MagicMock, session_factory: MagicMock) -> None:
+        """Test failed handler is not committed."""
+        middleware = DbSessionMiddleware(session_factory)
+
+        async def handler(event: object, data: dict) -> None:
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            await middleware(handler, MagicMock(), {})
+
+        session.commit.assert_not_awaited()
+
+    async def test_keeps_workflow_data(
+        self, session_factory: MagicMock, dispatcher: Dispatcher
+    ) -> None:
+        """Test injected services do not shadow the dispatcher's background tasks."""
+        seen = {}
+
+        async def handler(event: object, data: dict) -> None:
+            seen.update(data)
+
+        await DbSessionMiddleware(session_factory)(handler, MagicMock(), {})
+
+        assert seen
+        assert not set(seen) & set(dispatcher.workflow_data)
+
+
+class TestFsmFlushMiddleware:
+    """Tests for FsmFlushMiddleware."""
+
+    async def test_flushes_and_evicts(self) -> None:
+        """Test changes are written and the update's key leaves the cache."""
+        storage = MagicMock(flush=AsyncMock())
+        state = MagicMock()
+
+        async def handler(event: object, data: dict) -> None:
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            await FsmFlushMiddleware(storage)(handler, MagicMock(), {"state": state})
+
+        storage.flush.assert_awaited_once()
+        storage.evict.assert_called_once_with(state.key)
+
+
+class TestCommitBeforeRequestMiddleware:
+    """Tests for CommitBeforeRequestMiddleware."""
+
+    async def test_commits_open_transaction_before_api_call(
+        self, session: MagicMock, session_factory: MagicMock
+    ) -> None:
+        """Test Bot API call inside a handler commits the session first."""
+        session.in_transaction.return_value = True
+        request_middleware = CommitBeforeRequestMiddleware()
+        make_request = AsyncMock(return_value="sent")
+
+        async def handler(event: object, data: dict) -> object:
+            return await request_middleware(make_request, MagicMock(), MagicMock())
+
+        result = await DbSessionMiddleware(session_factory)(handler, MagicMock(), {})
+
+        assert result == "sent"
+        # Once before the API call, once when the handler returns
+        assert session.commit.await_count == 2
+
+    async def test_outside_update_does_nothing(self) -> None:
+        """Test API calls from background tasks are passed straight through."""
+        make_request = AsyncMock(return_value="sent")
+
+        result = await CommitBeforeRequestMiddleware()(make_request, MagicMock(), MagicMock())
+
+        assert result == "sent"
+        make_request.assert_awaited_once()
+
+
+class TestAccessMiddleware:
+    """Tests for AccessMiddleware and RoleFilter."""
+
+    roles = {1: Role.ADMIN, 2: Role.USER}
+
+    @staticmethod
+    def user(user_id: int) -> User:
+        """Build a Telegram user."""
+        return User(id=user_id, is_bot=False, first_name="Test")
+
+    def message_update(self, user_id: int, text: str) -> Update:
+        """Build an update with a private text message."""
+        message = Message(
+            message_id=1,
+            date=datetime.now(),
+            chat=Chat(id=user_id, type="private"),
+            from_user=self.user(user_id),
+            text=text,
+        )
+        return Update(update_id=1, message=message)
+
+    async def test_allowed_user_gets_role(self) -> None:
+        """Test known sender is passed on with its role."""
+        handler = AsyncMock(return_value="ok")
+        data = {"event_from_user": self.user(2)}
+
+        result = await AccessMiddleware(self.roles)(handler, MagicMock(), data)
+
+        assert result == "ok"
+        assert data["role"] is Role.USER
+        assert await RoleFilter(Role.USER)(MagicMock(), role=data["role"])
+        assert not await RoleFilter(Role.ADMIN)(MagicMock(), role=data["role"])
+
+    async def test_unknown_user_dropped(self) -> None:
+        """Test unknown sender never reaches the handler."""
+        handler = AsyncMock()
+        event = self.message_update(3, "привет")
+
+        with patch.object(Message, "answer", AsyncMock()) as answer:
+            result = await AccessMiddleware(self.roles)(
+                handler, event, {"event_from_user": self.user(3)}
+            )
+
+        assert result is None
+        handler.assert_not_awaited()
+        answer.assert_not_awaited()
+
+    async def test_unknown_user_start_gets_id(self) -> None:
+        """Test /start from unknown sender is answered with their ID."""
+        handler = AsyncMock()
+        event = self.message_update(3, "/start")
+
+        with patch.object(Message, "answer", AsyncMock()) as answer:
+            await AccessMiddleware(self.roles)(handler, event, {"event_from_user": self.user(3)})
+
+        handler.assert_not_awaited()
+        assert "ID: 3" in answer.await_args.args[0]
+
+    async def test_no_user_dropped(self) -> None:
+        """Test updates without a sender are dropped."""
+        handler = AsyncMock()
+
+        await AccessMiddleware(self.roles)(handler, MagicMock(), {})
+
+        handler.assert_not_awaited()
+
+    def test_registered_before_fsm(self, dispatcher: Dispatcher) -> None:
+        """Test access is checked before FSM state is loaded."""
+        middlewares = list(dispatcher.update.outer_middleware)
+        access = next(i for i, m in enumerate(middlewares) if isinstance(m, AccessMiddleware))
+
+        assert access < middlewares.index(dispatcher.fsm)
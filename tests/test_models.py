@@ -1,7 +1,11 @@
 """Tests for models."""
 
 import pytest
-from getmoney.models import RequestStatus
+from sqlalchemy.dialects import postgresql
+
+from getmoney.models import RequestAction, RequestStatus
+from getmoney.models.status import ACTION_SOURCES, STATUS_CODES, STATUS_TABLE
+from getmoney.models.types import StatusType
 
 
 class TestRequestStatus:
@@ -27,6 +31,26 @@ class TestRequestStatus:
         assert RequestStatus.REJECTED.is_active is False
         assert RequestStatus.CANCELLED.is_active is False
 
+    def test_can_approve(self) -> None:
+        """Test can_approve property."""
+        assert RequestStatus.PENDING.can_approve is True
+        assert RequestStatus.APPROVED.can_approve is False
+        assert RequestStatus.DISPUTED.can_approve is False
+
+    def test_can_reject(self) -> None:
+        """Test can_reject property."""
+        assert RequestStatus.PENDING.can_reject is True
+        assert RequestStatus.APPROVED.can_reject is True
+        assert RequestStatus.SENT.can_reject is False
+
+    def test_can_mark_sent(self) -> None:
+        """Test can_mark_sent property."""
+        assert RequestStatus.PENDING.can_mark_sent is True
+        assert RequestStatus.APPROVED.can_mark_sent is True
+        assert RequestStatus.DISPUTED.can_mark_sent is True
+        assert RequestStatus.SENT.can_mark_sent is False
+        assert RequestStatus.CONFIRMED.can_mark_sent is False
+
     def test_can_cancel(self) -> None:
         """Test can_cancel property."""
         assert RequestStatus.PENDING.can_cancel is True
@@ -50,3 +74,51 @@ class TestRequestStatus:
         assert "Ожидает" in RequestStatus.PENDING.display_name
         assert "Одобрено" in RequestStatus.APPROVED.display_name
         assert "Отправлено" in RequestStatus.SENT.display_name
+
+
+class TestStatusTable:
+    """Tests for the status state machine table."""
+
+    def test_covers_all_statuses(self) -> None:
+        """Test every status has an entry."""
+        assert set(STATUS_TABLE) == set(RequestStatus)
+
+    def test_action_sources(self) -> None:
+        """Test allowed source statuses are derived from the table."""
+        assert ACTION_SOURCES[RequestAction.APPROVE] == (RequestStatus.PENDING,)
+        assert set(ACTION_SOURCES[RequestAction.SEND]) == {
+            RequestStatus.PENDING,
+            RequestStatus.APPROVED,
+            RequestStatus.DISPUTED,
+        }
+        assert ACTION_SOURCES[RequestAction.CONFIRM] == (RequestStatus.SENT,)
+
+    def test_final_statuses_have_no_keyboards(self) -> None:
+        """Test final statuses offer no actions."""
+        for info in STATUS_TABLE.values():
+            if info.is_final:
+                assert not info.actions
+                assert not info.admin_keyboard
+                assert not info.user_keyboard
+
+
+class TestStatusType:
+    """Tests for smallint status storage."""
+
+    def test_codes_cover_statuses(self) -> None:
+        """Test every status has a distinct code."""
+        assert set(STATUS_CODES) == set(RequestStatus)
+        assert len(set(STATUS_CODES.values())) == len(STATUS_CODES)
+
+    def test_roundtrip(self) -> None:
+        """Test statuses (and their string values) map to codes and back."""
+        status_type = StatusType()
+        dialect = postgresql.dialect()
+        for status in RequestStatus:
+            code = status_type.process_bind_param(status, dialect)
+            assert status_type.process_bind_param(status.value, dialect) == code
+            assert status_type.process_result_value(code, dialect) is status
+
+    def test_literal(self) -> None:
+        """Test status renders as its code in inlined SQL."""
+        assert StatusType().process_literal_param(RequestStatus.APPROVED, None) == "1"
@@ -0,0 +1,215 @@
+"""Tests for latency metrics and SQL diagnostics."""
+
+import logging
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiogram import Bot, Dispatcher, Router
+from aiogram.methods import SendMessage
+from aiogram.types import CallbackQuery, Chat, Message, Update, User
+from aiohttp.test_utils import TestClient, TestServer
+
+from getmoney.callbacks import CallbackAction, CallbackHandlers
+from getmoney.monitoring import (
+    BotApiTimingMiddleware,
+    Gauge,
+    HandlerTimingMiddleware,
+    Histogram,
+    MetricsServer,
+    QueryDiagnosticsMiddleware,
+    Registry,
+)
+from getmoney.monitoring.db import statement_operation
+from getmoney.monitoring.metrics import bot_api_seconds, handler_seconds
+from getmoney.monitoring.queries import record_query
+
+
+class TestHistogram:
+    """Tests for Histogram and Registry rendering."""
+
+    def test_render(self) -> None:
+        """Test buckets are cumulative and bounds are inclusive."""
+        registry = Registry()
+        histogram = registry.register(
+            Histogram("test_seconds", "Test.", ("name",), buckets=(0.1, 1.0))
+        )
+        registry.register(Gauge("test_gauge", "Gauge.", lambda: 3))
+        histogram.observe(0.1, "a")
+        histogram.observe(0.5, "a")
+        histogram.observe(2.0, "a")
+
+        assert registry.render().splitlines() == [
+            "# HELP test_seconds Test.",
+            "# TYPE test_seconds histogram",
+            'test_seconds_bucket{name="a",le="0.1"} 1',
+            'test_seconds_bucket{name="a",le="1"} 2',
+            'test_seconds_bucket{name="a",le="+Inf"} 3',
+            'test_seconds_sum{name="a"} 2.6',
+            'test_seconds_count{name="a"} 3',
+            "# HELP test_gauge Gauge.",
+            "# TYPE test_gauge gauge",
+            "test_gauge 3",
+        ]
+
+    def test_escapes_labels(self) -> None:
+        """Test quotes in label values are escaped."""
+        histogram = Histogram("test_seconds", "Test.", ("name",))
+        histogram.observe(1.0, 'a"b')
+
+        assert 'name="a\\"b"' in next(histogram.collect())
+
+    def test_wrong_labels(self) -> None:
+        """Test observing with the wrong number of labels fails."""
+        with pytest.raises(ValueError):
+            Histogram("test_seconds", "Test.", ("name",)).observe(1.0)
+
+    def test_duplicate_name(self) -> None:
+        """Test metric names are unique per registry."""
+        registry = Registry()
+        registry.register(Histogram("test_seconds", "Test."))
+        with pytest.raises(ValueError):
+            registry.register(Histogram("test_seconds", "Test."))
+
+
+class TestStatementOperation:
+    """Tests for SQL statement labels."""
+
+    @pytest.mark.parametrize(
+        ("statement", "operation"),
+        [
+            ("SELECT 1", "SELECT"),
+            ("\n  insert into requests", "INSERT"),
+            ("", ""),
+        ],
+    )
+    def test_operation(self, statement: str, operation: str) -> None:
+        """Test first keyword is used, upper-cased."""
+        assert statement_operation(statement) == operation
+
+
+class TestHandlerTimingMiddleware:
+    """Tests for handler timing."""
+
+    async def test_times_callback_handler_by_name(self) -> None:
+        """Test callbacks are labelled with the function CallbackHandlers routes to."""
+        router = Router()
+        callbacks = CallbackHandlers(router)
+
+        @callbacks(CallbackAction.LIST)
+        async def show_list(callback: CallbackQuery) -> None:
+            pass
+
+        dp = Dispatcher()
+        dp.callback_query.middleware(HandlerTimingMiddleware())
+        dp.include_router(router)
+        name = "test_monitoring.TestHandlerTimingMiddleware.test_times_callback_handler_by_name"
+        name += ".<locals>.show_list"
+        before = handler_seconds.count(name)
+
+        user = User(id=1, is_bot=False, first_name="Test")
+        message = Message(message_id=1, date=datetime.now(), chat=Chat(id=1, type="private"))
+        update = Update(
+            update_id=1,
+            callback_query=CallbackQuery(
+                id="1", from_user=user, chat_instance="1", message=message, data="ls"
+            ),
+        )
+        await dp.feed_update(Bot("1:test"), update)
+
+        assert handler_seconds.count(name) == before + 1
+
+    async def test_records_failures(self) -> None:
+        """Test a failing handler is still timed."""
+        middleware = HandlerTimingMiddleware()
+        before = handler_seconds.count("unknown")
+
+        with pytest.raises(RuntimeError):
+            await middleware(AsyncMock(side_effect=RuntimeError), MagicMock(), {})
+
+        assert handler_seconds.count("unknown") == before + 1
+
+
+class TestBotApiTimingMiddleware:
+    """Tests for Bot API call timing."""
+
+    async def test_times_method(self) -> None:
+        """Test calls are labelled with the API method name."""
+        middleware = BotApiTimingMiddleware()
+        make_request = AsyncMock(return_value="ok")
+        before = bot_api_seconds.count("sendMessage")
+
+        result = await middleware(make_request, MagicMock(), SendMessage(chat_id=1, text="hi"))
+
+        assert result == "ok"
+        assert bot_api_seconds.count("sendMessage") == before + 1
+
+
+class TestMetricsServer:
+    """Tests for the metrics endpoint."""
+
+    async def test_serves_registry(self) -> None:
+        """Test /metrics returns the rendered registry."""
+        registry = Registry()
+        registry.register(Gauge("test_gauge", "Gauge.", lambda: 1))
+        server = MetricsServer(registry, "127.0.0.1", 0)
+
+        async with TestClient(TestServer(server.create_app())) as client:
+            response = await client.get("/metrics")
+            body = await response.text()
+
+        assert response.status == 200
+        assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        assert "test_gauge 1" in body
+
+
+class TestQueryDiagnosticsMiddleware:
+    """Tests for per-update SQL diagnostics."""
+
+    async def test_reports_slow_and_repeated(self, caplog: pytest.LogCaptureFixture) -> None:
+        """Test slow, identical and N+1 statements are logged with the handler name."""
+        diagnostics = QueryDiagnosticsMiddleware(slow_threshold=0.1, repeat_threshold=3)
+
+        async def load_request(event: object, data: dict) -> None:
+            record_query("SELECT * FROM requests WHERE id = $1", (1,), 0.2)
+            record_query("SELECT * FROM requests WHERE id = $1", (1,), 0.001)
+            record_query("SELECT * FROM requests WHERE id = $1", (2,), 0.001)
+
+        async def handler(event: object, data: dict) -> None:
+            await diagnostics.handler_middleware(load_request, event, data)
+
+        callback = MagicMock(__module__="getmoney.handlers.admin", __qualname__="show")
+        with caplog.at_level(logging.WARNING, logger="getmoney.monitoring.queries"):
+            await diagnostics(handler, MagicMock(), {"handler": MagicMock(callback=callback)})
+
+        messages = [r.getMessage() for r in caplog.records]
+        assert len(messages) == 3
+        assert messages[0].startswith("Slow query in admin.show (200.0 ms)")
+        assert messages[1].startswith("Repeated query in admin.show (2x)")
+        assert messages[2].startswith("Possible N+1 in admin.show (3x)")
+
+    async def test_quiet_without_problems(self, caplog: pytest.LogCaptureFixture) -> None:
+        """Test nothing is logged for distinct fast statements."""
+        diagnostics = QueryDiagnosticsMiddleware(slow_threshold=0.1)
+
+        async def handler(event: object, data: dict) -> None:
+            record_query("SELECT 1", (), 0.001)
+            record_query("SELECT 2", (), 0.001)
+
+        with caplog.at_level(logging.WARNING, logger="getmoney.monitoring.queries"):
+            await diagnostics(handler, MagicMock(), {})
+
+        assert caplog.records == []
+
+    def test_wraps_fsm_middleware(self) -> None:
+        """Test FSM state loads run inside the diagnostics middleware."""
+        from getmoney.main import setup_query_diagnostics
+
+        dp = Dispatcher()
+        setup_query_diagnostics(dp)
+        middlewares = list(dp.update.outer_middleware)
+        diagnostics = next(
+            i for i, m in enumerate(middlewares) if isinstance(m, QueryDiagnosticsMiddleware)
+        )
+
+        assert diagnostics < middlewares.index(dp.fsm)
@@ -0,0 +1,51 @@
+"""Tests for outbox service."""
+
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from getmoney.models import OutboxMessage
+from getmoney.services.outbox import RETRY_MAX, OutboxService, retry_delay
+
+
+class TestOutboxService:
+    """Tests for OutboxService."""
+
+    def test_enqueue_serializes_markup(self) -> None:
+        """Test queued message keeps keyboard as JSON."""
+        session = MagicMock()
+        session.sync_session.info = {}
+        markup = InlineKeyboardMarkup(
+            inline_keyboard=[[InlineKeyboardButton(text="OK", callback_data="ok:1")]]
+        )
+
+        OutboxService(session).enqueue(chat_id=1, text="hi", reply_markup=markup, request_id=5)
+
+        message = session.add.call_args.args[0]
+        assert isinstance(message, OutboxMessage)
+        assert message.request_id == 5
+        assert InlineKeyboardMarkup.model_validate(message.reply_markup) == markup
+
+    def test_enqueue_wakes_dispatcher_on_commit(self) -> None:
+        """Test dispatcher wakeup is deferred until commit."""
+        session = MagicMock()
+        session.sync_session.info = {}
+
+        OutboxService(session).enqueue(chat_id=1, text="hi")
+
+        assert len(session.sync_session.info["on_commit"]) == 1
+
+
+class TestRetryDelay:
+    """Tests for delivery backoff."""
+
+    def test_exponential(self) -> None:
+        """Test delay doubles with each attempt."""
+        assert retry_delay(2) == retry_delay(1) * 2
+        assert retry_delay(3) == retry_delay(1) * 4
+
+    def test_capped(self) -> None:
+        """Test delay never exceeds the maximum."""
+        assert retry_delay(100) == RETRY_MAX
+        assert retry_delay(100) <= timedelta(hours=1)
@@ -0,0 +1,114 @@
+"""Query plan tests against a real PostgreSQL database.
+
+Skipped unless ``TEST_DATABASE_URL`` points to a disposable database: the
+schema is dropped and recreated.
+"""
+
+import json
+import os
+from collections.abc import AsyncGenerator, Iterator
+from datetime import UTC, datetime
+from typing import Any
+
+import pytest
+from sqlalchemy import Select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from getmoney.models import Base
+from getmoney.models.status import ACTIVE_STATUSES, FINAL_STATUSES, STATUS_CODES
+from getmoney.services.request import Cursor, RequestService
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL not set")
+
+ROWS = 200_000
+ACTIVE_EVERY = 200  # 0.5% of requests are still active
+
+
+@pytest.fixture
+async def conn() -> AsyncGenerator[AsyncConnection, None]:
+    """Connection to a freshly seeded, analyzed requests table."""
+    engine = create_async_engine(TEST_DATABASE_URL)
+    async with engine.begin() as setup:
+        await setup.run_sync(Base.metadata.drop_all)
+        await setup.run_sync(Base.metadata.create_all)
+        await setup.execute(
+            text("""
+                INSERT INTO requests (user_id, amount, status, created_at, updated_at)
+                SELECT
+                    1 + g % 2,
+                    1000,
+                    CASE
+                        WHEN g % :every = 0 THEN (CAST(:active AS smallint[]))[1 + g % 4]
+                        ELSE (CAST(:final AS smallint[]))[1 + g % 3]
+                    END,
+                    now() - g * interval '1 minute',
+                    now()
+                FROM generate_series(1, :rows) AS g
+                """),
+            {
+                "rows": ROWS,
+                "every": ACTIVE_EVERY,
+                "active": [STATUS_CODES[s] for s in ACTIVE_STATUSES],
+                "final": [STATUS_CODES[s] for s in FINAL_STATUSES],
+            },
+        )
+        await setup.execute(text("ANALYZE requests"))
+
+    async with engine.connect() as connection:
+        yield connection
+    await engine.dispose()
+
+
+async def explain(conn: AsyncConnection, query: Select[Any]) -> dict[str, Any]:
+    """Get the generic plan of ``query``, as used for prepared statements."""
+    compiled = query.compile(dialect=conn.dialect, compile_kwargs={"render_postcompile": True})
+    params = [compiled.params[name] for name in compiled.positiontup]
+    driver = (await conn.get_raw_connection()).driver_connection
+    await driver.execute("SET plan_cache_mode = force_generic_plan")
+    plan = await driver.fetchval(f"EXPLAIN (FORMAT JSON) {compiled}", *params)
+    return json.loads(plan)[0]["Plan"]
+
+
+def nodes(plan: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    """Walk all plan nodes."""
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from nodes(child)
+
+
+def assert_uses_active_index(plan: dict[str, Any]) -> None:
+    """Check the plan scans the partial index and never the whole table."""
+    assert all(node["Node Type"] != "Seq Scan" for node in nodes(plan)), plan
+    assert any(
+        node.get("Index Name") == "ix_requests_active_created_at" for node in nodes(plan)
+    ), plan
+
+
+class TestActiveQueryPlan:
+    """Active list queries are served by the partial index."""
+
+    async def test_first_page(self, conn: AsyncConnection) -> None:
+        """Test first page reads the index in order without sorting."""
+        plan = await explain(conn, RequestService.active_page_query().limit(9))
+
+        assert_uses_active_index(plan)
+        assert all(node["Node Type"] != "Sort" for node in nodes(plan)), plan
+
+    async def test_pages_by_cursor(self, conn: AsyncConnection) -> None:
+        """Test older and newer pages start from the cursor in the index."""
+        cursor = Cursor(datetime.now(UTC), 1000)
+
+        assert_uses_active_index(
+            await explain(conn, RequestService.active_page_query(after=cursor).limit(9))
+        )
+        assert_uses_active_index(
+            await explain(conn, RequestService.active_page_query(before=cursor).limit(9))
+        )
+
+    async def test_full_active_list(self, conn: AsyncConnection) -> None:
+        """Test the unpaginated active list also avoids a table scan."""
+        query = RequestService.active_page_query()
+
+        assert_uses_active_index(await explain(conn, query))
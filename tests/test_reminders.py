@@ -0,0 +1,156 @@
+"""Tests for ETA queue and reminder scheduler."""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+from getmoney.models import Request, RequestStatus
+from getmoney.services.eta import EtaQueue, track_eta
+from getmoney.services.reminders import EtaScheduler
+
+NOW = datetime(2024, 5, 1, 12, 0, tzinfo=UTC)
+
+
+def commit(session: MagicMock) -> None:
+    """Run the session's on-commit callbacks."""
+    for callback in session.sync_session.info.pop("on_commit", ()):
+        callback()
+
+
+class TestEtaQueue:
+    """Tests for EtaQueue."""
+
+    def test_pops_in_eta_order(self) -> None:
+        """Test due requests come out earliest first."""
+        queue = EtaQueue()
+        queue.schedule(1, NOW + timedelta(hours=2))
+        queue.schedule(2, NOW + timedelta(hours=1))
+        queue.schedule(3, NOW + timedelta(hours=3))
+
+        assert queue.next_deadline() == NOW + timedelta(hours=1)
+        assert queue.pop_due(NOW + timedelta(hours=2)) == [2, 1]
+        assert len(queue) == 1
+
+    def test_reschedule(self) -> None:
+        """Test old ETA of a rescheduled request is ignored."""
+        queue = EtaQueue()
+        queue.schedule(1, NOW)
+        queue.schedule(1, NOW + timedelta(hours=1))
+
+        assert queue.pop_due(NOW) == []
+        assert queue.next_deadline() == NOW + timedelta(hours=1)
+
+    def test_unschedule(self) -> None:
+        """Test unscheduled request never fires."""
+        queue = EtaQueue()
+        queue.schedule(1, NOW)
+        queue.unschedule(1)
+        queue.unschedule(2)
+
+        assert queue.next_deadline() is None
+        assert queue.pop_due(NOW + timedelta(days=1)) == []
+
+    def test_stale_entries_compacted(self) -> None:
+        """Test heap does not grow with repeated rescheduling."""
+        queue = EtaQueue()
+        for minutes in range(1000):
+            queue.schedule(1, NOW + timedelta(minutes=minutes))
+
+        assert len(queue._heap) <= 2 * len(queue) + 16
+        assert queue.next_deadline() == NOW + timedelta(minutes=999)
+
+
+class TestTrackEta:
+    """Tests for queue updates on commit."""
+
+    def test_approved_scheduled_after_commit(self) -> None:
+        """Test approval is scheduled only once the transaction commits."""
+        session = MagicMock()
+        session.sync_session.info = {}
+        queue = EtaQueue()
+
+        track_eta(session, Request(id=1, status=RequestStatus.APPROVED, eta=NOW), queue)
+        assert len(queue) == 0
+
+        commit(session)
+        assert queue.next_deadline() == NOW
+
+    def test_left_approved_unscheduled(self) -> None:
+        """Test request moving on from APPROVED is removed."""
+        session = MagicMock()
+        session.sync_session.info = {}
+        queue = EtaQueue()
+        queue.schedule(1, NOW)
+
+        track_eta(session, Request(id=1, status=RequestStatus.SENT, eta=NOW), queue)
+        commit(session)
+
+        assert len(queue) == 0
+
+
+class TestEtaScheduler:
+    """Tests for EtaScheduler timer loop."""
+
+    async def test_wakes_for_new_earlier_eta(self) -> None:
+        """Test ETA added while sleeping is reminded about on time."""
+        queue = EtaQueue()
+        queue.schedule(1, datetime.now(UTC) + timedelta(hours=1))
+        scheduler = EtaScheduler(MagicMock(), queue)
+        scheduler.load = AsyncMock(return_value=0)
+        scheduler.remind = AsyncMock(return_value=1)
+
+        await scheduler.start()
+        await asyncio.sleep(0.01)
+        queue.schedule(2, datetime.now(UTC) + timedelta(milliseconds=20))
+        await asyncio.sleep(0.1)
+        await scheduler.stop()
+
+        scheduler.remind.assert_awaited_once()
+        assert scheduler.remind.await_args.args[0] == [2]
+        assert len(queue) == 1
+
+    async def test_failed_reminder_retried(self) -> None:
+        """Test requests are rescheduled when queueing reminders fails."""
+        queue = EtaQueue()
+        queue.schedule(1, datetime.now(UTC))
+        scheduler = EtaScheduler(MagicMock(), queue)
+        scheduler.load = AsyncMock(return_value=0)
+        scheduler.remind = AsyncMock(side_effect=RuntimeError("db down"))
+
+        await scheduler.start()
+        await asyncio.sleep(0.01)
+        await scheduler.stop()
+
+        assert len(queue) == 1
+        assert queue.next_deadline() > datetime.now(UTC)
+
+    async def test_overdue_eta_fires_on_start(
+        self, session: MagicMock, session_factory: MagicMock
+    ) -> None:
+        """Test ETA passed while the bot was down is reminded about right away."""
+        session.execute.return_value.all.return_value = [(1, datetime.now(UTC) - timedelta(days=1))]
+        queue = EtaQueue()
+        scheduler = EtaScheduler(session_factory, queue)
+        scheduler.remind = AsyncMock(return_value=1)
+
+        await scheduler.start()
+        await asyncio.sleep(0.01)
+        await scheduler.stop()
+
+        sql = str(session.execute.await_args_list[0].args[0])
+        assert "reminded_at IS NULL" in sql
+        assert "eta >" not in sql
+        assert scheduler.remind.await_args.args[0] == [1]
+
+    async def test_reminder_marks_request(
+        self, session: MagicMock, session_factory: MagicMock
+    ) -> None:
+        """Test reminders are only queued for requests not reminded about yet."""
+        session.execute.return_value.scalars.return_value.all.return_value = []
+        scheduler = EtaScheduler(session_factory, EtaQueue())
+
+        assert await scheduler.remind([1], NOW) == 0
+
+        sql = str(session.execute.await_args.args[0])
+        assert sql.startswith("UPDATE requests SET reminded_at")
+        assert "reminded_at IS NULL" in sql
@@ -5,7 +5,8 @@ from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 from unittest.mock import MagicMock, AsyncMock
 
-from getmoney.services.request import RequestService
+from getmoney.models import Request, RequestStatus
+from getmoney.services.request import Cursor, MonthlyStats, RequestService
 
 
 class TestRequestService:
@@ -58,3 +59,263 @@ class TestRequestService:
 
         # Default is +24 hours
         assert eta >= before + timedelta(hours=23, minutes=59)
+
+    def test_month_range(self) -> None:
+        """Test month bounds are half-open and timezone-aware."""
+        session = MagicMock()
+        service = RequestService(session)
+
+        start, end = service.month_range(2024, 2)
+
+        assert start == datetime(2024, 2, 1, tzinfo=service.tz)
+        assert end == datetime(2024, 3, 1, tzinfo=service.tz)
+        assert start.utcoffset() is not None
+
+    def test_month_range_december(self) -> None:
+        """Test month bounds roll over to next year."""
+        session = MagicMock()
+        service = RequestService(session)
+
+        start, end = service.month_range(2024, 12)
+
+        assert start == datetime(2024, 12, 1, tzinfo=service.tz)
+        assert end == datetime(2025, 1, 1, tzinfo=service.tz)
+
+    async def test_get_monthly_stats(self) -> None:
+        """Test stats are read from a single rollup row."""
+        session = MagicMock()
+        result = MagicMock()
+        result.one_or_none.return_value = (30000, 20000, 10000, 5000)
+        session.execute = AsyncMock(return_value=result)
+        service = RequestService(session)
+
+        stats = await service.get_monthly_stats(2, 2024, 5)
+
+        assert stats == MonthlyStats(30000, 20000, 10000, 5000)
+        session.execute.assert_awaited_once()
+
+    async def test_get_monthly_view_empty(self) -> None:
+        """Test empty month view has zero stats."""
+        session = MagicMock()
+        result = MagicMock()
+        result.all.return_value = []
+        session.execute = AsyncMock(return_value=result)
+        service = RequestService(session)
+
+        view = await service.get_monthly_view(2, 2024, 5)
+
+        assert view.requests == []
+        assert view.stats == MonthlyStats(0, 0, 0, 0)
+        session.execute.assert_awaited_once()
+
+    async def test_transition_not_allowed(self) -> None:
+        """Test transition returns None when no row matches allowed statuses."""
+        session = MagicMock()
+        result = MagicMock()
+        result.one_or_none.return_value = None
+        session.execute = AsyncMock(return_value=result)
+        service = RequestService(session)
+
+        request = await service.confirm_receipt(1)
+
+        assert request is None
+        session.execute.assert_awaited_once()
+
+    async def test_get_monthly_stats_missing_row(self) -> None:
+        """Test month without requests has zero stats."""
+        session = MagicMock()
+        result = MagicMock()
+        result.one_or_none.return_value = None
+        session.execute = AsyncMock(return_value=result)
+
+        stats = await RequestService(session).get_monthly_stats(2, 2024, 5)
+
+        assert stats == MonthlyStats(0, 0, 0, 0)
+
+    async def test_transition_updates_rollup(self) -> None:
+        """Test transition changing totals also upserts the rollup."""
+        session = MagicMock()
+        result = MagicMock()
+        request = Request(
+            id=1,
+            user_id=2,
+            amount=5000,
+            status=RequestStatus.APPROVED,
+            created_at=datetime(2024, 5, 1, tzinfo=ZoneInfo("UTC")),
+        )
+        result.one_or_none.return_value = (request, RequestStatus.PENDING)
+        session.execute = AsyncMock(return_value=result)
+
+        await RequestService(session).approve_request(1, datetime.now(ZoneInfo("UTC")))
+
+        # UPDATE ... RETURNING, then the rollup UPSERT
+        assert session.execute.await_count == 2
+
+    async def test_transition_without_total_change(self) -> None:
+        """Test cancelling a pending request leaves the rollup alone."""
+        session = MagicMock()
+        result = MagicMock()
+        request = Request(
+            id=1,
+            user_id=2,
+            amount=5000,
+            status=RequestStatus.CANCELLED,
+            created_at=datetime(2024, 5, 1, tzinfo=ZoneInfo("UTC")),
+        )
+        result.one_or_none.return_value = (request, RequestStatus.PENDING)
+        session.execute = AsyncMock(return_value=result)
+
+        await RequestService(session).cancel_request(1)
+
+        session.execute.assert_awaited_once()
+
+    async def test_update_message_ids_single_statement(self) -> None:
+        """Test message IDs are written with one UPDATE, without loading the request."""
+        session = MagicMock()
+        session.execute = AsyncMock()
+
+        await RequestService(session).update_message_ids(1, admin_message_id=10)
+
+        session.execute.assert_awaited_once()
+        stmt = session.execute.await_args.args[0]
+        assert stmt.is_update
+        assert set(stmt.compile().params) == {"admin_message_id", "id_1"}
+
+    async def test_prepare_statements_changes_nothing(self) -> None:
+        """Test warmup runs the hot queries and writes only miss request 0."""
+        session = MagicMock()
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = []
+        result.all.return_value = []
+        result.one_or_none.return_value = None
+        session.execute = AsyncMock(return_value=result)
+
+        await RequestService(session).prepare_statements()
+
+        # 3 active pages per user (empty pages with a cursor fall back to the
+        # first page), monthly view, get_request, 7 transitions, 2 updates
+        assert session.execute.await_count == 2 * 5 + 1 + 1 + 7 + 2
+        session.add.assert_not_called()
+        session.commit.assert_not_called()
+
+    async def test_update_message_ids_nothing_to_update(self) -> None:
+        """Test no query is issued without message IDs."""
+        session = MagicMock()
+        session.execute = AsyncMock()
+
+        await RequestService(session).update_message_ids(1)
+
+        session.execute.assert_not_awaited()
+
+
+class TestMonthlyStats:
+    """Tests for per-request contributions to monthly totals."""
+
+    def test_contribution(self) -> None:
+        """Test which totals a request counts towards."""
+        assert MonthlyStats.of(RequestStatus.PENDING, 100) == MonthlyStats(100, 0, 0, 0)
+        assert MonthlyStats.of(RequestStatus.SENT, 100) == MonthlyStats(100, 100, 0, 0)
+        assert MonthlyStats.of(RequestStatus.CONFIRMED, 100) == MonthlyStats(100, 100, 100, 0)
+        assert MonthlyStats.of(RequestStatus.REJECTED, 100) == MonthlyStats(100, 0, 0, 100)
+
+    def test_transition_delta(self) -> None:
+        """Test delta between statuses."""
+        delta = MonthlyStats.of(RequestStatus.REJECTED, 100) - MonthlyStats.of(
+            RequestStatus.APPROVED, 100
+        )
+        assert delta == MonthlyStats(0, -100, 0, 100)
+
+
+def make_requests(count: int) -> list[Request]:
+    """Build active requests, newest first."""
+    base = datetime(2024, 5, 1, 12, 0, tzinfo=ZoneInfo("UTC"))
+    return [
+        Request(id=100 - i, status=RequestStatus.PENDING, created_at=base - timedelta(hours=i))
+        for i in range(count)
+    ]
+
+
+def page_session(rows: list[Request]) -> MagicMock:
+    """Mock session returning ``rows`` from a scalars query."""
+    session = MagicMock()
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = rows
+    session.execute = AsyncMock(return_value=result)
+    return session
+
+
+class TestActivePage:
+    """Tests for keyset pagination of active requests."""
+
+    def test_cursor_roundtrip(self) -> None:
+        """Test cursor timestamp is exact to the microsecond."""
+        cursor = Cursor(datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=ZoneInfo("UTC")), 42)
+        assert Cursor.from_timestamp(cursor.timestamp, cursor.id) == cursor
+
+    async def test_first_page(self) -> None:
+        """Test first page has only an older cursor when more rows exist."""
+        rows = make_requests(4)
+        service = RequestService(page_session(rows))
+
+        page = await service.get_active_page(limit=3)
+
+        assert [r.id for r in page.requests] == [100, 99, 98]
+        assert page.newer is None
+        assert page.older == Cursor.of(rows[2])
+
+    async def test_last_page(self) -> None:
+        """Test page after a cursor without further rows."""
+        rows = make_requests(2)
+        service = RequestService(page_session(rows))
+
+        page = await service.get_active_page(after=Cursor.of(rows[0]), limit=3)
+
+        assert page.newer == Cursor.of(rows[0])
+        assert page.older is None
+
+    async def test_newer_page(self) -> None:
+        """Test going back returns rows newest first."""
+        rows = make_requests(4)
+        # Query runs in ascending order
+        service = RequestService(page_session(list(reversed(rows))))
+
+        cursor = Cursor(datetime.now(ZoneInfo("UTC")), 1)
+        page = await service.get_active_page(before=cursor, limit=3)
+
+        assert [r.id for r in page.requests] == [99, 98, 97]
+        assert page.newer == Cursor.of(rows[1])
+        assert page.older == Cursor.of(rows[3])
+
+    async def test_empty_page_falls_back_to_first(self) -> None:
+        """Test cursor past the end restarts from the first page."""
+        session = page_session([])
+        service = RequestService(session)
+
+        page = await service.get_active_page(after=Cursor(datetime.now(ZoneInfo("UTC")), 1))
+
+        assert page.requests == []
+        assert page.newer is None and page.older is None
+        assert session.execute.await_count == 2
+
+    async def test_month_page(self) -> None:
+        """Test a month's page only covers requests created in that month."""
+        session = page_session([])
+        service = RequestService(session)
+        start, end = service.month_range(2024, 5)
+
+        await service.get_active_page(2, after=Cursor(end, 1), created=(start, end))
+
+        # The fallback to the first page keeps the month too
+        for call in session.execute.await_args_list:
+            params = call.args[0].compile().params
+            assert start in params.values() and end in params.values()
+
+    async def test_active_requests(self) -> None:
+        """Test the unpaginated list of a user's active requests."""
+        rows = make_requests(2)
+        session = page_session(rows)
+
+        assert await RequestService(session).get_active_requests(2) == rows
+
+        params = session.execute.await_args.args[0].compile().params
+        assert 2 in params.values()
@@ -0,0 +1,67 @@
+"""Tests for webhook mode."""
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+from aiogram import Dispatcher
+from pydantic import ValidationError
+
+from getmoney.config import Settings, settings
+from getmoney.main import create_bot, create_webhook_app
+
+UPDATE = {
+    "update_id": 1,
+    "message": {
+        "message_id": 1,
+        "date": 0,
+        "chat": {"id": 42, "type": "private"},
+        "from": {"id": 42, "is_bot": False, "first_name": "Test"},
+        "text": "/id",
+    },
+}
+
+
+class TestWebhookApp:
+    """Tests for the embedded webhook server."""
+
+    async def test_rejects_wrong_secret(self) -> None:
+        """Test updates without the right secret token are refused."""
+        bot = create_bot()
+        app = create_webhook_app(bot, Dispatcher(), secret_token="s3cret")
+
+        async with TestClient(TestServer(app)) as client:
+            response = await client.post(
+                settings.webhook_path,
+                json=UPDATE,
+                headers={"X-Telegram-Bot-Api-Secret-Token": "wrong"},
+            )
+
+        assert response.status == 401
+
+    async def test_accepts_right_secret(self) -> None:
+        """Test updates with the right secret token are accepted."""
+        bot = create_bot()
+        app = create_webhook_app(bot, Dispatcher(), secret_token="s3cret")
+
+        async with TestClient(TestServer(app)) as client:
+            response = await client.post(
+                settings.webhook_path,
+                json=UPDATE,
+                headers={"X-Telegram-Bot-Api-Secret-Token": "s3cret"},
+            )
+
+        assert response.status == 200
+
+
+class TestWebhookSettings:
+    """Tests for webhook settings validation."""
+
+    def test_secret_required(self) -> None:
+        """Test webhook mode refuses to start without a secret."""
+        with pytest.raises(ValidationError, match="WEBHOOK_SECRET"):
+            Settings(webhook_url="https://bot.example.com")
+
+    def test_secret_given(self) -> None:
+        """Test webhook mode with a secret is accepted."""
+        config = Settings(webhook_url="https://bot.example.com", webhook_secret="s3cret")
+
+        assert config.webhook_secret == "s3cret"